@@ -1,12 +1,17 @@
 # mypy: ignore-errors
 
 import os
+import re
 from logging.config import fileConfig
 
 from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
 import src.models.complaint  # noqa: F401
+import src.models.complaint_archive  # noqa: F401
+import src.models.complaint_embedding  # noqa: F401
+import src.models.complaint_stats  # noqa: F401
+import src.models.idempotency_key  # noqa: F401
 from alembic import context
 
 # Load environment variables from .env
@@ -20,8 +25,11 @@ db_url = os.getenv("DATABASE_URL_SYNC")
 if db_url:
     config.set_section_option(config.config_ini_section, "sqlalchemy.url", db_url)
 
-# Set up Python logging based on alembic.ini
-if config.config_file_name is not None:
+# Set up Python logging based on alembic.ini, unless the caller (e.g. the
+# production launcher in src/server.py) has already configured logging
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
     fileConfig(config.config_file_name)
 
 # Import Base metadata for 'autogenerate' support
@@ -30,6 +38,17 @@ from src.models import Base  # noqa: E402
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names):
+    """
+    Keep tables the models do not declare out of autogenerate: the monthly
+    partitions of complaints (PostgreSQL) and the FTS5 virtual table of
+    complaints with its shadow tables (SQLite).
+    """
+    if type_ == "table" and name:
+        return not re.match(r"^complaints_((y\d{4}m\d{2}|default)|fts(_\w+)?)$", name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode (no DB connection)."""
     url = config.get_main_option("sqlalchemy.url")
@@ -56,6 +75,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,73 @@
+# mypy: ignore-errors
+
+"""Create complaint_stats rollup table
+
+Revision ID: 3b8d2c41e7a9
+Revises: f475cf562ea1
+Create Date: 2025-07-21 10:12:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8d2c41e7a9"
+down_revision: Union[str, Sequence[str], None] = "f475cf562ea1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _enum(name: str, *values: str) -> sa.Enum:
+    # the PostgreSQL enum types already exist (created with complaints)
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "complaint_stats",
+        sa.Column(
+            "bucket",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="Start of the hour the complaints were created in",
+        ),
+        sa.Column(
+            "category",
+            _enum("categoryenum", "TECHNICAL", "PAYMENT", "OTHER"),
+            nullable=False,
+            comment="Complaint category",
+        ),
+        sa.Column(
+            "sentiment",
+            _enum("sentimentenum", "POSITIVE", "NEGATIVE", "NEUTRAL", "UNKNOWN"),
+            nullable=False,
+            comment="Sentiment outcome",
+        ),
+        sa.Column(
+            "status",
+            _enum("statusenum", "OPEN", "CLOSED"),
+            nullable=False,
+            comment="Current complaint status",
+        ),
+        sa.Column(
+            "count",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of complaints in this bucket",
+        ),
+        sa.PrimaryKeyConstraint("bucket", "category", "sentiment", "status"),
+        comment="Hourly complaint counts by category, sentiment and status",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("complaint_stats")
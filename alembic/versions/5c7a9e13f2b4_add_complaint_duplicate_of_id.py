@@ -0,0 +1,62 @@
+# mypy: ignore-errors
+
+"""Add duplicate_of_id to complaints
+
+Revision ID: 5c7a9e13f2b4
+Revises: 9e4f1a6b2d30
+Create Date: 2025-07-25 09:31:02.664120
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c7a9e13f2b4"
+down_revision: Union[str, Sequence[str], None] = "9e4f1a6b2d30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "complaints",
+        sa.Column(
+            "duplicate_of_id",
+            sa.Integer(),
+            nullable=True,
+            comment="Original complaint this one is a near-duplicate of",
+        ),
+    )
+    op.create_index(
+        op.f("ix_complaints_duplicate_of_id"),
+        "complaints",
+        ["duplicate_of_id"],
+        unique=False,
+    )
+    # SQLite cannot add a constraint without rebuilding the table (which would
+    # drop the full-text search triggers); a5b7c9d1e3f6 adds it there when it
+    # rebuilds the table anyway.
+    if op.get_bind().dialect.name != "sqlite":
+        op.create_foreign_key(
+            "fk_complaints_duplicate_of_id",
+            "complaints",
+            "complaints",
+            ["duplicate_of_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint(
+            "fk_complaints_duplicate_of_id", "complaints", type_="foreignkey"
+        )
+    op.drop_index(op.f("ix_complaints_duplicate_of_id"), table_name="complaints")
+    op.drop_column("complaints", "duplicate_of_id")
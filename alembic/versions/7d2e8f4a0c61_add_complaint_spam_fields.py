@@ -0,0 +1,57 @@
+# mypy: ignore-errors
+
+"""Add is_spam and spam_score to complaints
+
+Revision ID: 7d2e8f4a0c61
+Revises: 5c7a9e13f2b4
+Create Date: 2025-07-28 16:44:19.530871
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2e8f4a0c61"
+down_revision: Union[str, Sequence[str], None] = "5c7a9e13f2b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "complaints",
+        sa.Column(
+            "is_spam",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+            comment="Whether the complaint was classified as spam",
+        ),
+    )
+    op.add_column(
+        "complaints",
+        sa.Column(
+            "spam_score",
+            sa.Float(),
+            nullable=True,
+            comment="Spam likelihood from 0 to 1 (local pre-filter or remote API)",
+        ),
+    )
+    op.create_index(
+        "ix_complaints_is_spam_status_timestamp",
+        "complaints",
+        ["is_spam", "status", "timestamp"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_complaints_is_spam_status_timestamp", table_name="complaints")
+    op.drop_column("complaints", "spam_score")
+    op.drop_column("complaints", "is_spam")
@@ -0,0 +1,76 @@
+# mypy: ignore-errors
+
+"""Add full-text search index over complaint text
+
+SQLite: external-content FTS5 table kept in sync by triggers.
+PostgreSQL: generated tsvector column with a GIN index.
+
+Revision ID: 9e4f1a6b2d30
+Revises: 3b8d2c41e7a9
+Create Date: 2025-07-23 14:05:48.117503
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4f1a6b2d30"
+down_revision: Union[str, Sequence[str], None] = "3b8d2c41e7a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE complaints_fts USING fts5("
+            "text, content='complaints', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER complaints_fts_ai AFTER INSERT ON complaints BEGIN "
+            "INSERT INTO complaints_fts(rowid, text) VALUES (new.id, new.text); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER complaints_fts_ad AFTER DELETE ON complaints BEGIN "
+            "INSERT INTO complaints_fts(complaints_fts, rowid, text) "
+            "VALUES ('delete', old.id, old.text); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER complaints_fts_au AFTER UPDATE OF text ON complaints "
+            "BEGIN "
+            "INSERT INTO complaints_fts(complaints_fts, rowid, text) "
+            "VALUES ('delete', old.id, old.text); "
+            "INSERT INTO complaints_fts(rowid, text) VALUES (new.id, new.text); "
+            "END"
+        )
+        # index all existing rows
+        op.execute("INSERT INTO complaints_fts(complaints_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        # generated column is computed for existing rows as part of ADD COLUMN
+        op.execute(
+            "ALTER TABLE complaints ADD COLUMN text_tsv tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_complaints_text_tsv ON complaints USING GIN (text_tsv)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS complaints_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS complaints_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS complaints_fts_ai")
+        op.execute("DROP TABLE IF EXISTS complaints_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_complaints_text_tsv")
+        op.execute("ALTER TABLE complaints DROP COLUMN IF EXISTS text_tsv")
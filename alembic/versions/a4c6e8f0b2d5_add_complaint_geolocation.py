@@ -0,0 +1,201 @@
+# mypy: ignore-errors
+
+"""Add geolocation to complaints and location dimensions to complaint_stats
+
+Revision ID: a4c6e8f0b2d5
+Revises: 7d2e8f4a0c61
+Create Date: 2025-07-29 10:12:47.204518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c6e8f0b2d5"
+down_revision: Union[str, Sequence[str], None] = "7d2e8f4a0c61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BASE_KEY = ["bucket", "category", "sentiment", "status"]
+GEO_KEY = BASE_KEY + ["country_code", "region"]
+
+
+def _enum(name: str, *values: str) -> sa.Enum:
+    # the PostgreSQL enum types already exist (created with complaints)
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def _stats_columns(with_geo: bool) -> list:
+    columns = [
+        sa.Column(
+            "bucket",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="Start of the hour the complaints were created in",
+        ),
+        sa.Column(
+            "category",
+            _enum("categoryenum", "TECHNICAL", "PAYMENT", "OTHER"),
+            nullable=False,
+            comment="Complaint category",
+        ),
+        sa.Column(
+            "sentiment",
+            _enum("sentimentenum", "POSITIVE", "NEGATIVE", "NEUTRAL", "UNKNOWN"),
+            nullable=False,
+            comment="Sentiment outcome",
+        ),
+        sa.Column(
+            "status",
+            _enum("statusenum", "OPEN", "CLOSED"),
+            nullable=False,
+            comment="Current complaint status",
+        ),
+    ]
+    if with_geo:
+        columns += _geo_key_columns()
+    columns.append(
+        sa.Column(
+            "count",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of complaints in this bucket",
+        )
+    )
+    return columns
+
+
+def _geo_key_columns() -> list:
+    return [
+        sa.Column(
+            "country_code",
+            sa.String(length=2),
+            server_default="",
+            nullable=False,
+            comment="Client country code, empty when unknown",
+        ),
+        sa.Column(
+            "region",
+            sa.String(length=100),
+            server_default="",
+            nullable=False,
+            comment="Client region, empty when unknown",
+        ),
+    ]
+
+
+def _rebuild_stats_sqlite(with_geo: bool) -> None:
+    # SQLite cannot alter a primary key: copy into a table of the new shape.
+    # Existing rollup rows are merged per key, so the counts stay exact.
+    op.rename_table("complaint_stats", "complaint_stats_old")
+    key = GEO_KEY if with_geo else BASE_KEY
+    op.create_table(
+        "complaint_stats",
+        *_stats_columns(with_geo),
+        sa.PrimaryKeyConstraint(*key),
+        comment=(
+            "Hourly complaint counts by category, sentiment, status and location"
+            if with_geo
+            else "Hourly complaint counts by category, sentiment and status"
+        ),
+    )
+    # rollup rows from before this revision have no location
+    source = ", ".join(BASE_KEY + (["''", "''"] if with_geo else []))
+    op.execute(
+        f"INSERT INTO complaint_stats ({', '.join(key)}, count) "
+        f"SELECT {source}, SUM(count) FROM complaint_stats_old "
+        f"GROUP BY {', '.join(BASE_KEY)}"
+    )
+    op.drop_table("complaint_stats_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in (
+        sa.Column(
+            "country_code",
+            sa.String(length=2),
+            nullable=True,
+            comment="ISO 3166-1 alpha-2 country code of the client (GeoIP)",
+        ),
+        sa.Column(
+            "region",
+            sa.String(length=100),
+            nullable=True,
+            comment="Region or state of the client (GeoIP)",
+        ),
+        sa.Column(
+            "city",
+            sa.String(length=100),
+            nullable=True,
+            comment="City of the client (GeoIP)",
+        ),
+        sa.Column(
+            "latitude",
+            sa.Float(),
+            nullable=True,
+            comment="Approximate latitude of the client (GeoIP)",
+        ),
+        sa.Column(
+            "longitude",
+            sa.Float(),
+            nullable=True,
+            comment="Approximate longitude of the client (GeoIP)",
+        ),
+    ):
+        op.add_column("complaints", column)
+    op.create_index(
+        "ix_complaints_country_region_timestamp",
+        "complaints",
+        ["country_code", "region", "timestamp"],
+        unique=False,
+    )
+
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild_stats_sqlite(with_geo=True)
+    else:
+        for column in _geo_key_columns():
+            op.add_column("complaint_stats", column)
+        op.drop_constraint("complaint_stats_pkey", "complaint_stats", type_="primary")
+        op.create_primary_key("complaint_stats_pkey", "complaint_stats", GEO_KEY)
+        op.create_table_comment(
+            "complaint_stats",
+            "Hourly complaint counts by category, sentiment, status and location",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild_stats_sqlite(with_geo=False)
+    else:
+        op.execute(
+            "CREATE TEMPORARY TABLE complaint_stats_merged AS "
+            f"SELECT {', '.join(BASE_KEY)}, SUM(count) AS count "
+            f"FROM complaint_stats GROUP BY {', '.join(BASE_KEY)}"
+        )
+        op.execute("DELETE FROM complaint_stats")
+        op.drop_constraint("complaint_stats_pkey", "complaint_stats", type_="primary")
+        op.drop_column("complaint_stats", "region")
+        op.drop_column("complaint_stats", "country_code")
+        op.execute(
+            f"INSERT INTO complaint_stats ({', '.join(BASE_KEY)}, count) "
+            f"SELECT {', '.join(BASE_KEY)}, count FROM complaint_stats_merged"
+        )
+        op.execute("DROP TABLE complaint_stats_merged")
+        op.create_primary_key("complaint_stats_pkey", "complaint_stats", BASE_KEY)
+        op.create_table_comment(
+            "complaint_stats",
+            "Hourly complaint counts by category, sentiment and status",
+        )
+
+    op.drop_index("ix_complaints_country_region_timestamp", table_name="complaints")
+    for name in ("longitude", "latitude", "city", "region", "country_code"):
+        op.drop_column("complaints", name)
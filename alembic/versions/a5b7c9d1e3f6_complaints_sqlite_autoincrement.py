@@ -0,0 +1,89 @@
+# mypy: ignore-errors
+
+"""Never reuse complaint IDs on SQLite
+
+A plain INTEGER PRIMARY KEY hands out max(id) + 1, so once archiving deletes
+the newest complaint its ID goes to the next insert, which then shadows the
+archived record and collides with its archive index entry. AUTOINCREMENT
+keeps the high-water mark in sqlite_sequence. The table is rebuilt, which
+drops the full-text search triggers, so they are recreated; the rebuild also
+adds the duplicate_of_id foreign key that 5c7a9e13f2b4 could not add on
+SQLite. PostgreSQL sequences never reuse values: nothing to do there.
+
+Revision ID: a5b7c9d1e3f6
+Revises: f4a6b8c0d2e5
+Create Date: 2025-08-06 10:14:05.381927
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a5b7c9d1e3f6"
+down_revision: Union[str, Sequence[str], None] = "f4a6b8c0d2e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild(autoincrement: bool) -> None:
+    """
+    Rebuild complaints with or without AUTOINCREMENT and the duplicate_of_id
+    foreign key, FTS triggers included.
+    """
+    with op.batch_alter_table(
+        "complaints",
+        recreate="always",
+        table_kwargs={"sqlite_autoincrement": autoincrement},
+    ) as batch_op:
+        if autoincrement:
+            batch_op.create_foreign_key(
+                "fk_complaints_duplicate_of_id",
+                "complaints",
+                ["duplicate_of_id"],
+                ["id"],
+                ondelete="SET NULL",
+            )
+        else:
+            batch_op.drop_constraint(
+                "fk_complaints_duplicate_of_id", type_="foreignkey"
+            )
+    op.execute(
+        "CREATE TRIGGER complaints_fts_ai AFTER INSERT ON complaints BEGIN "
+        "INSERT INTO complaints_fts(rowid, text) VALUES (new.id, new.text); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER complaints_fts_ad AFTER DELETE ON complaints BEGIN "
+        "INSERT INTO complaints_fts(complaints_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER complaints_fts_au AFTER UPDATE OF text ON complaints "
+        "BEGIN "
+        "INSERT INTO complaints_fts(complaints_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "INSERT INTO complaints_fts(rowid, text) VALUES (new.id, new.text); "
+        "END"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild(autoincrement=True)
+        # start above every ID already archived (and so gone from the table)
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'complaints'")
+        op.execute(
+            "INSERT INTO sqlite_sequence(name, seq) SELECT 'complaints', "
+            "max(coalesce((SELECT max(id) FROM complaints), 0), "
+            "coalesce((SELECT max(complaint_id) FROM complaint_archive_index), 0))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild(autoincrement=False)
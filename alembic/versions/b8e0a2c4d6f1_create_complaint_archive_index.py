@@ -0,0 +1,61 @@
+# mypy: ignore-errors
+
+"""Create complaint_archive_index table
+
+Revision ID: b8e0a2c4d6f1
+Revises: a4c6e8f0b2d5
+Create Date: 2025-07-30 09:27:05.118342
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e0a2c4d6f1"
+down_revision: Union[str, Sequence[str], None] = "a4c6e8f0b2d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "complaint_archive_index",
+        sa.Column(
+            "complaint_id",
+            sa.Integer(),
+            autoincrement=False,
+            nullable=False,
+            comment="ID the complaint had in the complaints table",
+        ),
+        sa.Column(
+            "partition",
+            sa.String(length=32),
+            nullable=False,
+            comment="Monthly partition file holding the archived record",
+        ),
+        sa.Column(
+            "member_offset",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Byte offset of the gzip member holding the record",
+        ),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+            comment="When the complaint was archived",
+        ),
+        sa.PrimaryKeyConstraint("complaint_id"),
+        comment="Archived complaint ID to cold storage partition",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("complaint_archive_index")
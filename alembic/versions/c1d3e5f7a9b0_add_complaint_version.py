@@ -0,0 +1,40 @@
+# mypy: ignore-errors
+
+"""Add version column to complaints
+
+Revision ID: c1d3e5f7a9b0
+Revises: b8e0a2c4d6f1
+Create Date: 2025-07-30 15:41:22.730914
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c1d3e5f7a9b0"
+down_revision: Union[str, Sequence[str], None] = "b8e0a2c4d6f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "complaints",
+        sa.Column(
+            "version",
+            sa.Integer(),
+            server_default=sa.text("1"),
+            nullable=False,
+            comment="Row version, incremented on every update",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("complaints", "version")
@@ -0,0 +1,79 @@
+# mypy: ignore-errors
+
+"""Create idempotency_keys table
+
+Revision ID: d2e4f6a8b0c3
+Revises: c1d3e5f7a9b0
+Create Date: 2025-07-31 10:12:48.503617
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2e4f6a8b0c3"
+down_revision: Union[str, Sequence[str], None] = "c1d3e5f7a9b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "idempotency_keys",
+        sa.Column(
+            "key",
+            sa.String(length=255),
+            nullable=False,
+            comment="Client idempotency key",
+        ),
+        sa.Column(
+            "request_hash",
+            sa.String(length=64),
+            nullable=False,
+            comment="SHA-256 of the request payload",
+        ),
+        sa.Column(
+            "status_code",
+            sa.Integer(),
+            nullable=True,
+            comment="Stored status, NULL while in progress",
+        ),
+        sa.Column(
+            "response_body",
+            sa.LargeBinary(),
+            nullable=True,
+            comment="Stored JSON response body",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+            comment="When the original request claimed the key",
+        ),
+        sa.Column(
+            "expires_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="When the key may be reused",
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        comment="Stored responses of idempotent POST /complaints requests",
+    )
+    op.create_index(
+        "ix_idempotency_keys_expires_at",
+        "idempotency_keys",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
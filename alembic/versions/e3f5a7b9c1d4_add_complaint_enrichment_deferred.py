@@ -0,0 +1,42 @@
+# mypy: ignore-errors
+
+"""Add enrichment_deferred column to complaints
+
+Revision ID: e3f5a7b9c1d4
+Revises: d2e4f6a8b0c3
+Create Date: 2025-08-02 11:08:47.215306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f5a7b9c1d4"
+down_revision: Union[str, Sequence[str], None] = "d2e4f6a8b0c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "complaints",
+        sa.Column(
+            "enrichment_deferred",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+            comment=(
+                "Enriched in degraded mode; spam check and category await a backfill"
+            ),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("complaints", "enrichment_deferred")
@@ -0,0 +1,63 @@
+# mypy: ignore-errors
+
+"""Create complaint_embeddings table
+
+Revision ID: f4a6b8c0d2e5
+Revises: e3f5a7b9c1d4
+Create Date: 2025-08-04 09:27:31.640182
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a6b8c0d2e5"
+down_revision: Union[str, Sequence[str], None] = "e3f5a7b9c1d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "complaint_embeddings",
+        sa.Column(
+            "complaint_id",
+            sa.Integer(),
+            nullable=False,
+            comment="Embedded complaint",
+        ),
+        sa.Column(
+            "model",
+            sa.String(length=100),
+            nullable=False,
+            comment="Embedding provider of the vector",
+        ),
+        sa.Column(
+            "vector",
+            sa.LargeBinary(),
+            nullable=False,
+            comment="Unit-length float32 vector (LE)",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+            comment="When the vector was computed",
+        ),
+        sa.ForeignKeyConstraint(
+            ["complaint_id"], ["complaints.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("complaint_id"),
+        comment="Embedding vectors of complaints",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("complaint_embeddings")
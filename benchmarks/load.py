@@ -0,0 +1,237 @@
+"""
+benchmarks/load.py
+
+Open-loop load driver for the Complaint Processing API.
+
+Requests are started on a fixed schedule (target RPS) regardless of how fast
+earlier ones complete, so a slow server shows up as growing latency rather
+than a silently lowered request rate. Reports throughput and p50/p95/p99
+latency per scenario.
+
+Usage:
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 \\
+        --scenario create --rps 20 --duration 30
+    python -m benchmarks.load --scenario all --rps 100 --duration 15 \\
+        --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+SCENARIOS = ("create", "list", "get", "patch")
+
+SAMPLE_TEXTS = (
+    "My internet connection drops every evening",
+    "I was charged twice for the same order",
+    "The mobile app crashes when I open my profile",
+    "Refund still not received after two weeks",
+    "Support never answered my previous ticket",
+    "Just wanted to say the new update is great",
+)
+
+
+@dataclass
+class ScenarioResult:
+    """Aggregated measurements of one scenario run."""
+
+    scenario: str
+    target_rps: float
+    duration_s: float
+    sent: int = 0
+    ok: int = 0
+    errors: int = 0
+    dropped: int = 0
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    throughput_rps: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+RequestFactory = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+async def seed_ids(client: httpx.AsyncClient, minimum: int) -> List[int]:
+    """Return existing complaint IDs, creating complaints if there are too few."""
+    response = await client.get("/complaints/")
+    response.raise_for_status()
+    ids = [item["id"] for item in response.json()]
+    while len(ids) < minimum:
+        response = await client.post(
+            "/complaints/", json={"text": random.choice(SAMPLE_TEXTS)}
+        )
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    return ids
+
+
+def build_factory(scenario: str, ids: List[int]) -> RequestFactory:
+    """Return a coroutine factory issuing one request of the given scenario."""
+    if scenario == "create":
+
+        async def create(client: httpx.AsyncClient) -> httpx.Response:
+            ip = f"203.0.113.{random.randint(1, 254)}"
+            return await client.post(
+                "/complaints/",
+                json={"text": random.choice(SAMPLE_TEXTS)},
+                headers={"X-Forwarded-For": ip},
+            )
+
+        return create
+    if scenario == "list":
+
+        async def list_(client: httpx.AsyncClient) -> httpx.Response:
+            return await client.get("/complaints/", params={"status": "open"})
+
+        return list_
+    if scenario == "get":
+
+        async def get(client: httpx.AsyncClient) -> httpx.Response:
+            return await client.get(f"/complaints/{random.choice(ids)}")
+
+        return get
+    if scenario == "patch":
+
+        async def patch(client: httpx.AsyncClient) -> httpx.Response:
+            status = random.choice(["open", "closed"])
+            return await client.patch(
+                f"/complaints/{random.choice(ids)}/status", json={"status": status}
+            )
+
+        return patch
+    raise ValueError(f"unknown scenario {scenario!r}")
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    rps: float,
+    duration: float,
+    max_in_flight: int,
+) -> ScenarioResult:
+    """
+    Fire requests at `rps` for `duration` seconds and collect latencies.
+
+    Requests that would exceed `max_in_flight` are counted as dropped instead
+    of being queued, keeping the schedule open-loop.
+    """
+    ids = await seed_ids(client, 20) if scenario in ("get", "patch") else []
+    factory = build_factory(scenario, ids)
+    result = ScenarioResult(scenario=scenario, target_rps=rps, duration_s=duration)
+    latencies: List[float] = []
+    in_flight: set = set()
+
+    async def one() -> None:
+        started = time.perf_counter()
+        try:
+            response = await factory(client)
+            code = str(response.status_code)
+            if response.is_success:
+                result.ok += 1
+            else:
+                result.errors += 1
+        except httpx.HTTPError as exc:
+            code = type(exc).__name__
+            result.errors += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+        result.status_codes[code] = result.status_codes.get(code, 0) + 1
+
+    total = int(rps * duration)
+    started = time.perf_counter()
+    for i in range(total):
+        delay = started + i / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            result.dropped += 1
+            continue
+        task = asyncio.create_task(one())
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        result.sent += 1
+    if in_flight:
+        await asyncio.wait(in_flight)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result.throughput_rps = round(result.ok / elapsed, 2) if elapsed else 0.0
+    result.p50_ms = round(percentile(latencies, 50), 2)
+    result.p95_ms = round(percentile(latencies, 95), 2)
+    result.p99_ms = round(percentile(latencies, 99), 2)
+    result.max_ms = round(latencies[-1], 2) if latencies else 0.0
+    return result
+
+
+def print_report(results: List[ScenarioResult]) -> None:
+    """Print a fixed-width summary table."""
+    header = (
+        f"{'scenario':<8} {'rps':>7} {'sent':>6} {'ok':>6} {'err':>5} {'drop':>5} "
+        f"{'thr/s':>8} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'maxms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.scenario:<8} {r.target_rps:>7.1f} {r.sent:>6} {r.ok:>6} "
+            f"{r.errors:>5} {r.dropped:>5} {r.throughput_rps:>8.1f} "
+            f"{r.p50_ms:>8.1f} {r.p95_ms:>8.1f} {r.p99_ms:>8.1f} {r.max_ms:>8.1f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> List[ScenarioResult]:
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    limits = httpx.Limits(max_connections=args.max_in_flight)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=timeout
+    ) as client:
+        results = []
+        for scenario in scenarios:
+            results.append(
+                await run_scenario(
+                    client, scenario, args.rps, args.duration, args.max_in_flight
+                )
+            )
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Complaint API load driver")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--rps", type=float, default=20.0, help="target requests/s")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--max-in-flight", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per request")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="also write results here")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = asyncio.run(run(args))
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump([asdict(r) for r in results], fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+benchmarks/startup.py
+
+Startup-time benchmark with a regression budget.
+
+Measures, each in a fresh interpreter (so nothing is cached in
+sys.modules):
+
+    import   -- `import src.main` (module imports + create_app)
+    startup  -- the application lifespan up to serving (engines, index warmup)
+
+and fails with exit code 1 when the median exceeds its budget, so it can
+gate CI. `--importtime N` also lists the N slowest imports.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 9 --import-budget-ms 900 \\
+        --startup-budget-ms 250 --importtime 15
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Runs inside the child interpreter; prints one JSON line of timings
+_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import src.main
+imported = time.perf_counter()
+
+async def startup():
+    async with src.main.app.router.lifespan_context(src.main.app):
+        ready = time.perf_counter()
+    return ready
+
+ready = asyncio.run(startup())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+}))
+"""
+
+
+def measure_once() -> Dict[str, float]:
+    """Run the probe in a new interpreter and return its timings."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # the probe's JSON is the last stdout line (the app may log before it)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> List[Tuple[float, str]]:
+    """Return the `top` imports with the highest cumulative time (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")  # noqa: E203
+        rows.append((int(cumulative) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup-time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters")
+    parser.add_argument("--import-budget-ms", type=float, default=900.0)
+    parser.add_argument("--startup-budget-ms", type=float, default=250.0)
+    parser.add_argument(
+        "--importtime", type=int, default=0, metavar="N", help="show N slowest"
+    )
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    failed = False
+    for key, budget in (
+        ("import_ms", args.import_budget_ms),
+        ("startup_ms", args.startup_budget_ms),
+    ):
+        values = sorted(sample[key] for sample in samples)
+        median = statistics.median(values)
+        verdict = "ok" if median <= budget else "OVER BUDGET"
+        failed |= median > budget
+        print(
+            f"{key:<11} median {median:8.1f}  min {values[0]:8.1f}  "
+            f"max {values[-1]:8.1f}  budget {budget:8.1f}  {verdict}"
+        )
+
+    if args.importtime:
+        print(f"\nslowest imports (cumulative ms, top {args.importtime}):")
+        for elapsed, name in slowest_imports(args.importtime):
+            print(f"{elapsed:9.1f}  {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
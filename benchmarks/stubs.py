@@ -0,0 +1,173 @@
+"""
+benchmarks/stubs.py
+
+Local stub server for every upstream the service calls, so benchmarks run
+offline and deterministically:
+
+    POST /sentiment/analysis     APILayer Sentiment Analysis
+    POST /spamchecker            APILayer Spam Checker
+    GET  /json/{ip}              ip-api.com geolocation
+    POST /v1/chat/completions    OpenAI chat completions
+
+Each upstream gets a base latency, jitter and error rate; failed calls
+answer HTTP 503.
+
+Usage:
+    python -m benchmarks.stubs --port 9100 --latency-ms 80 --error-rate 0.01 \\
+        --profile openai=400,0.02
+
+Point the service at the stubs with:
+    SENTIMENT_API_URL=http://127.0.0.1:9100/sentiment/analysis
+    SPAM_API_URL=http://127.0.0.1:9100/spamchecker
+    IP_API_URL=http://127.0.0.1:9100/json
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+UPSTREAMS = ("sentiment", "spam", "geoip", "openai")
+
+
+@dataclass
+class UpstreamProfile:
+    """
+    Simulated behavior of one upstream.
+
+    Attributes:
+        latency_ms: Base response latency.
+        jitter_ms: Uniform random latency added on top of the base.
+        error_rate: Probability (0-1) of answering HTTP 503.
+    """
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+
+    async def simulate(self, rng: random.Random) -> None:
+        """Sleep for the simulated latency, then maybe fail."""
+        delay = self.latency_ms + rng.uniform(0, self.jitter_ms)
+        await asyncio.sleep(delay / 1000)
+        if rng.random() < self.error_rate:
+            raise HTTPException(status_code=503, detail="stub upstream failure")
+
+
+def create_stub_app(
+    profiles: Dict[str, UpstreamProfile], seed: Optional[int] = None
+) -> FastAPI:
+    """
+    Build the stub ASGI app.
+
+    Args:
+        profiles: Behavior per upstream name (see UPSTREAMS).
+        seed: Optional seed for reproducible latency/error sequences.
+    """
+    app = FastAPI(title="Complaint Service upstream stubs")
+    rng = random.Random(seed)
+
+    @app.post("/sentiment/analysis")
+    async def sentiment(request: Request) -> dict:
+        await profiles["sentiment"].simulate(rng)
+        text = (await request.body()).decode("utf-8", "replace")
+        return {
+            "sentiment": rng.choice(["positive", "negative", "neutral"]),
+            "content": text,
+        }
+
+    @app.post("/spamchecker")
+    async def spam(request: Request) -> dict:
+        await profiles["spam"].simulate(rng)
+        text = (await request.body()).decode("utf-8", "replace")
+        score = rng.random() * 10
+        is_spam = score > float(request.query_params.get("threshold", 5))
+        return {
+            "is_spam": is_spam,
+            "score": round(score, 2),
+            "result": "The text is spam" if is_spam else "The text is not spam",
+            "text": text,
+        }
+
+    @app.get("/json/{ip}")
+    async def geoip(ip: str) -> dict:
+        await profiles["geoip"].simulate(rng)
+        return {
+            "status": "success",
+            "country": "United States",
+            "countryCode": "US",
+            "region": "CA",
+            "regionName": "California",
+            "city": "San Francisco",
+            "lat": 37.7749,
+            "lon": -122.4194,
+            "query": ip,
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions() -> dict:
+        await profiles["openai"].simulate(rng)
+        answer = rng.choice(["техническая", "оплата", "другое"])
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-3.5-turbo",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 40, "completion_tokens": 2, "total_tokens": 42},
+        }
+
+    return app
+
+
+def parse_profiles(args: argparse.Namespace) -> Dict[str, UpstreamProfile]:
+    """Apply global defaults, then per-upstream --profile overrides."""
+    profiles = {
+        name: UpstreamProfile(args.latency_ms, args.jitter_ms, args.error_rate)
+        for name in UPSTREAMS
+    }
+    for override in args.profile:
+        name, _, spec = override.partition("=")
+        if name not in profiles:
+            raise SystemExit(f"unknown upstream {name!r}, expected one of {UPSTREAMS}")
+        latency, _, error_rate = spec.partition(",")
+        profiles[name].latency_ms = float(latency)
+        if error_rate:
+            profiles[name].error_rate = float(error_rate)
+    return profiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upstream API stubs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--profile",
+        action="append",
+        default=[],
+        metavar="NAME=LATENCY_MS[,ERROR_RATE]",
+        help=f"per-upstream override, NAME in {', '.join(UPSTREAMS)}",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_stub_app(parse_profiles(args), seed=args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
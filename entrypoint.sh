@@ -3,8 +3,6 @@
 #!/usr/bin/env sh
 set -e
 
-# 1) Apply all Alembic migrations before starting the app
-alembic upgrade head
-
-# 2) Launch Uvicorn server for FastAPI
-exec uvicorn src.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# Apply Alembic migrations once, then launch Uvicorn workers
+# (worker count, event loop and HTTP parser are tuned in src/server.py)
+exec python -m src.server
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+src/cli.py
+
+Command-line entrypoint for maintenance jobs that run outside the web
+server, sharing its settings and database engine.
+
+Usage:
+    python -m src.cli backfill-stats
+    python -m src.cli archive --older-than-days 180 [--vacuum]
+    python -m src.cli reenrich [--concurrency 8] [--rate 5] [--restart]
+    python -m src.cli cluster [--clusters 32] [--recent-hours 24]
+    python -m src.cli partitions {enable,ensure,list,detach} [--before 2025-01]
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .config import settings
+from .core.dependencies import dispose_engines, get_engine, open_session
+from .core.logging import setup_logging
+from .services.archive_service import ArchiveService
+from .services.clustering_service import ClusteringService
+from .services.partition_service import PartitionService
+from .services.reenrich_service import ReenrichService
+from .services.stats_service import StatsService
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_stats(args: argparse.Namespace) -> None:
+    """Rebuild the complaint_stats rollup table from the complaints table."""
+    async with open_session() as session:
+        rows = await StatsService(session).backfill()
+    print(f"complaint_stats rebuilt: {rows} rollup rows")
+
+
+async def archive(args: argparse.Namespace) -> None:
+    """Move old closed complaints to the cold storage archive."""
+    async with open_session() as session:
+        moved = await ArchiveService(session).archive(
+            older_than_days=args.older_than_days, batch_size=args.batch_size
+        )
+    print(f"archived {moved} complaints to {settings.archive_dir}")
+    engine = get_engine()
+    if args.vacuum and moved and engine.dialect.name == "sqlite":
+        # SQLite keeps freed pages in the file until it is rebuilt
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("VACUUM")
+        print("database file compacted")
+
+
+async def reenrich(args: argparse.Namespace) -> None:
+    """Re-run failed sentiment/category enrichment of stored complaints."""
+    checkpoint = Path(args.checkpoint)
+    if args.restart:
+        checkpoint.unlink(missing_ok=True)
+    async with open_session() as session:
+        progress = await ReenrichService(session).run(
+            checkpoint_path=checkpoint,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            rate_per_second=args.rate,
+            limit=args.limit,
+        )
+    print(
+        f"re-enriched up to id={progress.last_id} of {progress.until_id}: "
+        f"{progress.scanned} scanned, {progress.updated} updated, "
+        f"{progress.unchanged} unchanged, {progress.conflicts} conflicts"
+    )
+
+
+async def cluster(args: argparse.Namespace) -> None:
+    """Rebuild the similarity index and report emerging complaint clusters."""
+    async with open_session() as session:
+        report = await ClusteringService(session).run(
+            clusters=args.clusters,
+            recent_hours=args.recent_hours,
+            sample_size=args.sample_size,
+            embed_batch_size=args.batch_size,
+        )
+    print(
+        f"clustered {report['vectors']} complaints "
+        f"({report['recent_vectors']} in the last {args.recent_hours:g}h) "
+        f"into {len(report['clusters'])} clusters"
+    )
+    for row in report["clusters"]:
+        if row["emerging"]:
+            print(
+                f"  emerging #{row['cluster']}: {row['recent']} recent of "
+                f"{row['size']} (lift {row['lift']:.1f}): {row['sample_texts'][0]!r}"
+            )
+
+
+async def partitions(args: argparse.Namespace) -> None:
+    """Manage the monthly partitions of the complaints table (PostgreSQL)."""
+    async with open_session() as session:
+        service = PartitionService(session)
+        try:
+            if args.action == "enable":
+                copied = await service.enable(months_ahead=args.months_ahead)
+                print(f"complaints partitioned by month: {copied} rows copied")
+            elif args.action == "ensure":
+                created = await service.ensure_partitions(args.months_ahead)
+                print(f"created {len(created)} partitions: {', '.join(created)}")
+            elif args.action == "list":
+                for info in await service.list_partitions():
+                    print(f"{info.name}\t~{info.estimated_rows} rows")
+            else:
+                if args.before is None:
+                    raise SystemExit("detach requires --before YYYY-MM")
+                detached = await service.detach(
+                    args.before, drop=args.drop, force=args.force
+                )
+                print(f"detached {len(detached)} partitions: {', '.join(detached)}")
+        except RuntimeError as exc:  # NotImplementedError: not PostgreSQL
+            raise SystemExit(str(exc))
+
+
+def _month(value: str) -> datetime:
+    """Parse a YYYY-MM argument as the first instant of that month (UTC)."""
+    try:
+        return datetime.strptime(value, "%Y-%m").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with one sub-command per job."""
+    parser = argparse.ArgumentParser(prog="python -m src.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser(
+        "backfill-stats", help="rebuild hourly complaint statistics"
+    )
+    stats.set_defaults(handler=backfill_stats)
+
+    archiver = commands.add_parser(
+        "archive", help="move old closed complaints to compressed cold storage"
+    )
+    archiver.add_argument(
+        "--older-than-days",
+        type=int,
+        default=settings.archive_after_days,
+        help="archive closed complaints created before this many days ago",
+    )
+    archiver.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.archive_batch_size,
+        help="complaints moved per transaction",
+    )
+    archiver.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="compact the SQLite database file afterwards",
+    )
+    archiver.set_defaults(handler=archive)
+
+    reenricher = commands.add_parser(
+        "reenrich",
+        help="retry enrichment of complaints with UNKNOWN sentiment or OTHER category",
+    )
+    reenricher.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.reenrich_batch_size,
+        help="complaints per batch and transaction",
+    )
+    reenricher.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.reenrich_concurrency,
+        help="concurrent upstream API calls",
+    )
+    reenricher.add_argument(
+        "--rate",
+        type=int,
+        default=settings.reenrich_rate_per_second,
+        help="calls per second and upstream API",
+    )
+    reenricher.add_argument(
+        "--limit", type=int, default=None, help="stop after this many complaints"
+    )
+    reenricher.add_argument(
+        "--checkpoint",
+        default=settings.reenrich_checkpoint,
+        help="progress file; an existing one is resumed",
+    )
+    reenricher.add_argument(
+        "--restart",
+        action="store_true",
+        help="discard the checkpoint and start from the first complaint",
+    )
+    reenricher.set_defaults(handler=reenrich)
+
+    clusterer = commands.add_parser(
+        "cluster",
+        help="embed new complaints, rebuild the similarity index, report clusters",
+    )
+    clusterer.add_argument(
+        "--clusters",
+        type=int,
+        default=settings.cluster_count,
+        help="number of clusters",
+    )
+    clusterer.add_argument(
+        "--recent-hours",
+        type=float,
+        default=settings.cluster_recent_hours,
+        help="window of recent complaints for emerging clusters",
+    )
+    clusterer.add_argument(
+        "--sample-size",
+        type=int,
+        default=settings.cluster_sample_size,
+        help="vectors the cluster centroids are trained on",
+    )
+    clusterer.add_argument(
+        "--batch-size",
+        type=int,
+        default=100,
+        help="complaints embedded per provider call",
+    )
+    clusterer.set_defaults(handler=cluster)
+
+    partitioner = commands.add_parser(
+        "partitions",
+        help="partition complaints by month and manage the partitions (PostgreSQL)",
+    )
+    partitioner.add_argument(
+        "action",
+        choices=("enable", "ensure", "list", "detach"),
+        help="enable: convert the table (maintenance window); ensure: create "
+        "upcoming partitions (cron); detach: detach months before --before",
+    )
+    partitioner.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.partition_months_ahead,
+        help="partitions created after the current month",
+    )
+    partitioner.add_argument(
+        "--before",
+        type=_month,
+        default=None,
+        help="detach the partitions of months before this one (YYYY-MM)",
+    )
+    partitioner.add_argument(
+        "--drop", action="store_true", help="drop the detached partitions"
+    )
+    partitioner.add_argument(
+        "--force",
+        action="store_true",
+        help="also detach partitions that still hold open complaints",
+    )
+    partitioner.set_defaults(handler=partitions)
+    return parser
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the selected job and close the database connections afterwards."""
+    try:
+        await args.handler(args)
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:
+    setup_logging(settings.log_level)
+    args = build_parser().parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
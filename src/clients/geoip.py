@@ -5,14 +5,63 @@ Client for IP-based geolocation using a public API.
 """
 
 import logging
+from typing import NamedTuple, Optional
 
 import httpx
 
 from ..config import settings
+from .hedging import hedger_for
 
 logger = logging.getLogger(__name__)
 
 
+class GeoLocation(NamedTuple):
+    """
+    Compact location stored with a complaint.
+
+    Attributes:
+        country_code: ISO 3166-1 alpha-2 country code (e.g. "DE").
+        region: Region or state name.
+        city: City name.
+        latitude: Approximate latitude.
+        longitude: Approximate longitude.
+    """
+
+    country_code: Optional[str]
+    region: Optional[str]
+    city: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+def parse_geolocation(data: dict) -> Optional[GeoLocation]:
+    """
+    Extract the stored fields from an ip-api response.
+
+    Args:
+        data: Response of get_geolocation.
+
+    Returns:
+        Optional[GeoLocation]: Location, or None when the lookup failed
+        (ip-api answers private and reserved addresses with status "fail").
+    """
+    if data.get("status", "success") != "success":
+        return None
+    country_code = _text(data.get("countryCode"), 2)
+    return GeoLocation(
+        country_code=country_code.upper() if country_code else None,
+        region=_text(data.get("regionName"), 100),
+        city=_text(data.get("city"), 100),
+        latitude=data.get("lat"),
+        longitude=data.get("lon"),
+    )
+
+
+def _text(value: Optional[str], size: int) -> Optional[str]:
+    """Trim a text field to its column size; empty becomes None."""
+    return value.strip()[:size] or None if value else None
+
+
 async def get_geolocation(ip: str) -> dict:
     """
     Fetch geolocation information for the given IP address.
@@ -32,15 +81,19 @@ async def get_geolocation(ip: str) -> dict:
     """
     url = f"{settings.ip_api_url}/{ip}"
     logger.debug("GeoIP request: %s", url)
-    async with httpx.AsyncClient(timeout=5) as client:
-        try:
+
+    async def attempt() -> httpx.Response:
+        async with httpx.AsyncClient(timeout=5) as client:
             response = await client.get(url)
             response.raise_for_status()
-            data = response.json()
-            logger.info("GeoIP response for %s: %s", ip, data)
-            return data
-        except httpx.HTTPError as e:
-            logger.error(
-                "GeoIP lookup failed for %s: %s", ip, e, exc_info=True
-            )  # noqa: E501
-            raise
+        return response
+
+    try:
+        # a slow call may be hedged with a second attempt (see hedging.py)
+        response = await hedger_for("geoip").call(attempt)
+        data = response.json()
+        logger.info("GeoIP response for %s: %s", ip, data)
+        return data
+    except httpx.HTTPError as e:
+        logger.error("GeoIP lookup failed for %s: %s", ip, e, exc_info=True)
+        raise
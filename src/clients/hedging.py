@@ -0,0 +1,251 @@
+"""
+src/clients/hedging.py
+
+Hedged requests for the idempotent upstream calls.
+
+When an attempt has not answered within the upstream's recently observed
+p90 latency, a second identical attempt is started; the first successful
+response wins and the other attempt is cancelled. This cuts the latency
+tail caused by occasional slow responses at the price of a few extra
+requests, which a per-upstream budget caps: every call earns
+`budget_ratio` of a hedge token, every hedge spends one, so hedges stay at
+most that fraction of the upstream's calls.
+
+Latencies are those of whole calls, as the caller saw them: when a hedge
+wins, the sample is the time since the primary attempt started (the
+primary was at least that slow), not the hedge's own shorter latency, which
+would drag the quantile and the hedge delay down. They are tracked even
+with hedging disabled, for the admin metrics.
+
+A hedge is a second billable request: callers that account for upstream
+requests count the hedges started on their behalf with count_hedges().
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeCounter:
+    """Hedges started inside a count_hedges() block."""
+
+    started: int = 0
+
+
+_hedge_counter: ContextVar[Optional[HedgeCounter]] = ContextVar(
+    "hedge_counter", default=None
+)
+
+
+@contextmanager
+def count_hedges() -> Iterator[HedgeCounter]:
+    """
+    Count the hedges started by the calls made inside the block, including
+    calls in tasks the block creates (they inherit the counter).
+    """
+    counter = HedgeCounter()
+    token = _hedge_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _hedge_counter.reset(token)
+
+
+class LatencyTracker:
+    """
+    Latencies of the most recent successful calls, in seconds.
+
+    Attributes:
+        window (int): Number of samples kept.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        """Record one latency."""
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the q-quantile (0-1) of the samples, None when empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Hedger:
+    """
+    Hedging policy and counters of one upstream API.
+
+    Attributes:
+        name (str): Upstream name (for logs and metrics).
+        enabled (bool): Whether slow calls are hedged.
+        quantile (float): Latency quantile after which a hedge starts.
+        budget_ratio (float): Maximum share of calls that may be hedged.
+        min_samples (int): Latencies needed before hedging starts.
+        min_delay (float): Lower bound of the hedge delay, in seconds.
+        max_delay (float): Upper bound of the hedge delay, in seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool = False,
+        quantile: float = 0.9,
+        budget_ratio: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_delay: float = 5.0,
+        burst: float = 10.0,
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.quantile = quantile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.burst = burst
+        self.latencies = LatencyTracker()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._tokens = 0.0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging; None while uncalibrated."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        delay = self.latencies.quantile(self.quantile) or 0.0
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    async def call(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `attempt`, hedging it with a second attempt when it is slow.
+
+        Args:
+            attempt: Starts one complete upstream request; must be safe to
+                run twice concurrently.
+
+        Returns:
+            The result of the first attempt that succeeds.
+
+        Raises:
+            Exception: The last error, if every attempt failed.
+        """
+        self.calls += 1
+        self._tokens = min(self.burst, self._tokens + self.budget_ratio)
+        started = time.monotonic()
+        result = await self._attempts(attempt)
+        self.latencies.add(time.monotonic() - started)
+        return result
+
+    async def _attempts(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """The primary attempt, plus a hedge if it is slow and budget allows."""
+        delay = self.hedge_delay() if self.enabled else None
+        if delay is None:
+            return await attempt()
+
+        primary = asyncio.ensure_future(attempt())
+        tasks: Set["asyncio.Future[T]"] = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or self._tokens < 1:
+                return await primary
+            self._tokens -= 1
+            self.hedged += 1
+            counter = _hedge_counter.get()
+            if counter is not None:
+                counter.started += 1
+            hedge = asyncio.ensure_future(attempt())
+            tasks.add(hedge)
+            logger.debug("Hedging %s call after %.0f ms", self.name, delay * 1000)
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark a losing attempt's error as seen
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and latency quantiles (ms) of this upstream."""
+
+        def ms(q: float) -> Optional[float]:
+            value = self.latencies.quantile(q)
+            return None if value is None else value * 1000
+
+        delay = self.hedge_delay()
+        return {
+            "upstream": self.name,
+            "hedging_enabled": self.enabled,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_ms": None if delay is None else delay * 1000,
+            "latency_ms_p50": ms(0.5),
+            "latency_ms_p90": ms(0.9),
+            "latency_ms_p99": ms(0.99),
+        }
+
+
+# Upstreams whose clients call through a hedger
+UPSTREAMS = ("sentiment", "spam", "geoip", "openai", "openai-embeddings")
+
+# One hedger per upstream; import `hedger_for` wherever needed
+hedgers: Dict[str, Hedger] = {}
+
+
+def hedger_for(name: str) -> Hedger:
+    """Return the shared hedger of an upstream, configured from settings."""
+    if name not in hedgers:
+        hedgers[name] = Hedger(
+            name,
+            enabled=settings.hedging_enabled,
+            quantile=settings.hedge_quantile,
+            budget_ratio=settings.hedge_budget_ratio,
+            min_samples=settings.hedge_min_samples,
+            min_delay=settings.hedge_min_delay_ms / 1000,
+        )
+    return hedgers[name]
@@ -3,26 +3,56 @@ src/clients/openai_client.py
 
 Client for classifying complaint text using OpenAI’s official Python SDK
 (>=1.93.0) with AsyncOpenAI, including safety against missing content.
+
+The SDK is imported and the client created on first use (get_client): the
+import alone takes a few hundred milliseconds, which would otherwise be paid
+by every worker boot, test collection and CLI run. Workers warm it up in a
+thread at startup, so creation is guarded by a lock: the warm-up and a first
+classification on the event loop must not create two clients.
 """
 
 import logging
-
-from openai import AsyncOpenAI
+import threading
+from typing import TYPE_CHECKING, Optional
 
 from ..config import settings
 from ..schemas.enums import CategoryEnum  # type: ignore[attr-defined]
+from .hedging import hedger_for
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
-# Instantiate a shared async client with your API key
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+_client: Optional["AsyncOpenAI"] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> "AsyncOpenAI":
+    """
+    Return the shared async client, importing the SDK on the first call.
+
+    Returns:
+        AsyncOpenAI: Client configured with the API key and base URL.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import AsyncOpenAI
+
+                _client = AsyncOpenAI(
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url,
+                )
+    return _client
 
 
 async def categorize_complaint(text: str) -> CategoryEnum:
     """
     Classify a complaint into one of three categories using GPT-3.5 Turbo.
 
-    Uses `await client.chat.completions.create(...)`
+    Uses `await get_client().chat.completions.create(...)`
     per the official async example:
     https://github.com/openai/openai-python#async-usage
 
@@ -48,10 +78,13 @@ async def categorize_complaint(text: str) -> CategoryEnum:
         messages[1]["content"][:120],  # noqa: E501
     )  # noqa: E501
     try:
-        response = await client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=messages,  # type: ignore[arg-type]
-            temperature=0,
+        # temperature=0 makes the call idempotent, so it may be hedged
+        response = await hedger_for("openai").call(
+            lambda: get_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=messages,  # type: ignore[arg-type]
+                temperature=0,
+            )
         )
         raw = response.choices[0].message.content
         answer = (raw or "").strip().lower()
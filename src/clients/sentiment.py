@@ -13,11 +13,10 @@ from typing import Mapping
 
 import httpx
 
+from src.clients.hedging import hedger_for
 from src.config import settings
 from src.schemas.enums import SentimentEnum  # type: ignore[attr-defined]
 
-API_URL = "https://api.apilayer.com/sentiment/analysis"
-
 # map the API’s sentiment strings to our enum values
 _SENTIMENT_MAP: Mapping[str, SentimentEnum] = {
     "positive": SentimentEnum.POSITIVE,
@@ -54,12 +53,18 @@ async def get_sentiment(text: str) -> SentimentEnum:
     logger.debug(
         "Calling Sentiment API for text (first 100 chars): %r", text[:100]
     )  # noqa: E501
-    try:
+
+    async def attempt() -> httpx.Response:
         async with httpx.AsyncClient(timeout=timeout) as client:
             response = await client.post(
-                API_URL, headers=headers, content=text
+                settings.sentiment_api_url, headers=headers, content=text
             )  # noqa: E501
             response.raise_for_status()
+        return response
+
+    try:
+        # a slow call may be hedged with a second attempt (see hedging.py)
+        response = await hedger_for("sentiment").call(attempt)
 
         payload = response.json()
         raw_sentiment = payload.get("sentiment", "")
@@ -8,45 +8,65 @@ Handles all network and API errors gracefully, always returning a boolean.
 """
 
 import logging
+from typing import NamedTuple, Optional
 
 import httpx
 
+from src.clients.hedging import hedger_for
 from src.config import settings
 
-API_URL = "https://api.apilayer.com/spamchecker"
-
 logger = logging.getLogger(__name__)
 
 
-async def check_spam(text: str) -> bool:
+class SpamResult(NamedTuple):
+    """
+    Spam check outcome.
+
+    Attributes:
+        is_spam: True if the API marks the text as spam.
+        score: API spam score normalized to 0-1, or None if unavailable.
+    """
+
+    is_spam: bool
+    score: Optional[float]
+
+
+async def check_spam(text: str) -> SpamResult:
     """
     Check if the given text is classified as spam via APILayer Spam Checker.
 
     Sends the text as plain content with an optional threshold query param.
-    Returns True if API marks it as spam, False otherwise (including on error).
+    Returns is_spam=True if API marks it as spam, False otherwise
+    (including on error, where score is None).
 
     Args:
         text: the input text to evaluate
         threshold: spam sensitivity (1–10; lower means more aggressive)
 
     Returns:
-        bool: True if spam, False if not or on failure
+        SpamResult: spam flag and normalized score
     """
     headers = {
         "apikey": settings.spam_api_key,
         "Content-Type": "text/plain",
     }
     # build URL with threshold parameter
-    url = f"{API_URL}?threshold={settings.threshold}"
+    url = f"{settings.spam_api_url}?threshold={settings.threshold}"
 
     # configure timeouts: 2s connect, 5s read, total 8s
     timeout = httpx.Timeout(timeout=8.0, connect=2.0, read=5.0)
 
     logger.debug("Spam check request (first 100 chars): %r", text[:100])
-    try:
+
+    async def attempt() -> httpx.Response:
         async with httpx.AsyncClient(timeout=timeout) as client:
             response = await client.post(url, headers=headers, content=text)
             response.raise_for_status()
+        return response
+
+    try:
+        # a slow call may be hedged with a second attempt (see hedging.py)
+        response = await hedger_for("spam").call(attempt)
 
         payload = response.json()
         # response fields: is_spam (bool),
@@ -54,7 +74,11 @@ async def check_spam(text: str) -> bool:
         is_spam = bool(payload.get("is_spam", False))
         score = payload.get("score")
         logger.info("Spam API response: is_spam=%s, score=%s", is_spam, score)
-        return is_spam
+        # the API scores on the same 0-10 scale as its threshold
+        normalized = (
+            min(1.0, max(0.0, float(score) / 10)) if score is not None else None
+        )
+        return SpamResult(is_spam, normalized)
 
     except httpx.HTTPStatusError as exc:
         # API returned 4xx or 5xx
@@ -77,4 +101,4 @@ async def check_spam(text: str) -> bool:
     logger.warning(
         "Returning False (not spam) due to error for text: %r", text[:40]
     )  # noqa: E501
-    return False
+    return SpamResult(False, None)
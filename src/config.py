@@ -6,6 +6,8 @@ using Pydantic v2 pydantic-settings, with explicit __init__ to satisfy type
 checkers and avoid “missing arguments” errors.
 """
 
+from typing import Dict, List, Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -32,6 +34,22 @@ class Settings(BaseSettings):
         ...,
         description="SQLAlchemy database URL",
     )
+    database_read_url: Optional[str] = Field(
+        None,
+        description="Read-replica database URL for read/list endpoints "
+        "(unset: everything uses database_url)",
+    )
+    database_read_pool_size: int = Field(
+        10, description="Connection pool size of the read-replica engine"
+    )
+    database_read_max_overflow: int = Field(
+        20, description="Extra read-replica connections allowed under load"
+    )
+    read_your_writes_seconds: float = Field(
+        5,
+        description="After a client's write, its reads go to the primary for "
+        "this long (covers replication lag)",
+    )
     sentiment_api_key: str = Field(
         ..., description="API key for Sentiment Analysis by APILayer"
     )
@@ -46,12 +64,268 @@ class Settings(BaseSettings):
         "http://ip-api.com/json",
         description="Base URL for IP geolocation API (no key required)",
     )
+    sentiment_api_url: str = Field(
+        "https://api.apilayer.com/sentiment/analysis",
+        description="Endpoint of the APILayer Sentiment Analysis API",
+    )
+    spam_api_url: str = Field(
+        "https://api.apilayer.com/spamchecker",
+        description="Endpoint of the APILayer Spam Checker API",
+    )
+    openai_base_url: Optional[str] = Field(
+        None,
+        description="Override for the OpenAI API base URL (e.g. a local stub)",
+    )
     log_level: str = Field(
         "INFO",
         description="Log level for application logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)",  # noqa: E501
     )
     threshold: float = Field(5, description="Threshold for spam api(1-10)")
 
+    # Hedged upstream requests (see src/clients/hedging.py)
+    hedging_enabled: bool = Field(
+        False, description="Send a second attempt for slow upstream calls"
+    )
+    hedge_quantile: float = Field(
+        0.9, description="Latency quantile after which a call is hedged"
+    )
+    hedge_budget_ratio: float = Field(
+        0.1, description="Maximum share of an upstream's calls that are hedged"
+    )
+    hedge_min_samples: int = Field(
+        20, description="Observed latencies needed before hedging starts"
+    )
+    hedge_min_delay_ms: float = Field(
+        50, description="Lower bound of the hedge delay in milliseconds"
+    )
+
+    # Near-duplicate detection (see src/services/dedup.py)
+    dedup_enabled: bool = Field(
+        True, description="Reuse enrichment of near-duplicate complaints"
+    )
+    dedup_threshold: float = Field(
+        0.8, description="Minimum estimated Jaccard similarity of a near-duplicate"
+    )
+    dedup_capacity: int = Field(
+        20000, description="Number of recent complaints kept in the index"
+    )
+    dedup_max_chars: int = Field(
+        2000, description="Characters of a text hashed for near-duplicate lookup"
+    )
+    dedup_num_perm: int = Field(64, description="MinHash signature length")
+    dedup_bands: int = Field(
+        16, description="LSH bands (must divide the signature length)"
+    )
+
+    # Local spam pre-filter (see src/services/spam_filter.py)
+    spam_local_clean: bool = Field(
+        False,
+        description="Settle low-scoring texts locally as clean instead of asking "
+        "the Spam API (without it, only spam is decided locally)",
+    )
+    spam_local_low: float = Field(
+        0.2,
+        description="Local spam score at or below which a text is clean "
+        "(with SPAM_LOCAL_CLEAN)",
+    )
+    spam_local_high: float = Field(
+        0.8, description="Local spam score at or above which a text is spam"
+    )
+    spam_ip_max_submissions: int = Field(
+        20, description="Submissions per IP and window before it looks abusive"
+    )
+    spam_ip_window_seconds: float = Field(
+        3600, description="Sliding window for per-IP submission counting"
+    )
+    spam_bloom_capacity: int = Field(
+        100_000, description="Known spam signatures the Bloom filter is sized for"
+    )
+
+    # Ingestion guard for POST /complaints (see src/core/ratelimit.py)
+    ingest_rate_limit: int = Field(
+        30, description="Complaints per client IP and window (0 disables)"
+    )
+    ingest_rate_window_seconds: float = Field(
+        60, description="Sliding window length for the per-IP rate limit"
+    )
+    ingest_max_in_flight: int = Field(
+        64, description="Maximum concurrent complaint enrichments (0 disables)"
+    )
+    ingest_retry_after_seconds: int = Field(
+        2, description="Retry-After sent when the enrichment capacity is full"
+    )
+    rate_limit_backend: str = Field(
+        "memory", description="Rate limit state store (see RATE_LIMIT_BACKENDS)"
+    )
+
+    # Idempotency-Key for POST /complaints (see src/services/idempotency_service.py)
+    idempotency_ttl_seconds: int = Field(
+        86400, description="How long a stored response is replayed for its key"
+    )
+    idempotency_wait_seconds: float = Field(
+        30, description="How long a repeat waits for the in-flight original"
+    )
+    idempotency_lock_seconds: float = Field(
+        120, description="Age after which an unfinished original is taken over"
+    )
+    idempotency_purge_interval_seconds: float = Field(
+        300, description="Minimum interval between purges of expired keys"
+    )
+
+    # Enrichment stages (see src/services/enrichment.py)
+    enrichment_disabled_stages: List[str] = Field(
+        [],
+        description=(
+            'Stages to skip, e.g. ["geo"] '
+            "(sentiment, spam, geo, category, embedding)"
+        ),
+    )
+    enrichment_stage_timeouts: Dict[str, float] = Field(
+        {}, description='Per-stage timeout overrides in seconds, e.g. {"category": 20}'
+    )
+    enrichment_stage_costs: Dict[str, float] = Field(
+        {}, description='Cost of one upstream call per stage, e.g. {"category": 0.0005}'
+    )
+
+    # Enrichment priority scheduling (see src/services/priority.py)
+    enrichment_concurrency: int = Field(
+        16, description="Concurrent enrichment steps across all priorities"
+    )
+    enrichment_normal_limit: int = Field(
+        12, description="Concurrent enrichment steps of normal priority"
+    )
+    enrichment_low_limit: int = Field(
+        4, description="Concurrent enrichment steps of low priority"
+    )
+    enrichment_aging_seconds: float = Field(
+        2.0, description="Queue wait that promotes a waiter by one priority level"
+    )
+
+    # Complaint embeddings and similarity (see src/services/vector_index.py)
+    embedding_provider: str = Field(
+        "hashing", description="Embedding provider: hashing (local) or openai"
+    )
+    embedding_model: str = Field(
+        "text-embedding-3-small", description="OpenAI embedding model"
+    )
+    embedding_dim: int = Field(256, description="Embedding vector dimension")
+    embedding_index_dir: str = Field(
+        "data/embeddings", description="Directory of the similarity index snapshot"
+    )
+    embedding_nprobe: int = Field(
+        8, description="Clusters searched per similarity query (0 searches all)"
+    )
+    embedding_sync_seconds: float = Field(
+        5.0, description="Interval between syncs of new vectors from the database"
+    )
+    embedding_tail_capacity: int = Field(
+        20000,
+        description="Most recent vectors held in memory per worker beyond the "
+        "snapshot (older ones are searched after the next clustering run)",
+    )
+
+    # Complaint clustering job (see src/services/clustering_service.py)
+    cluster_count: int = Field(32, description="Number of complaint clusters")
+    cluster_recent_hours: float = Field(
+        24, description="Window of recent complaints for emerging clusters"
+    )
+    cluster_sample_size: int = Field(
+        50000, description="Vectors the cluster centroids are trained on"
+    )
+    cluster_emerging_lift: float = Field(
+        2.0, description="Lift (recent share / overall share) of an emerging cluster"
+    )
+    cluster_emerging_min_recent: int = Field(
+        3, description="Recent complaints needed for an emerging cluster"
+    )
+
+    # Load shedding under overload (see src/core/load_shedding.py)
+    load_shedding_enabled: bool = Field(
+        True, description="Switch to degraded enrichment automatically"
+    )
+    load_shed_interval_ms: float = Field(
+        100, description="Interval between event loop lag samples"
+    )
+    load_shed_lag_high_ms: float = Field(
+        200, description="Smoothed event loop lag that enters degraded mode"
+    )
+    load_shed_lag_low_ms: float = Field(
+        50, description="Smoothed event loop lag below which degraded mode may end"
+    )
+    load_shed_in_flight_high: int = Field(
+        48, description="In-flight submissions that enter degraded mode (0 disables)"
+    )
+    load_shed_in_flight_low: int = Field(
+        24, description="In-flight submissions below which degraded mode may end"
+    )
+    load_shed_min_degraded_seconds: float = Field(
+        5.0, description="Minimum time spent in degraded mode"
+    )
+
+    # Re-enrichment job (see src/services/reenrich_service.py)
+    reenrich_batch_size: int = Field(
+        200, description="Complaints per re-enrichment batch and transaction"
+    )
+    reenrich_concurrency: int = Field(
+        8, description="Concurrent upstream calls of the re-enrichment job"
+    )
+    reenrich_rate_per_second: int = Field(
+        5, description="Re-enrichment calls per second and upstream API"
+    )
+    reenrich_checkpoint: str = Field(
+        "data/reenrich.checkpoint.json",
+        description="Progress file of the re-enrichment job",
+    )
+
+    # Admin endpoints (see src/routers/admin.py)
+    admin_token: Optional[str] = Field(
+        None, description="Bearer token for /admin endpoints (unset disables them)"
+    )
+
+    # On-demand profiling via /admin/profile (see src/core/profiling.py)
+    profile_max_seconds: float = Field(
+        60.0, description="Longest CPU or memory profile capture allowed"
+    )
+
+    # Cold storage of closed complaints (see src/services/archive_service.py)
+    archive_dir: str = Field(
+        "data/archive", description="Directory of the monthly archive partitions"
+    )
+    archive_after_days: int = Field(
+        180, description="Archive closed complaints older than this many days"
+    )
+    archive_batch_size: int = Field(
+        1000, description="Complaints moved to the archive per transaction"
+    )
+
+    # Monthly partitions of complaints (see src/services/partition_service.py)
+    partition_months_ahead: int = Field(
+        3, description="Monthly partitions created ahead of the current month"
+    )
+
+    # Production server (see src/server.py)
+    server_host: str = Field("0.0.0.0", description="Interface to bind the server to")
+    server_port: int = Field(8000, description="TCP port to bind the server to")
+    server_workers: Optional[int] = Field(
+        None,
+        description="Number of worker processes (default: one per available CPU)",
+    )
+    server_max_workers: int = Field(
+        8, description="Upper bound for the CPU-derived worker count"
+    )
+    server_graceful_timeout: int = Field(
+        30, description="Seconds to drain in-flight requests on shutdown"
+    )
+    server_keepalive_timeout: int = Field(
+        5, description="Seconds to keep idle HTTP connections open"
+    )
+    server_backlog: int = Field(
+        2048, description="Maximum number of pending connections"
+    )
+    server_run_migrations: bool = Field(
+        True, description="Apply Alembic migrations before starting workers"
+    )
+
     def __init__(self, **kwargs):
         """
         Explicit no-arg __init__ so static type checkers
@@ -0,0 +1,27 @@
+"""
+src/core/client_ip.py
+
+Client IP extraction shared by route handlers and ASGI middleware.
+"""
+
+from starlette.types import Scope
+
+
+def client_ip_from_scope(scope: Scope) -> str:
+    """
+    Return the originating client IP of a request.
+
+    Uses the first address of X-Forwarded-For when present (the service runs
+    behind a proxy), otherwise the peer address of the connection.
+
+    Args:
+        scope: ASGI connection scope.
+
+    Returns:
+        str: Client IP, or an empty string if unknown.
+    """
+    for name, value in scope.get("headers", ()):
+        if name == b"x-forwarded-for":
+            return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else ""
@@ -1,13 +1,26 @@
 """
 src/core/dependencies.py
 
-Async SQLAlchemy engine and session factory using the new async_sessionmaker,
-plus FastAPI dependency for providing a database session to route handlers.
+Async SQLAlchemy engines and session factories using the new
+async_sessionmaker, plus FastAPI dependencies for providing a database
+session to route handlers.
+
+Engines are created on first use (or by init_engines() in the application
+lifespan), not at import, so importing the application, its models or the
+CLI stays cheap.
+
+Writes always go to the primary (`get_db`). Read-only endpoints use
+`get_read_db`, which routes to the read replica configured by
+DATABASE_READ_URL -- except for a client that wrote recently (marked by a
+cookie), whose reads stay on the primary so it sees its own changes.
 """
 
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Optional
 
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import (  # noqa: E501
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -15,19 +28,88 @@ from sqlalchemy.ext.asyncio import (  # noqa: E501
 
 from ..config import settings
 
-# Create the async engine using the DATABASE_URL from settings
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,  # Log SQL for debugging; disable or set to False in production
-    future=True,  # Use SQLAlchemy 2.0 API
-)
+# Cookie holding the Unix time until which the client reads from the primary
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
 
-# Use async_sessionmaker to create AsyncSession instances correctly
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    expire_on_commit=False,  # Do not expire objects after commit
-    class_=AsyncSession,
-)
+_engine: Optional[AsyncEngine] = None
+_read_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def init_engines() -> None:
+    """Create the primary and read-replica engines if not created yet."""
+    global _engine, _read_engine, _session_factory, _read_session_factory
+    if _engine is not None:
+        return
+    # Create the async engine using the DATABASE_URL from settings
+    _engine = create_async_engine(
+        settings.database_url,
+        echo=True,  # Log SQL for debugging; disable or set to False in production
+        future=True,  # Use SQLAlchemy 2.0 API
+    )
+    # Read-replica engine with its own pool; falls back to the primary engine
+    read_url = settings.database_read_url
+    _read_engine = (
+        create_async_engine(
+            read_url,
+            echo=_engine.echo,
+            future=True,
+            pool_size=settings.database_read_pool_size,
+            max_overflow=settings.database_read_max_overflow,
+            pool_pre_ping=True,  # replicas get restarted/failed over independently
+        )
+        if read_url
+        else _engine
+    )
+    # Use async_sessionmaker to create AsyncSession instances correctly
+    _session_factory = async_sessionmaker(
+        _engine,
+        expire_on_commit=False,  # Do not expire objects after commit
+        class_=AsyncSession,
+    )
+    _read_session_factory = async_sessionmaker(
+        _read_engine,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+
+async def dispose_engines() -> None:
+    """Close all pooled connections and forget the engines."""
+    global _engine, _read_engine, _session_factory, _read_session_factory
+    if _read_engine is not None and _read_engine is not _engine:
+        await _read_engine.dispose()
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = _read_engine = None
+    _session_factory = _read_session_factory = None
+
+
+def has_read_replica() -> bool:
+    """Whether a separate read-replica database is configured."""
+    return bool(settings.database_read_url)
+
+
+def get_engine() -> AsyncEngine:
+    """Return the primary engine, creating it on first use."""
+    init_engines()
+    assert _engine is not None
+    return _engine
+
+
+def open_session() -> AsyncSession:
+    """Open a new session on the primary database."""
+    init_engines()
+    assert _session_factory is not None
+    return _session_factory()
+
+
+def open_read_session() -> AsyncSession:
+    """Open a new session on the read replica (or the primary without one)."""
+    init_engines()
+    assert _read_session_factory is not None
+    return _read_session_factory()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -37,5 +119,49 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession: a database session tied to the request lifecycle.
     """
-    async with AsyncSessionLocal() as session:
+    async with open_session() as session:
         yield session
+
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the client's read-your-writes window is still open."""
+    try:
+        until = float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency yielding a session for read-only endpoints.
+
+    Uses the read replica, or the primary while the client's read-your-writes
+    window is open (see mark_recent_write). Clients that drop cookies always
+    read from the replica, and may not see their own recent writes.
+
+    Yields:
+        AsyncSession: a read-only database session tied to the request.
+    """
+    opener = open_session if wrote_recently(request) else open_read_session
+    async with opener() as session:
+        yield session
+
+
+def mark_recent_write(response: Response) -> None:
+    """
+    Open the read-your-writes window for the client of a write response.
+
+    The window lives in a cookie rather than in process memory, so it holds
+    across workers; it is a no-op when no read replica is configured.
+    """
+    if not has_read_replica():
+        return
+    window = settings.read_your_writes_seconds
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=max(1, int(window + 0.999)),
+        httponly=True,
+        samesite="lax",
+    )
@@ -0,0 +1,176 @@
+"""
+src/core/load_shedding.py
+
+Automatic degraded mode for complaint enrichment under overload.
+
+A background task samples event loop lag (how late a timer fires) and the
+number of in-flight complaint submissions. When either crosses its high
+watermark the worker switches to degraded mode, in which
+create_complaint skips the geolocation stage, decides spam with the local
+pre-filter alone instead of the Spam API, categorizes with local keywords
+instead of OpenAI, and marks the complaint for a later backfill
+(python -m src.cli reenrich). The worker returns to normal mode
+only when both signals are back below their low watermarks and it has been
+degraded for at least LOAD_SHED_MIN_DEGRADED_SECONDS, so the mode does not
+flap around a single threshold.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+NORMAL = "normal"
+DEGRADED = "degraded"
+AUTO = "auto"
+
+# Weight of the newest lag sample in the smoothed lag
+_LAG_SMOOTHING = 0.3
+
+
+class LoadShedder:
+    """
+    Event-loop-lag monitor and degraded-mode switch with hysteresis.
+
+    Attributes:
+        interval (float): Seconds between lag samples.
+        lag_high (float): Smoothed lag (seconds) that enters degraded mode.
+        lag_low (float): Smoothed lag (seconds) below which it may leave.
+        in_flight_high (int): In-flight submissions that enter degraded mode
+            (0 disables this trigger).
+        in_flight_low (int): In-flight submissions below which it may leave.
+        min_degraded (float): Minimum seconds spent in degraded mode.
+        forced (Optional[str]): NORMAL or DEGRADED pinned by an operator,
+            None for automatic switching.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        lag_high: float = 0.2,
+        lag_low: float = 0.05,
+        in_flight_high: int = 48,
+        in_flight_low: int = 24,
+        min_degraded: float = 5.0,
+    ):
+        self.interval = interval
+        self.lag_high = lag_high
+        self.lag_low = lag_low
+        self.in_flight_high = in_flight_high
+        self.in_flight_low = in_flight_low
+        self.min_degraded = min_degraded
+        self.forced: Optional[str] = None
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.in_flight = 0
+        self.transitions = 0
+        self._degraded = False
+        self._since = time.monotonic()
+        self._in_flight_source: Callable[[], int] = lambda: 0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def degraded(self) -> bool:
+        """Whether complaints are currently enriched in degraded mode."""
+        if self.forced is not None:
+            return self.forced == DEGRADED
+        return self._degraded
+
+    def force(self, mode: str) -> None:
+        """
+        Pin the mode (NORMAL or DEGRADED), or return to automatic switching
+        (AUTO).
+        """
+        if mode not in (AUTO, NORMAL, DEGRADED):
+            raise ValueError(f"Unknown load shedding mode: {mode!r}")
+        self.forced = None if mode == AUTO else mode
+        logger.warning("Load shedding mode set to %s", mode)
+
+    def start(self, in_flight: Callable[[], int]) -> None:
+        """
+        Start sampling on the running event loop.
+
+        Args:
+            in_flight: Returns the current number of in-flight submissions.
+        """
+        self._in_flight_source = in_flight
+        if self._task is None:
+            self._task = asyncio.create_task(self._monitor(), name="load-shedder")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _monitor(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            sample = max(0.0, time.monotonic() - expected)
+            self.observe(sample, self._in_flight_source())
+
+    def observe(self, lag: float, in_flight: int) -> None:
+        """
+        Feed one lag sample and the in-flight count, switching modes when
+        a watermark is crossed.
+        """
+        self.lag = _LAG_SMOOTHING * lag + (1 - _LAG_SMOOTHING) * self.lag
+        self.max_lag = max(self.max_lag, lag)
+        self.in_flight = in_flight
+        now = time.monotonic()
+        overloaded = self.lag >= self.lag_high or (
+            self.in_flight_high > 0 and in_flight >= self.in_flight_high
+        )
+        recovered = self.lag <= self.lag_low and (
+            self.in_flight_high <= 0 or in_flight <= self.in_flight_low
+        )
+        if not self._degraded and overloaded:
+            self._switch(True, now)
+        elif self._degraded and recovered and now - self._since >= self.min_degraded:
+            self._switch(False, now)
+
+    def _switch(self, degraded: bool, now: float) -> None:
+        self._degraded = degraded
+        self._since = now
+        self.transitions += 1
+        log = logger.warning if degraded else logger.info
+        log(
+            "Enrichment switched to %s mode (loop lag %.0f ms, %d in flight)",
+            DEGRADED if degraded else NORMAL,
+            self.lag * 1000,
+            self.in_flight,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current mode, signals and watermarks (times in ms)."""
+        return {
+            "mode": DEGRADED if self.degraded else NORMAL,
+            "forced": self.forced is not None,
+            "monitoring": self._task is not None,
+            "mode_since_seconds": time.monotonic() - self._since,
+            "transitions": self.transitions,
+            "loop_lag_ms": self.lag * 1000,
+            "max_loop_lag_ms": self.max_lag * 1000,
+            "in_flight": self.in_flight,
+            "lag_high_ms": self.lag_high * 1000,
+            "lag_low_ms": self.lag_low * 1000,
+            "in_flight_high": self.in_flight_high,
+            "in_flight_low": self.in_flight_low,
+        }
+
+
+# Shared per-process switch; import `load_shedder` wherever needed
+load_shedder = LoadShedder(
+    interval=settings.load_shed_interval_ms / 1000,
+    lag_high=settings.load_shed_lag_high_ms / 1000,
+    lag_low=settings.load_shed_lag_low_ms / 1000,
+    in_flight_high=settings.load_shed_in_flight_high,
+    in_flight_low=settings.load_shed_in_flight_low,
+    min_degraded=settings.load_shed_min_degraded_seconds,
+)
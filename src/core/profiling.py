@@ -0,0 +1,287 @@
+"""
+src/core/profiling.py
+
+On-demand CPU and memory profiles of a running worker, for the
+/admin/profile endpoints.
+
+    - CPU: a sampling profiler. A background thread reads the stack of the
+      event loop thread (or of every thread) every few milliseconds for a
+      bounded time and counts identical stacks. The result is in the folded
+      format ("outer;inner;leaf count" per line) read by flamegraph.pl,
+      speedscope and inferno. Samples of an idle loop (nothing running
+      above the loop's own frames) are counted apart and left out of the
+      stacks.
+    - Memory: tracemalloc traces allocations for a bounded time; what was
+      allocated in that window and is still alive at its end is grouped by
+      source line (or file, or traceback), largest growth first.
+
+Nothing runs between captures: the sampling thread exists, and tracemalloc
+traces, only while a capture is in progress, so an idle worker pays nothing.
+One capture runs at a time per worker.
+"""
+
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from types import CodeType, FrameType
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames recorded per allocation when grouping by traceback
+TRACEBACK_FRAMES = 10
+
+# Frames of coroutines (and of the generators they await through)
+_COROUTINE_FLAGS = (
+    inspect.CO_COROUTINE
+    | inspect.CO_ITERABLE_COROUTINE
+    | inspect.CO_ASYNC_GENERATOR
+    | inspect.CO_GENERATOR
+)
+# asyncio's own wait for I/O, between the loop and the OS
+_SELECTOR_MODULES = ("selectors", "asyncio.windows_events")
+
+# GIL switch interval during a CPU capture. The sampling thread needs the
+# GIL to read stacks; with the default 5 ms the loop keeps it through short
+# bursts of work and hands it over only when it goes back to waiting for
+# I/O, so those bursts would be sampled as idle.
+_CAPTURE_SWITCH_INTERVAL = 0.0001
+
+# Allocations of the import machinery and of tracemalloc itself are noise
+_MEMORY_FILTERS = [
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class ProfilerBusy(Exception):
+    """Raised when a capture is already in progress in this worker."""
+
+
+@dataclass
+class CpuProfile:
+    """
+    Result of a CPU capture.
+
+    Attributes:
+        stacks (Dict[str, int]): Samples per folded stack (root first,
+            frames separated by ";").
+        samples (int): Samples in `stacks`.
+        idle_samples (int): Samples of the idle event loop.
+        seconds (float): Actual duration of the capture.
+        interval (float): Seconds between samples.
+    """
+
+    stacks: Dict[str, int]
+    samples: int
+    idle_samples: int
+    seconds: float
+    interval: float
+
+    def folded(self) -> str:
+        """The stacks in folded format, most sampled first."""
+        lines = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in lines)
+
+
+def _frame_label(frame: FrameType) -> str:
+    """`module:qualified.name` of the function running in a frame."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def loop_codes(frame: Optional[FrameType]) -> FrozenSet[CodeType]:
+    """
+    Code of the frames running the event loop, seen from a frame of a
+    running coroutine: every frame below the chain of coroutine frames.
+    """
+    while frame is not None and frame.f_code.co_flags & _COROUTINE_FLAGS:
+        frame = frame.f_back
+    codes = set()
+    while frame is not None:
+        codes.add(frame.f_code)
+        frame = frame.f_back
+    return frozenset(codes)
+
+
+def _is_idle(frame: FrameType, loop: FrozenSet[CodeType]) -> bool:
+    """
+    Whether a thread runs nothing above the event loop's own frames, apart
+    from asyncio waiting in its selector. Under uvloop the loop and its
+    selector are C code, so there the innermost frame of an idle loop is
+    the one that started it.
+    """
+    current: Optional[FrameType] = frame
+    while current is not None and current.f_code not in loop:
+        if current.f_globals.get("__name__") not in _SELECTOR_MODULES:
+            return False
+        current = current.f_back
+    return current is not None
+
+
+def _location(frame: tracemalloc.Frame, group_by: str) -> str:
+    """Source of an allocation group: the file, or file:line."""
+    return frame.filename if group_by == "filename" else str(frame)
+
+
+class Profiler:
+    """
+    Serializes the captures of one worker and bounds their duration.
+
+    Attributes:
+        max_seconds (float): Longest capture allowed.
+    """
+
+    def __init__(self, max_seconds: float) -> None:
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        """Whether a capture is in progress."""
+        return self._lock.locked()
+
+    def _acquire(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already being captured in this worker")
+
+    async def cpu(
+        self, seconds: float, interval: float, all_threads: bool = False
+    ) -> CpuProfile:
+        """
+        Sample stacks for `seconds` (at most max_seconds).
+
+        Must be awaited on the event loop: the loop's thread is the one
+        profiled unless `all_threads` is set.
+
+        Raises:
+            ProfilerBusy: Another capture is in progress.
+        """
+        self._acquire()
+        seconds = min(seconds, self.max_seconds)
+        logger.info("Capturing a CPU profile for %.1fs", seconds)
+        try:
+            target = None if all_threads else threading.get_ident()
+            loop = loop_codes(sys._getframe())
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_interval, _CAPTURE_SWITCH_INTERVAL))
+            try:
+                return await asyncio.to_thread(
+                    self._sample, target, seconds, interval, loop
+                )
+            finally:
+                sys.setswitchinterval(switch_interval)
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _sample(
+        target: Optional[int],
+        seconds: float,
+        interval: float,
+        loop: FrozenSet[CodeType],
+    ) -> CpuProfile:
+        """
+        Sampling loop, run in a worker thread; `loop` is the code of the
+        event loop's own frames (see loop_codes).
+        """
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks: Counter[str] = Counter()
+        samples = idle = 0
+        started = time.monotonic()
+        deadline = started + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (target is not None and ident != target):
+                    continue
+                if _is_idle(frame, loop):
+                    idle += 1
+                    continue
+                labels: List[str] = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    labels.append(_frame_label(current))
+                    current = current.f_back
+                if target is None:
+                    labels.append(f"thread:{names.get(ident, ident)}")
+                stacks[";".join(reversed(labels))] += 1
+                samples += 1
+            time.sleep(interval)
+        return CpuProfile(
+            stacks=dict(stacks),
+            samples=samples,
+            idle_samples=idle,
+            seconds=time.monotonic() - started,
+            interval=interval,
+        )
+
+    async def memory(
+        self, seconds: float, limit: int, group_by: str = "lineno"
+    ) -> Dict[str, Any]:
+        """
+        Trace allocations for `seconds` (at most max_seconds) and report the
+        `limit` groups whose live memory grew most.
+
+        If tracemalloc was already tracing (PYTHONTRACEMALLOC), it is left
+        running afterwards.
+
+        Raises:
+            ProfilerBusy: Another capture is in progress.
+        """
+        self._acquire()
+        seconds = min(seconds, self.max_seconds)
+        logger.info("Capturing a memory profile for %.1fs", seconds)
+        try:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start(TRACEBACK_FRAMES if group_by == "traceback" else 1)
+            try:
+                before = tracemalloc.take_snapshot()
+                await asyncio.sleep(seconds)
+                after = await asyncio.to_thread(tracemalloc.take_snapshot)
+                traced, peak = tracemalloc.get_traced_memory()
+            finally:
+                if not was_tracing:
+                    tracemalloc.stop()
+            stats = await asyncio.to_thread(
+                lambda: after.filter_traces(_MEMORY_FILTERS).compare_to(
+                    before.filter_traces(_MEMORY_FILTERS), group_by
+                )
+            )
+        finally:
+            self._lock.release()
+
+        return {
+            "seconds": seconds,
+            "group_by": group_by,
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "allocations": [
+                {
+                    "location": _location(stat.traceback[-1], group_by),
+                    "traceback": [str(frame) for frame in stat.traceback],
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+
+# Shared per-process profiler; import `profiler` wherever needed
+profiler = Profiler(max_seconds=settings.profile_max_seconds)
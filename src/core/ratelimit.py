@@ -0,0 +1,195 @@
+"""
+src/core/ratelimit.py
+
+Ingestion guard for POST /complaints: per-client sliding-window rate
+limiting plus a global cap on in-flight enrichments.
+
+Over-limit clients get 429 and, when the enrichment capacity is exhausted,
+every client gets 503 -- both with Retry-After -- instead of requests
+queuing without bound behind slow upstream APIs.
+
+The rate limit state lives behind RateLimitBackend; the in-memory backend
+is per process. A shared store (e.g. Redis) can be plugged in by
+implementing RateLimitBackend and registering it in RATE_LIMIT_BACKENDS.
+"""
+
+import abc
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterable, Optional, Tuple
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .client_ip import client_ip_from_scope
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(abc.ABC):
+    """Storage for per-key request counters."""
+
+    @abc.abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """
+        Count one request for `key` if it fits into the limit.
+
+        Args:
+            key: Client identifier (e.g. IP address).
+            limit: Maximum requests per window.
+            window: Window length in seconds.
+
+        Returns:
+            Tuple[bool, float]: (allowed, seconds until the next request
+            would be allowed; 0 when allowed).
+        """
+
+
+class InMemorySlidingWindowBackend(RateLimitBackend):
+    """
+    Exact sliding-window log kept in process memory.
+
+    Only accepted requests are stored, so each key holds at most `limit`
+    timestamps; at most `max_keys` keys are tracked (least recently used
+    evicted first).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        hits = self._hits.pop(key, None) or deque()
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            self._hits[key] = hits
+            return False, hits[0] + window - now
+        hits.append(now)
+        self._hits[key] = hits
+        if len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+        return True, 0.0
+
+
+RATE_LIMIT_BACKENDS: Dict[str, Callable[[], RateLimitBackend]] = {
+    "memory": InMemorySlidingWindowBackend,
+}
+
+
+def create_rate_limit_backend(name: str) -> RateLimitBackend:
+    """Instantiate a registered rate limit backend by name."""
+    try:
+        return RATE_LIMIT_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown rate limit backend {name!r}; "
+            f"available: {', '.join(RATE_LIMIT_BACKENDS)}"
+        ) from None
+
+
+class InFlightLimiter:
+    """
+    Non-blocking counter of in-flight enrichments with a hard cap.
+
+    Attributes:
+        max_in_flight (int): Capacity; 0 disables the cap.
+        in_flight (int): Requests currently being processed.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free."""
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Return a slot."""
+        self.in_flight -= 1
+
+
+class IngestionGuardMiddleware:
+    """
+    ASGI middleware applying the rate limit and in-flight cap to complaint
+    submissions; every other request passes straight through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: RateLimitBackend,
+        limiter: InFlightLimiter,
+        rate_limit: int,
+        window_seconds: float,
+        retry_after_seconds: float = 1,
+        paths: Iterable[str] = ("/complaints", "/complaints/"),
+        methods: Iterable[str] = ("POST",),
+    ):
+        self.app = app
+        self.backend = backend
+        self.limiter = limiter
+        self.rate_limit = rate_limit
+        self.window_seconds = window_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.paths = frozenset(paths)
+        self.methods = frozenset(methods)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limit:
+            client_ip = client_ip_from_scope(scope)
+            allowed, retry_after = await self.backend.hit(
+                client_ip, self.rate_limit, self.window_seconds
+            )
+            if not allowed:
+                logger.warning("Rate limit exceeded for %s", client_ip)
+                await _reject(send, 429, "Too many complaints submitted", retry_after)
+                return
+
+        if not self.limiter.try_acquire():
+            logger.warning(
+                "Enrichment capacity exhausted (%d in flight)", self.limiter.in_flight
+            )
+            await _reject(
+                send,
+                503,
+                "Service is at capacity, retry later",
+                self.retry_after_seconds,
+            )
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+
+async def _reject(
+    send: Send, status_code: int, detail: str, retry_after: Optional[float]
+) -> None:
+    body = orjson.dumps({"detail": detail})
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if retry_after is not None:
+        seconds = max(1, math.ceil(retry_after))
+        headers.append((b"retry-after", str(seconds).encode()))
+    await send(
+        {"type": "http.response.start", "status": status_code, "headers": headers}
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,39 @@
+"""
+src/core/security.py
+
+Access control for the operational /admin endpoints.
+
+Admin endpoints require `Authorization: Bearer <ADMIN_TOKEN>`. With no
+ADMIN_TOKEN configured they answer 404, as if they did not exist.
+"""
+
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from ..config import settings
+
+# Module-level default to avoid B008
+AUTHORIZATION_HEADER = Header(None, description="Bearer <admin token>")
+
+
+async def require_admin(authorization: Optional[str] = AUTHORIZATION_HEADER) -> None:
+    """
+    FastAPI dependency rejecting requests without the admin bearer token.
+
+    Raises:
+        HTTPException: 404 when admin endpoints are disabled, 401 when the
+        token is missing or wrong.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.strip().encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,76 @@
+"""
+src/core/serialization.py
+
+Fast JSON encoding for complaint responses.
+
+List endpoints select plain column tuples and encode them straight to bytes
+with orjson, skipping ORM hydration, Pydantic validation and FastAPI's
+generic jsonable_encoder. Single-object endpoints dump an already validated
+schema once instead of letting FastAPI re-validate it against response_model.
+"""
+
+from typing import Any, Iterable, Sequence
+
+import orjson
+from fastapi import Response, status
+from pydantic import BaseModel
+
+# Match Pydantic's JSON output for UTC datetimes ("...Z" rather than "+00:00")
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Field order of the public response schemas (see src/schemas/complaint.py)
+COMPLAINT_FIELDS = ("id", "status", "sentiment", "category", "version")
+COMPLAINT_WITH_TEXT_FIELDS = (
+    "id",
+    "text",
+    "status",
+    "sentiment",
+    "category",
+    "timestamp",
+    "duplicate_of_id",
+    "is_spam",
+    "spam_score",
+    "country_code",
+    "region",
+    "city",
+    "latitude",
+    "longitude",
+    "version",
+)
+
+
+def encode_rows(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> bytes:
+    """
+    Encode result rows to a JSON array of objects.
+
+    Args:
+        rows: Column tuples in the same order as `fields`.
+        fields: Output key for each column.
+
+    Returns:
+        bytes: UTF-8 JSON, e.g. b'[{"id":1,"status":"open",...}]'.
+    """
+    return orjson.dumps(
+        [dict(zip(fields, row)) for row in rows], option=_ORJSON_OPTIONS
+    )
+
+
+def json_response(content: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Wrap pre-encoded JSON bytes in a response.
+
+    Returning a Response instance makes FastAPI skip response_model
+    validation and serialization entirely.
+    """
+    return Response(
+        content=content, status_code=status_code, media_type="application/json"
+    )
+
+
+def model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Encode a validated Pydantic model with orjson and wrap it in a response.
+    """
+    return json_response(
+        orjson.dumps(model.model_dump(), option=_ORJSON_OPTIONS), status_code
+    )
@@ -8,26 +8,84 @@ Application entrypoint: creates FastAPI app, includes routers,
 and configures metadata for autogenerated OpenAPI documentation.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from .clients.openai_client import get_client
 from .config import settings
+from .core.dependencies import dispose_engines, init_engines, open_session
+from .core.load_shedding import load_shedder
 from .core.logging import setup_logging
+from .core.ratelimit import (
+    InFlightLimiter,
+    IngestionGuardMiddleware,
+    create_rate_limit_backend,
+)
+from .routers.admin import router as admin_router
 from .routers.complaints import router as complaints_router
+from .services.dedup import rebuild_index
+from .services.spam_filter import load_spam_signatures
+from .services.vector_index import refresh_vector_index
 
 setup_logging(settings.log_level)
 logger = logging.getLogger(__name__)
 
 
+# In-flight complaint enrichments of this worker
+ingest_limiter = InFlightLimiter(settings.ingest_max_in_flight)
+
+
+async def rebuild_dedup_index() -> None:
+    """Rebuild the near-duplicate index while the worker serves."""
+    try:
+        async with open_session() as session:
+            await rebuild_index(session)
+    except Exception as e:
+        logger.error("Rebuilding the near-duplicate index failed: %s", e, exc_info=True)
+
+
+async def sync_vector_index() -> None:
+    """Load the similarity index while the worker serves."""
+    try:
+        async with open_session() as session:
+            await refresh_vector_index(session, force=True)
+    except Exception as e:
+        logger.error("Syncing the similarity index failed: %s", e, exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info(
         "Application startup: log_level=%s",
         settings.log_level,
     )
+    init_engines()
+    # import the OpenAI SDK in a thread, overlapping the rest of startup,
+    # rather than on the event loop at the first classification
+    openai_warmup = asyncio.create_task(asyncio.to_thread(get_client))
+    # in-memory indexes load in the background, while the worker serves
+    warmups = [asyncio.create_task(sync_vector_index())]
+    if settings.dedup_enabled:
+        warmups.append(asyncio.create_task(rebuild_dedup_index()))
+    app.state.warmups = warmups
+    try:
+        async with open_session() as session:
+            await load_spam_signatures(session)
+    except Exception as e:
+        logger.error("Loading spam signatures failed: %s", e, exc_info=True)
+    if settings.load_shedding_enabled:
+        load_shedder.start(lambda: ingest_limiter.in_flight)
     yield
+    await load_shedder.stop()
+    for task in warmups:
+        task.cancel()
+    await asyncio.gather(*warmups, return_exceptions=True)
+    await asyncio.gather(openai_warmup, return_exceptions=True)
+    await dispose_engines()
     logger.info("Application shutdown.")
 
 
@@ -36,6 +94,9 @@ def create_app() -> FastAPI:
     Construct and configure the FastAPI application.
 
     - Sets title, version, and description for the OpenAPI docs.
+    - Uses orjson for every JSON response by default.
+    - Guards complaint submission with the per-IP rate limit and the
+      in-flight enrichment cap.
     - Includes all API routers.
     """
     app = FastAPI(
@@ -46,8 +107,18 @@ def create_app() -> FastAPI:
         redoc_url="/redoc",  # ReDoc
         openapi_url="/openapi.json",  # Spec
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+    app.add_middleware(
+        IngestionGuardMiddleware,
+        backend=create_rate_limit_backend(settings.rate_limit_backend),
+        limiter=ingest_limiter,
+        rate_limit=settings.ingest_rate_limit,
+        window_seconds=settings.ingest_rate_window_seconds,
+        retry_after_seconds=settings.ingest_retry_after_seconds,
     )
     app.include_router(complaints_router)
+    app.include_router(admin_router)
     return app
 
 
@@ -6,9 +6,9 @@ rich docstrings and column comments
 to enable clean autogenerated documentation.
 """
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Integer, String
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, false
 from sqlalchemy.sql import func
 
 from ..schemas.enums import CategoryEnum, SentimentEnum, StatusEnum
@@ -26,12 +26,39 @@ class Complaint(Base):
         timestamp (datetime): Creation timestamp, set automatically.
         sentiment (SentimentEnum): Sentiment analysis result.
         category (CategoryEnum): Complaint category.
+        duplicate_of_id (int): Original complaint this one is a near-duplicate of.
+        is_spam (bool): Whether the complaint was classified as spam.
+        spam_score (float): Spam likelihood from 0 to 1, if known.
+        country_code (str): ISO country code of the submitting client, if known.
+        region (str): Region of the submitting client, if known.
+        city (str): City of the submitting client, if known.
+        latitude (float): Approximate latitude of the submitting client.
+        longitude (float): Approximate longitude of the submitting client.
+        enrichment_deferred (bool): Enriched in degraded mode; the spam check
+            and category await a backfill.
+        version (int): Row version, incremented on every update (optimistic
+            concurrency control).
     """
 
     __tablename__ = "complaints"
-    __table_args__ = {
-        "comment": "Table of customer complaints with sentiment and category metadata"  # noqa: E501
-    }
+    __table_args__ = (
+        # serves the list/n8n query: non-spam, by status, since a timestamp
+        Index(
+            "ix_complaints_is_spam_status_timestamp", "is_spam", "status", "timestamp"
+        ),
+        # serves regional filters and drill-downs over a time range
+        Index(
+            "ix_complaints_country_region_timestamp",
+            "country_code",
+            "region",
+            "timestamp",
+        ),
+        {
+            "comment": "Table of customer complaints with sentiment and category metadata",  # noqa: E501
+            # never reuse the ID of a deleted (archived) complaint on SQLite
+            "sqlite_autoincrement": True,
+        },
+    )
 
     id = Column(
         Integer,
@@ -66,3 +93,61 @@ class Complaint(Base):
         nullable=False,
         comment="Complaint category: technical, payment, or other",
     )
+    duplicate_of_id = Column(
+        Integer,
+        ForeignKey("complaints.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        comment="Original complaint this one is a near-duplicate of",
+    )
+    is_spam = Column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        nullable=False,
+        comment="Whether the complaint was classified as spam",
+    )
+    spam_score = Column(
+        Float,
+        nullable=True,
+        comment="Spam likelihood from 0 to 1 (local pre-filter or remote API)",
+    )
+    country_code = Column(
+        String(2),
+        nullable=True,
+        comment="ISO 3166-1 alpha-2 country code of the client (GeoIP)",
+    )
+    region = Column(
+        String(100),
+        nullable=True,
+        comment="Region or state of the client (GeoIP)",
+    )
+    city = Column(
+        String(100),
+        nullable=True,
+        comment="City of the client (GeoIP)",
+    )
+    latitude = Column(
+        Float,
+        nullable=True,
+        comment="Approximate latitude of the client (GeoIP)",
+    )
+    longitude = Column(
+        Float,
+        nullable=True,
+        comment="Approximate longitude of the client (GeoIP)",
+    )
+    enrichment_deferred = Column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        nullable=False,
+        comment="Enriched in degraded mode; spam check and category await a backfill",  # noqa: E501
+    )
+    version = Column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+        comment="Row version, incremented on every update",
+    )
@@ -0,0 +1,49 @@
+"""
+src/models/complaint_archive.py
+
+SQLAlchemy model for the complaint_archive_index table: where each archived
+complaint lives in cold storage (see src/services/archive_service.py).
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class ComplaintArchiveEntry(Base):
+    """
+    Represents the location of one archived complaint.
+
+    Attributes:
+        complaint_id (int): ID the complaint had in the complaints table.
+        partition (str): Monthly partition file name (e.g. "2025-01.jsonl.gz").
+        member_offset (int): Byte offset of the gzip member holding the record.
+        archived_at (datetime): When the complaint was archived.
+    """
+
+    __tablename__ = "complaint_archive_index"
+    __table_args__ = {"comment": "Archived complaint ID to cold storage partition"}
+
+    complaint_id = Column(
+        Integer,
+        primary_key=True,
+        autoincrement=False,
+        comment="ID the complaint had in the complaints table",
+    )
+    partition = Column(
+        String(32),
+        nullable=False,
+        comment="Monthly partition file holding the archived record",
+    )
+    member_offset = Column(
+        BigInteger,
+        nullable=False,
+        comment="Byte offset of the gzip member holding the record",
+    )
+    archived_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="When the complaint was archived",
+    )
@@ -0,0 +1,46 @@
+"""
+src/models/complaint_embedding.py
+
+SQLAlchemy model for the complaint_embeddings table: the embedding vector
+of each non-spam complaint (see src/services/embeddings.py), from which the
+similarity index is built.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class ComplaintEmbedding(Base):
+    """
+    Represents the embedding of one complaint.
+
+    Attributes:
+        complaint_id (int): The embedded complaint.
+        model (str): Embedding provider name (vector space) of the vector.
+        vector (bytes): Unit-length float32 vector, little-endian.
+        created_at (datetime): When the vector was computed.
+    """
+
+    __tablename__ = "complaint_embeddings"
+    __table_args__ = ({"comment": "Embedding vectors of complaints"},)
+
+    complaint_id = Column(
+        Integer,
+        ForeignKey("complaints.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Embedded complaint",
+    )
+    model = Column(
+        String(100), nullable=False, comment="Embedding provider of the vector"
+    )
+    vector = Column(
+        LargeBinary, nullable=False, comment="Unit-length float32 vector (LE)"
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="When the vector was computed",
+    )
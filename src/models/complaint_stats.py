@@ -0,0 +1,72 @@
+"""
+src/models/complaint_stats.py
+
+SQLAlchemy model for the complaint_stats rollup table: pre-aggregated
+complaint counts per hour x category x sentiment x status x country x
+region, maintained
+incrementally on every insert and update of a complaint.
+"""
+
+from sqlalchemy import Column, DateTime
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Integer, String
+
+from ..schemas.enums import CategoryEnum, SentimentEnum, StatusEnum
+from . import Base
+
+
+class ComplaintStats(Base):
+    """
+    Represents one hourly rollup bucket.
+
+    Attributes:
+        bucket (datetime): Start of the hour the complaints were created in.
+        category (CategoryEnum): Complaint category.
+        sentiment (SentimentEnum): Sentiment analysis result.
+        status (StatusEnum): Current complaint status.
+        country_code (str): Client country code, "" when unknown.
+        region (str): Client region, "" when unknown.
+        count (int): Number of complaints currently in this bucket.
+    """
+
+    __tablename__ = "complaint_stats"
+    __table_args__ = {
+        "comment": "Hourly complaint counts by category, sentiment, status and location"
+    }
+
+    bucket = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        comment="Start of the hour the complaints were created in",
+    )
+    category = Column(  # type: ignore[var-annotated]
+        SQLEnum(CategoryEnum), primary_key=True, comment="Complaint category"
+    )
+    sentiment = Column(  # type: ignore[var-annotated]
+        SQLEnum(SentimentEnum), primary_key=True, comment="Sentiment outcome"
+    )
+    status = Column(  # type: ignore[var-annotated]
+        SQLEnum(StatusEnum), primary_key=True, comment="Current complaint status"
+    )
+    # "" instead of NULL for unknown locations: primary key columns must be
+    # non-null, and upserts only match equal (not NULL) values
+    country_code = Column(
+        String(2),
+        primary_key=True,
+        default="",
+        server_default="",
+        comment="Client country code, empty when unknown",
+    )
+    region = Column(
+        String(100),
+        primary_key=True,
+        default="",
+        server_default="",
+        comment="Client region, empty when unknown",
+    )
+    count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Number of complaints in this bucket",
+    )
@@ -0,0 +1,54 @@
+"""
+src/models/idempotency_key.py
+
+SQLAlchemy model for the idempotency_keys table: the stored outcome of a
+POST /complaints request per client-supplied Idempotency-Key (see
+src/services/idempotency_service.py).
+"""
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Represents one Idempotency-Key and the response it produced.
+
+    Attributes:
+        key (str): Client-supplied idempotency key.
+        request_hash (str): SHA-256 of the request payload, so a key reused
+            for a different payload is detected.
+        status_code (int): Status of the stored response; NULL while the
+            original request is still in progress.
+        response_body (bytes): JSON body of the stored response.
+        created_at (datetime): When the original request claimed the key.
+        expires_at (datetime): When the key may be reused.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+        {"comment": "Stored responses of idempotent POST /complaints requests"},
+    )
+
+    key = Column(String(255), primary_key=True, comment="Client idempotency key")
+    request_hash = Column(
+        String(64), nullable=False, comment="SHA-256 of the request payload"
+    )
+    status_code = Column(
+        Integer, nullable=True, comment="Stored status, NULL while in progress"
+    )
+    response_body = Column(
+        LargeBinary, nullable=True, comment="Stored JSON response body"
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="When the original request claimed the key",
+    )
+    expires_at = Column(
+        DateTime(timezone=True), nullable=False, comment="When the key may be reused"
+    )
@@ -0,0 +1,269 @@
+"""
+src/routers/admin.py
+
+FastAPI router for operational endpoints, protected by the admin token
+(see src/core/security.py).
+
+Metrics are per worker process: with several workers, each request reports
+the worker that served it.
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from ..clients.hedging import UPSTREAMS, hedger_for
+from ..config import settings
+from ..core.load_shedding import load_shedder
+from ..core.profiling import ProfilerBusy, profiler
+from ..core.security import require_admin
+from ..schemas.admin import (
+    ClusterReport,
+    EnrichmentQueueStats,
+    EnrichmentStageStats,
+    EnrichmentStageUpdate,
+    LoadSheddingStatus,
+    LoadSheddingUpdate,
+    MemoryProfile,
+    UpstreamStats,
+)
+from ..schemas.enums import AllocationGroupingEnum
+from ..services.clustering_service import load_cluster_report
+from ..services.enrichment import enrichment_stages
+from ..services.priority import enrichment_scheduler
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+# Module-level defaults to avoid B008
+PROFILE_SECONDS_QUERY = Query(
+    10.0,
+    gt=0,
+    le=settings.profile_max_seconds,
+    description="Length of the capture in seconds",
+)
+PROFILE_INTERVAL_QUERY = Query(
+    5.0, ge=1, le=1000, description="Milliseconds between stack samples"
+)
+PROFILE_ALL_THREADS_QUERY = Query(
+    False, description="Sample every thread, not only the event loop"
+)
+PROFILE_LIMIT_QUERY = Query(25, ge=1, le=500, description="Allocation groups to return")
+PROFILE_GROUP_BY_QUERY = Query(
+    AllocationGroupingEnum.LINENO,
+    description="Group allocations by lineno, filename or traceback",
+)
+
+
+@router.get(
+    "/enrichment/queues",
+    response_model=EnrichmentQueueStats,
+    status_code=status.HTTP_200_OK,
+    summary="Enrichment queue depth and wait times per priority",
+    description=(
+        "Running and queued enrichment steps of each priority, with average, "
+        "p95 and maximum queue wait of recent admissions."
+    ),
+)
+async def enrichment_queues_endpoint() -> EnrichmentQueueStats:
+    """
+    Endpoint for operators to see whether enrichment is backlogged and
+    which priorities wait.
+    """
+    return EnrichmentQueueStats.model_validate(enrichment_scheduler.snapshot())
+
+
+@router.get(
+    "/upstreams",
+    response_model=List[UpstreamStats],
+    status_code=status.HTTP_200_OK,
+    summary="Upstream API latency and request hedging",
+    description=(
+        "Latency quantiles of recent calls to each external API, and how many "
+        "calls were hedged with a second attempt."
+    ),
+)
+async def upstreams_endpoint() -> List[UpstreamStats]:
+    """
+    Endpoint for operators to watch upstream tail latency and the extra load
+    caused by hedging.
+    """
+    return [
+        UpstreamStats.model_validate(hedger_for(name).snapshot()) for name in UPSTREAMS
+    ]
+
+
+@router.get(
+    "/enrichment/stages",
+    response_model=List[EnrichmentStageStats],
+    status_code=status.HTTP_200_OK,
+    summary="Enrichment stages with latency and API-call cost counters",
+    description=(
+        "Every enrichment stage with its dependencies, timeout, on/off state, "
+        "outcomes, latency and upstream API calls."
+    ),
+)
+async def enrichment_stages_endpoint() -> List[EnrichmentStageStats]:
+    """
+    Endpoint for operators to see what each enrichment stage costs.
+    """
+    return [
+        EnrichmentStageStats.model_validate(row) for row in enrichment_stages.snapshot()
+    ]
+
+
+@router.put(
+    "/enrichment/stages/{name}",
+    response_model=EnrichmentStageStats,
+    status_code=status.HTTP_200_OK,
+    summary="Enable or disable an enrichment stage",
+    description=(
+        "Turns a stage on or off in this worker process until restart; a "
+        "disabled stage uses its fallback result."
+    ),
+)
+async def update_enrichment_stage_endpoint(
+    name: str, update: EnrichmentStageUpdate
+) -> EnrichmentStageStats:
+    """
+    Endpoint for operators to shed an expensive stage under load.
+    - **name**: sentiment, spam, geo, category or embedding
+    """
+    if name not in enrichment_stages:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown enrichment stage: {name}",
+        )
+    enrichment_stages.set_enabled(name, update.enabled)
+    row = next(row for row in enrichment_stages.snapshot() if row["name"] == name)
+    return EnrichmentStageStats.model_validate(row)
+
+
+@router.get(
+    "/load-shedding",
+    response_model=LoadSheddingStatus,
+    status_code=status.HTTP_200_OK,
+    summary="Current enrichment mode and load signals",
+    description=(
+        "Whether this worker enriches in normal or degraded mode, with the "
+        "event loop lag and in-flight submissions that drive the switch."
+    ),
+)
+async def load_shedding_endpoint() -> LoadSheddingStatus:
+    """
+    Endpoint for operators to see whether complaints are being degraded.
+    """
+    return LoadSheddingStatus.model_validate(load_shedder.snapshot())
+
+
+@router.put(
+    "/load-shedding",
+    response_model=LoadSheddingStatus,
+    status_code=status.HTTP_200_OK,
+    summary="Pin or release the enrichment mode",
+    description=(
+        "Pins this worker to normal or degraded mode until restart, or "
+        "returns it to automatic switching (auto)."
+    ),
+)
+async def update_load_shedding_endpoint(
+    update: LoadSheddingUpdate,
+) -> LoadSheddingStatus:
+    """
+    Endpoint for operators to override the automatic load shedding.
+    - **mode**: auto, normal or degraded
+    """
+    load_shedder.force(update.mode.value)
+    return LoadSheddingStatus.model_validate(load_shedder.snapshot())
+
+
+@router.get(
+    "/clusters",
+    response_model=ClusterReport,
+    status_code=status.HTTP_200_OK,
+    summary="Latest clustering of complaints by similarity",
+    description=(
+        "Clusters of similar complaints from the last run of the clustering "
+        "job, emerging (fast-growing) clusters first."
+    ),
+)
+async def clusters_endpoint() -> ClusterReport:
+    """
+    Endpoint for operators to spot emerging issues.
+    """
+    report = load_cluster_report()
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No clustering report yet: run python -m src.cli cluster",
+        )
+    return ClusterReport.model_validate(report)
+
+
+@router.get(
+    "/profile/cpu",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Sampling CPU profile of this worker, as folded stacks",
+    description=(
+        "Samples the event loop's stack for the given time and returns one "
+        "line per distinct stack with its sample count (input of "
+        "flamegraph.pl, speedscope or inferno). Samples of the idle loop are "
+        "left out and counted in the X-Profile-Idle-Samples header."
+    ),
+    responses={status.HTTP_409_CONFLICT: {"description": "A capture is running"}},
+)
+async def cpu_profile_endpoint(
+    seconds: float = PROFILE_SECONDS_QUERY,
+    interval_ms: float = PROFILE_INTERVAL_QUERY,
+    all_threads: bool = PROFILE_ALL_THREADS_QUERY,
+) -> PlainTextResponse:
+    """
+    Endpoint for operators to see where a worker spends its CPU time.
+    - **seconds**: length of the capture
+    - **interval_ms**: sampling interval
+    - **all_threads**: include worker threads, not only the event loop
+    """
+    try:
+        profile = await profiler.cpu(seconds, interval_ms / 1000, all_threads)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return PlainTextResponse(
+        profile.folded(),
+        headers={
+            "X-Profile-Samples": str(profile.samples),
+            "X-Profile-Idle-Samples": str(profile.idle_samples),
+            "X-Profile-Seconds": f"{profile.seconds:.3f}",
+        },
+    )
+
+
+@router.get(
+    "/profile/memory",
+    response_model=MemoryProfile,
+    status_code=status.HTTP_200_OK,
+    summary="Memory growth of this worker over a time window",
+    description=(
+        "Traces allocations with tracemalloc for the given time and returns "
+        "the allocation sites whose live memory grew most."
+    ),
+    responses={status.HTTP_409_CONFLICT: {"description": "A capture is running"}},
+)
+async def memory_profile_endpoint(
+    seconds: float = PROFILE_SECONDS_QUERY,
+    limit: int = PROFILE_LIMIT_QUERY,
+    group_by: AllocationGroupingEnum = PROFILE_GROUP_BY_QUERY,
+) -> MemoryProfile:
+    """
+    Endpoint for operators to find what a worker keeps allocating.
+    - **seconds**: length of the capture
+    - **limit**: allocation groups to return
+    - **group_by**: lineno, filename or traceback
+    """
+    try:
+        report = await profiler.memory(seconds, limit, group_by.value)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return MemoryProfile.model_validate(report)
@@ -8,20 +8,51 @@ from docstrings and Pydantic models.
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.dependencies import get_db
+from ..core.client_ip import client_ip_from_scope
+from ..core.dependencies import get_db, get_read_db, mark_recent_write
+from ..core.serialization import json_response, model_response
 from ..schemas.complaint import (
     ComplaintCreate,
     ComplaintResponse,
+    ComplaintSearchResult,
     ComplaintWithTextResponse,
+    SimilarComplaint,
+)
+from ..schemas.enums import (
+    CategoryEnum,
+    GranularityEnum,
+    SentimentEnum,
+    StatsDimensionEnum,
+    StatusEnum,
 )
-from ..schemas.enums import StatusEnum
+from ..schemas.stats import ComplaintStatsBucket
 from ..services.complaint_service import (  # type: ignore[attr-defined]  # noqa: E501
     ComplaintService,
+    ComplaintVersionConflict,
+)
+from ..services.idempotency_service import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyService,
+    request_fingerprint,
 )
+from ..services.search_service import SearchService
+from ..services.similarity_service import SimilarityService
+from ..services.stats_service import StatsService
 
 router = APIRouter(prefix="/complaints", tags=["complaints"])
 
@@ -34,7 +65,103 @@ SINCE_QUERY = Query(
     None,
     description="Only complaints created after this timestamp",
 )
+GRANULARITY_QUERY = Query(
+    GranularityEnum.HOUR,
+    description="Bucket size: hour or day",
+)
+UNTIL_QUERY = Query(
+    None,
+    description="Only buckets before this timestamp",
+)
+CATEGORY_QUERY = Query(
+    None,
+    description="Filter by category",
+)
+SENTIMENT_QUERY = Query(
+    None,
+    description="Filter by sentiment",
+)
+SEARCH_QUERY = Query(
+    ...,
+    min_length=1,
+    max_length=200,
+    description="Words to search for in the complaint text (suffix * for prefix)",
+)
+LIMIT_QUERY = Query(
+    50,
+    ge=1,
+    le=200,
+    description="Maximum number of results",
+)
+SIMILAR_LIMIT_QUERY = Query(
+    10,
+    ge=1,
+    le=100,
+    description="Maximum number of similar complaints",
+)
+INCLUDE_SPAM_QUERY = Query(
+    False,
+    description="Also return complaints classified as spam",
+)
+COUNTRY_QUERY = Query(
+    None,
+    min_length=2,
+    max_length=2,
+    description="Filter by client country (ISO 3166-1 alpha-2 code, e.g. DE)",
+)
+REGION_QUERY = Query(
+    None,
+    max_length=100,
+    description="Filter by client region (e.g. Bavaria)",
+)
+GROUP_BY_QUERY = Query(
+    None,
+    description="Dimensions to break counts down by "
+    "(default: category, sentiment, status)",
+)
+IDEMPOTENCY_KEY_HEADER = Header(
+    None,
+    alias="Idempotency-Key",
+    min_length=1,
+    max_length=255,
+    description="Client-chosen key; repeats return the original response",
+)
+IF_MATCH_HEADER = Header(
+    None,
+    description='Version from the ETag of the complaint (e.g. "3"); the update '
+    "fails with 409 if the complaint changed since",
+)
 DB_DEP = Depends(get_db)
+READ_DB_DEP = Depends(get_read_db)
+
+
+def etag(version: int) -> str:
+    """ETag of a complaint representation: its row version."""
+    return f'"{version}"'
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """
+    Extract the expected version from an If-Match header.
+
+    Accepts `"3"`, `W/"3"` and a bare `3`; `*` (or no header) means
+    "any version".
+
+    Raises:
+        HTTPException: 400 when the header is not a version ETag.
+    """
+    if value is None or value.strip() == "*":
+        return None
+    tag = value.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='If-Match must be a complaint version ETag such as "3"',
+        ) from None
 
 
 @router.post(
@@ -51,25 +178,131 @@ async def create_complaint_endpoint(
     payload: ComplaintCreate,
     request: Request,
     db: AsyncSession = DB_DEP,
-) -> ComplaintResponse:
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER,
+) -> Response:
     """
     Endpoint to submit a new complaint.
     - **payload.text**: text of the complaint
+    - **Idempotency-Key**: optional; a retry with the same key returns the
+      first response instead of creating the complaint again
     """
-    xff = request.headers.get("X-Forwarded-For")
-    if xff:
-        client_ip = xff.split(",")[0].strip()
-    else:
-        client_ip = request.scope.get("client", ("", None))[0]
+    client_ip = client_ip_from_scope(request.scope)
+
+    idempotency = IdempotencyService(db)
+    if idempotency_key:
+        try:
+            stored = await idempotency.begin(
+                idempotency_key,
+                request_fingerprint(payload.model_dump_json().encode()),
+            )
+        except IdempotencyKeyMismatch as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+            )
+        except IdempotencyKeyInProgress as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(e),
+                headers={"Retry-After": "1"},
+            )
+        if stored is not None:
+            response = json_response(stored.body, stored.status_code)
+            response.headers["ETag"] = etag(orjson.loads(stored.body)["version"])
+            response.headers["Idempotent-Replayed"] = "true"
+            mark_recent_write(response)
+            return response
 
     service = ComplaintService(db)
     try:
-        return await service.create_complaint(payload, client_ip)
-    except Exception:
+        complaint = await service.create_complaint(payload, client_ip)
+    except BaseException as e:
+        if idempotency_key:
+            await idempotency.abandon(idempotency_key)
+        if not isinstance(e, Exception):
+            raise
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal error while creating complaint",
         )
+    response = model_response(complaint, status.HTTP_201_CREATED)
+    if idempotency_key:
+        await idempotency.complete(
+            idempotency_key, response.status_code, bytes(response.body)
+        )
+    response.headers["ETag"] = etag(complaint.version)
+    mark_recent_write(response)
+    return response
+
+
+@router.get(
+    "/stats",
+    response_model=List[ComplaintStatsBucket],
+    status_code=status.HTTP_200_OK,
+    summary="Aggregated complaint statistics",
+    description=(
+        "Complaint counts per hour or day by category, sentiment, status, "
+        "country and region, served from an incrementally maintained rollup "
+        "table."
+    ),
+)
+async def complaint_stats_endpoint(
+    granularity: GranularityEnum = GRANULARITY_QUERY,
+    since: Optional[datetime] = SINCE_QUERY,
+    until: Optional[datetime] = UNTIL_QUERY,
+    status: Optional[StatusEnum] = STATUS_QUERY,
+    category: Optional[CategoryEnum] = CATEGORY_QUERY,
+    sentiment: Optional[SentimentEnum] = SENTIMENT_QUERY,
+    country_code: Optional[str] = COUNTRY_QUERY,
+    region: Optional[str] = REGION_QUERY,
+    group_by: Optional[List[StatsDimensionEnum]] = GROUP_BY_QUERY,
+    db: AsyncSession = READ_DB_DEP,
+) -> List[ComplaintStatsBucket]:
+    """
+    Endpoint for dashboards: counts by category x sentiment x status per
+    time bucket, filterable by time range and any dimension.
+    - **group_by**: repeat to choose dimensions, e.g.
+      `?group_by=country_code&group_by=category`
+    """
+    service = StatsService(db)
+    return await service.get_stats(
+        granularity=granularity,
+        since=since,
+        until=until,
+        status=status,
+        category=category,
+        sentiment=sentiment,
+        country_code=country_code,
+        region=region,
+        group_by=group_by,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=List[ComplaintSearchResult],
+    status_code=status.HTTP_200_OK,
+    summary="Full-text search over complaint text",
+    description=(
+        "Ranked full-text search with highlighted snippets, "
+        "filterable by status, category and timestamp."
+    ),
+)
+async def search_complaints_endpoint(
+    q: str = SEARCH_QUERY,
+    status: Optional[StatusEnum] = STATUS_QUERY,
+    category: Optional[CategoryEnum] = CATEGORY_QUERY,
+    since: Optional[datetime] = SINCE_QUERY,
+    limit: int = LIMIT_QUERY,
+    db: AsyncSession = READ_DB_DEP,
+) -> List[ComplaintSearchResult]:
+    """
+    Endpoint for support agents to find complaints by words in their text.
+    - **q**: all words must occur; `refund*` matches by prefix
+    """
+    service = SearchService(db)
+    return await service.search(
+        q, status=status, category=category, since=since, limit=limit
+    )
 
 
 @router.get(
@@ -81,8 +314,8 @@ async def create_complaint_endpoint(
 )
 async def read_complaint_endpoint(
     complaint_id: int,
-    db: AsyncSession = DB_DEP,
-) -> ComplaintResponse:
+    db: AsyncSession = READ_DB_DEP,
+) -> Response:
     """
     Endpoint to get complaint details.
     - **complaint_id**: integer ID of the complaint
@@ -94,7 +327,37 @@ async def read_complaint_endpoint(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Complaint not found",
         )
-    return complaint
+    response = model_response(complaint)
+    response.headers["ETag"] = etag(complaint.version)
+    return response
+
+
+@router.get(
+    "/{complaint_id}/similar",
+    response_model=List[SimilarComplaint],
+    status_code=status.HTTP_200_OK,
+    summary="Complaints similar to a given one",
+    description=(
+        "Non-spam complaints ranked by embedding similarity to the given "
+        "complaint, most similar first."
+    ),
+)
+async def similar_complaints_endpoint(
+    complaint_id: int,
+    limit: int = SIMILAR_LIMIT_QUERY,
+    db: AsyncSession = READ_DB_DEP,
+) -> List[SimilarComplaint]:
+    """
+    Endpoint for support agents to find other reports of the same issue.
+    - **complaint_id**: integer ID of the complaint
+    """
+    similar = await SimilarityService(db).similar(complaint_id, limit=limit)
+    if similar is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Complaint not found",
+        )
+    return similar
 
 
 @router.get(
@@ -103,21 +366,32 @@ async def read_complaint_endpoint(
     status_code=status.HTTP_200_OK,
     summary="List complaints (with optional filters)",
     description=(
-        "Retrieve complaints, optionally filtering by status "
-        "and timestamp (for n8n)."
+        "Retrieve complaints, optionally filtering by status, "
+        "timestamp and client location (for n8n)."
     ),
 )
 async def list_complaints_endpoint(
     status: Optional[StatusEnum] = STATUS_QUERY,
     since: Optional[datetime] = SINCE_QUERY,
-    db: AsyncSession = DB_DEP,
-) -> List[ComplaintWithTextResponse]:
+    include_spam: bool = INCLUDE_SPAM_QUERY,
+    country_code: Optional[str] = COUNTRY_QUERY,
+    region: Optional[str] = REGION_QUERY,
+    db: AsyncSession = READ_DB_DEP,
+) -> Response:
     """
     Endpoint to get a list of complaints, filterable by status and timestamp.
-    Useful for n8n workflows.
+    Spam is excluded unless include_spam is set. Useful for n8n workflows.
     """
     service = ComplaintService(db)
-    return await service.get_complaints(status=status, since=since)
+    return json_response(
+        await service.get_complaints_json(
+            status=status,
+            since=since,
+            include_spam=include_spam,
+            country_code=country_code,
+            region=region,
+        )
+    )
 
 
 class StatusUpdate(BaseModel):
@@ -130,25 +404,45 @@ class StatusUpdate(BaseModel):
     status_code=status.HTTP_200_OK,
     summary="Update complaint status",
     description=(
-        "Update status (e.g., close) of a complaint by ID " "(for n8n)."
-    ),  # noqa: E501
+        "Update status (e.g., close) of a complaint by ID (for n8n). "
+        "Send the ETag from a previous response in If-Match to fail with 409 "
+        "instead of overwriting a concurrent change."
+    ),
+    responses={status.HTTP_409_CONFLICT: {"description": "Version conflict"}},
 )
 async def update_complaint_status_endpoint(
     complaint_id: int,
     status_update: StatusUpdate,
+    if_match: Optional[str] = IF_MATCH_HEADER,
     db: AsyncSession = DB_DEP,
-) -> ComplaintResponse:
+) -> Response:
     """
     Endpoint to update complaint status (e.g., close/open) by ID.
     Designed for n8n automations.
+    - **If-Match**: optional version ETag, e.g. `"3"`
     """
+    expected_version = parse_if_match(if_match)
     service = ComplaintService(db)
-    complaint = await service.update_complaint_status(
-        complaint_id, status_update.status
-    )
+    try:
+        complaint = await service.update_complaint_status(
+            complaint_id, status_update.status, expected_version
+        )
+    except ComplaintVersionConflict as e:
+        headers = {}
+        if e.current_version is not None:
+            headers["ETag"] = etag(e.current_version)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Complaint was modified by another request; "
+            "reload it and retry with the new ETag",
+            headers=headers,
+        )
     if not complaint:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Complaint not found",
         )
-    return complaint
+    response = model_response(complaint)
+    response.headers["ETag"] = etag(complaint.version)
+    mark_recent_write(response)
+    return response
@@ -0,0 +1,190 @@
+"""
+src/schemas/admin.py
+
+Pydantic schemas for the operational /admin endpoints.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .enums import AllocationGroupingEnum, LoadSheddingModeEnum
+
+
+class PriorityQueueStats(BaseModel):
+    """
+    Schema for the enrichment queue of one priority.
+
+    Wait times cover the most recent admissions of that priority.
+    """
+
+    priority: str = Field(..., description="high, normal or low")
+    limit: int = Field(..., description="Concurrent slots of this priority")
+    running: int = Field(..., description="Slots currently held")
+    waiting: int = Field(..., description="Queue depth")
+    oldest_wait_ms: float = Field(..., description="Wait of the queue head so far")
+    admitted: int = Field(..., description="Slots granted since startup")
+    wait_ms_avg: float = Field(..., description="Average queue wait")
+    wait_ms_p95: float = Field(..., description="95th percentile queue wait")
+    wait_ms_max: float = Field(..., description="Longest queue wait")
+
+
+class EnrichmentQueueStats(BaseModel):
+    """
+    Schema for the enrichment scheduler of this worker process.
+    """
+
+    capacity: int = Field(..., description="Concurrent slots across priorities")
+    running: int = Field(..., description="Slots currently held")
+    waiting: int = Field(..., description="Queued waiters across priorities")
+    aging_seconds: float = Field(
+        ..., description="Wait that promotes a waiter by one priority level"
+    )
+    priorities: List[PriorityQueueStats]
+
+
+class UpstreamStats(BaseModel):
+    """
+    Schema for the latency and hedging counters of one upstream API.
+
+    Latency quantiles cover recent successful attempts and are null before
+    the first one.
+    """
+
+    upstream: str = Field(
+        ..., description="sentiment, spam, geoip, openai or openai-embeddings"
+    )
+    hedging_enabled: bool = Field(..., description="Whether slow calls are hedged")
+    calls: int = Field(..., description="Calls since startup")
+    hedged: int = Field(..., description="Calls that started a second attempt")
+    hedge_wins: int = Field(..., description="Hedged calls the second attempt won")
+    hedge_delay_ms: Optional[float] = Field(
+        None, description="Current hedge delay, null while uncalibrated"
+    )
+    latency_ms_p50: Optional[float] = Field(None, description="Median latency")
+    latency_ms_p90: Optional[float] = Field(None, description="p90 latency")
+    latency_ms_p99: Optional[float] = Field(None, description="p99 latency")
+
+
+class EnrichmentStageStats(BaseModel):
+    """
+    Schema for the configuration and counters of one enrichment stage.
+    """
+
+    name: str = Field(..., description="sentiment, spam, geo, category or embedding")
+    enabled: bool = Field(..., description="Whether the stage runs")
+    deferred: bool = Field(..., description="Runs after the complaint is stored")
+    depends_on: List[str] = Field(..., description="Stages that run first")
+    timeout_seconds: float = Field(..., description="Timeout before the fallback")
+    runs: int = Field(..., description="Runs since startup")
+    failures: int = Field(..., description="Runs that failed and used the fallback")
+    timeouts: int = Field(..., description="Runs that timed out")
+    skipped: int = Field(..., description="Complaints enriched while disabled")
+    sheddable: bool = Field(..., description="Skipped or run locally when degraded")
+    shed: int = Field(..., description="Complaints enriched in degraded mode")
+    api_calls: int = Field(
+        ..., description="Upstream API requests made, hedges included"
+    )
+    cost: float = Field(..., description="api_calls times the configured cost")
+    latency_ms_avg: float = Field(..., description="Average run latency")
+    latency_ms_p95: float = Field(..., description="95th percentile run latency")
+
+
+class EnrichmentStageUpdate(BaseModel):
+    """
+    Schema for toggling an enrichment stage at runtime.
+    """
+
+    enabled: bool = Field(..., description="Run the stage (false sheds it)")
+
+
+class LoadSheddingStatus(BaseModel):
+    """
+    Schema for the load shedding mode and the signals driving it.
+    """
+
+    mode: str = Field(..., description="normal or degraded")
+    forced: bool = Field(..., description="Mode pinned by an operator")
+    monitoring: bool = Field(..., description="Whether load is being sampled")
+    mode_since_seconds: float = Field(..., description="Time since the last switch")
+    transitions: int = Field(..., description="Mode switches since startup")
+    loop_lag_ms: float = Field(..., description="Smoothed event loop lag")
+    max_loop_lag_ms: float = Field(..., description="Largest lag sample")
+    in_flight: int = Field(..., description="In-flight complaint submissions")
+    lag_high_ms: float = Field(..., description="Lag that enters degraded mode")
+    lag_low_ms: float = Field(..., description="Lag below which it may end")
+    in_flight_high: int = Field(..., description="In-flight that enters it")
+    in_flight_low: int = Field(..., description="In-flight below which it may end")
+
+
+class LoadSheddingUpdate(BaseModel):
+    """
+    Schema for pinning the load shedding mode at runtime.
+    """
+
+    mode: LoadSheddingModeEnum = Field(
+        ..., description="auto (driven by load), normal or degraded"
+    )
+
+
+class ComplaintCluster(BaseModel):
+    """
+    Schema for one cluster of similar complaints.
+    """
+
+    cluster: int = Field(..., description="Cluster number within the report")
+    size: int = Field(..., description="Complaints in the cluster")
+    recent: int = Field(..., description="Complaints within the recent window")
+    lift: float = Field(
+        ..., description="Share of recent complaints over share of all complaints"
+    )
+    emerging: bool = Field(..., description="Growing fast enough to look at")
+    sample_ids: List[int] = Field(..., description="Complaints closest to its centre")
+    sample_texts: List[str] = Field(..., description="Their texts (truncated)")
+
+
+class ClusterReport(BaseModel):
+    """
+    Schema for the latest complaint clustering report.
+    """
+
+    generated_at: str = Field(..., description="When the clustering job ran")
+    model: str = Field(..., description="Embedding provider of the vectors")
+    vectors: int = Field(..., description="Complaints clustered")
+    recent_hours: float = Field(..., description="Length of the recent window")
+    recent_vectors: int = Field(..., description="Complaints within the window")
+    clusters: List[ComplaintCluster] = Field(
+        ..., description="Clusters, emerging and fastest-growing first"
+    )
+
+
+class AllocationGrowth(BaseModel):
+    """
+    Schema for the growth of one group of allocations during a memory profile.
+    """
+
+    location: str = Field(..., description="Allocating file, or file:line")
+    traceback: List[str] = Field(
+        ..., description="Allocating call stack (file:line), outermost first"
+    )
+    size_bytes: int = Field(..., description="Live memory at the end of the capture")
+    size_diff_bytes: int = Field(..., description="Growth during the capture")
+    count: int = Field(..., description="Live allocations at the end of the capture")
+    count_diff: int = Field(..., description="Allocation count growth")
+
+
+class MemoryProfile(BaseModel):
+    """
+    Schema for a tracemalloc memory profile of one worker.
+    """
+
+    seconds: float = Field(..., description="Length of the capture")
+    group_by: AllocationGroupingEnum = Field(
+        ..., description="How allocations are grouped"
+    )
+    traced_bytes: int = Field(..., description="Memory traced at the end")
+    peak_bytes: int = Field(..., description="Peak traced memory during the capture")
+    size_diff_bytes: int = Field(..., description="Growth of all groups together")
+    allocations: List[AllocationGrowth] = Field(
+        ..., description="Groups that grew most, largest growth first"
+    )
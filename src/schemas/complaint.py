@@ -6,6 +6,7 @@ docstrings and Field descriptions for autogenerated OpenAPI docs.
 """
 
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, Field
 from pydantic_settings import SettingsConfigDict
@@ -37,6 +38,7 @@ class ComplaintResponse(BaseModel):
         sentiment: Sentiment analysis result.
         category: Categorization of the complaint.
         timestamp: Timestamp when the complaint was created.
+        version: Row version, incremented on every update.
     """
 
     id: int = Field(..., description="Unique complaint ID")
@@ -49,6 +51,9 @@ class ComplaintResponse(BaseModel):
     category: CategoryEnum = Field(
         ..., description="Assigned complaint category"
     )  # noqa: E501
+    version: int = Field(
+        1, description="Row version; send it in If-Match to update safely"
+    )
 
     model_config = SettingsConfigDict(from_attributes=True)
 
@@ -65,6 +70,15 @@ class ComplaintWithTextResponse(BaseModel):
         sentiment: Sentiment analysis result.
         category: Categorization of the complaint.
         timestamp: Timestamp when the complaint was created.
+        duplicate_of_id: Original complaint if this one is a near-duplicate.
+        is_spam: Whether the complaint was classified as spam.
+        spam_score: Spam likelihood from 0 to 1, if known.
+        country_code: ISO country code of the submitting client, if known.
+        region: Region of the submitting client, if known.
+        city: City of the submitting client, if known.
+        latitude: Approximate latitude of the submitting client.
+        longitude: Approximate longitude of the submitting client.
+        version: Row version, incremented on every update.
     """
 
     id: int = Field(..., description="Unique complaint ID")
@@ -81,5 +95,76 @@ class ComplaintWithTextResponse(BaseModel):
     timestamp: datetime = Field(
         ..., description="Timestamp when the complaint was created"
     )  # noqa: E501
+    duplicate_of_id: Optional[int] = Field(
+        None, description="Original complaint if this one is a near-duplicate"
+    )
+    is_spam: bool = Field(False, description="Whether the complaint is spam")
+    spam_score: Optional[float] = Field(
+        None, description="Spam likelihood from 0 to 1, if known"
+    )
+    country_code: Optional[str] = Field(
+        None, description="ISO 3166-1 alpha-2 country code of the client"
+    )
+    region: Optional[str] = Field(None, description="Region of the client")
+    city: Optional[str] = Field(None, description="City of the client")
+    latitude: Optional[float] = Field(None, description="Approximate latitude")
+    longitude: Optional[float] = Field(None, description="Approximate longitude")
+    version: int = Field(1, description="Row version, incremented on every update")
 
     model_config = SettingsConfigDict(from_attributes=True)
+
+
+class ComplaintSearchResult(BaseModel):
+    """
+    Schema for one full-text search hit.
+
+    Attributes:
+        id: Unique identifier of the complaint.
+        text: Original text of the complaint.
+        status: Current status of the complaint (open or closed).
+        sentiment: Sentiment analysis result.
+        category: Categorization of the complaint.
+        timestamp: Timestamp when the complaint was created.
+        rank: Relevance score (higher is better).
+        snippet: Matching fragment with terms wrapped in <mark> tags.
+    """
+
+    id: int = Field(..., description="Unique complaint ID")
+    text: str = Field(..., description="Original text of the complaint")
+    status: StatusEnum = Field(..., description="Current status of the complaint")
+    sentiment: SentimentEnum = Field(..., description="Sentiment analysis outcome")
+    category: CategoryEnum = Field(..., description="Assigned complaint category")
+    timestamp: datetime = Field(
+        ..., description="Timestamp when the complaint was created"
+    )
+    rank: float = Field(..., description="Relevance score (higher is better)")
+    snippet: str = Field(
+        ..., description="Matching fragment, terms wrapped in <mark> tags"
+    )
+
+
+class SimilarComplaint(BaseModel):
+    """
+    Schema for one complaint similar to a given one.
+
+    Attributes:
+        id: Unique identifier of the complaint.
+        text: Original text of the complaint.
+        status: Current status of the complaint (open or closed).
+        sentiment: Sentiment analysis result.
+        category: Categorization of the complaint.
+        timestamp: Timestamp when the complaint was created.
+        similarity: Cosine similarity of the embeddings (1 is identical).
+    """
+
+    id: int = Field(..., description="Unique complaint ID")
+    text: str = Field(..., description="Original text of the complaint")
+    status: StatusEnum = Field(..., description="Current status of the complaint")
+    sentiment: SentimentEnum = Field(..., description="Sentiment analysis outcome")
+    category: CategoryEnum = Field(..., description="Assigned complaint category")
+    timestamp: datetime = Field(
+        ..., description="Timestamp when the complaint was created"
+    )
+    similarity: float = Field(
+        ..., description="Cosine similarity of the embeddings (1 is identical)"
+    )
@@ -51,3 +51,65 @@ class CategoryEnum(str, Enum):
     TECHNICAL = "technical"  # Technical complaint
     PAYMENT = "payment"  # Payment complaint
     OTHER = "other"  # Other complaint
+
+
+class GranularityEnum(str, Enum):
+    """
+    Enumeration of time bucket sizes for complaint statistics.
+
+    Attributes:
+        HOUR: One bucket per hour.
+        DAY: One bucket per calendar day.
+    """
+
+    HOUR = "hour"  # Hourly buckets (native rollup resolution)
+    DAY = "day"  # Daily buckets (summed from hourly rollups)
+
+
+class StatsDimensionEnum(str, Enum):
+    """
+    Enumeration of dimensions complaint statistics can be grouped by.
+
+    Attributes:
+        CATEGORY: Complaint category.
+        SENTIMENT: Sentiment analysis result.
+        STATUS: Complaint status.
+        COUNTRY_CODE: Client country (GeoIP).
+        REGION: Client region (GeoIP).
+    """
+
+    CATEGORY = "category"  # Group by complaint category
+    SENTIMENT = "sentiment"  # Group by sentiment
+    STATUS = "status"  # Group by status
+    COUNTRY_CODE = "country_code"  # Group by client country
+    REGION = "region"  # Group by client region
+
+
+class LoadSheddingModeEnum(str, Enum):
+    """
+    Enumeration of load shedding modes an operator can select.
+
+    Attributes:
+        AUTO: Switch between normal and degraded by load.
+        NORMAL: Always enrich fully.
+        DEGRADED: Always enrich in degraded mode.
+    """
+
+    AUTO = "auto"  # Driven by event loop lag and in-flight submissions
+    NORMAL = "normal"  # Full enrichment
+    DEGRADED = "degraded"  # Shed geo, local spam check and category
+
+
+class AllocationGroupingEnum(str, Enum):
+    """
+    Enumeration of how a memory profile groups allocations.
+
+    Attributes:
+        LINENO: By the source line that allocated.
+        FILENAME: By the source file that allocated.
+        TRACEBACK: By the call stack that allocated.
+    """
+
+    LINENO = "lineno"  # One group per allocating line
+    FILENAME = "filename"  # One group per allocating file
+    TRACEBACK = "traceback"  # One group per allocating call stack
@@ -0,0 +1,41 @@
+"""
+src/schemas/stats.py
+
+Pydantic schemas for aggregated complaint statistics.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .enums import CategoryEnum, SentimentEnum, StatusEnum
+
+
+class ComplaintStatsBucket(BaseModel):
+    """
+    Schema for one aggregated statistics bucket.
+
+    Dimensions that were not grouped by are null.
+
+    Attributes:
+        bucket: Start of the hour or day.
+        category: Complaint category.
+        sentiment: Sentiment analysis result.
+        status: Complaint status.
+        country_code: Client country code ("" when unknown).
+        region: Client region ("" when unknown).
+        count: Number of complaints in the bucket.
+    """
+
+    bucket: datetime = Field(..., description="Start of the hour or day")
+    category: Optional[CategoryEnum] = Field(None, description="Complaint category")
+    sentiment: Optional[SentimentEnum] = Field(
+        None, description="Sentiment analysis outcome"
+    )
+    status: Optional[StatusEnum] = Field(None, description="Complaint status")
+    country_code: Optional[str] = Field(
+        None, description='Client country code, "" when unknown'
+    )
+    region: Optional[str] = Field(None, description='Client region, "" when unknown')
+    count: int = Field(..., description="Number of complaints in the bucket")
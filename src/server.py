@@ -0,0 +1,124 @@
+"""
+src/server.py
+
+Production launcher for the Complaint Processing API.
+
+Applies Alembic migrations once in the master process, then starts Uvicorn
+with a CPU-derived number of worker processes, uvloop/httptools when they
+are installed, and a graceful drain period on shutdown.
+
+Usage:
+    python -m src.server
+"""
+
+import importlib
+import importlib.util
+import logging
+import os
+from typing import Optional
+
+import uvicorn
+
+from .config import settings
+from .core.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = "src.main:app"
+
+
+def available_cpus() -> int:
+    """
+    Return the number of CPUs this process may run on.
+
+    Honors CPU affinity / cgroup pinning where the platform exposes it,
+    falling back to the total CPU count.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_workers(configured: Optional[int] = None) -> int:
+    """
+    Determine how many worker processes to start.
+
+    Args:
+        configured (Optional[int]): Explicit worker count from settings.
+
+    Returns:
+        int: The configured count, or one worker per available CPU
+        capped at settings.server_max_workers.
+    """
+    if configured:
+        return max(1, configured)
+    return max(1, min(available_cpus(), settings.server_max_workers))
+
+
+def _loop_impl() -> str:
+    """Use uvloop when installed, otherwise the default asyncio loop."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def _http_impl() -> str:
+    """Use the httptools parser when installed, otherwise h11."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def run_migrations() -> None:
+    """
+    Apply all pending Alembic migrations (equivalent to `alembic upgrade head`).
+
+    Runs in the master process before any worker is started, so workers never
+    race each other on the schema.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    logger.info("Applying database migrations")
+    config = Config("alembic.ini")
+    # keep our logging setup; alembic's fileConfig would disable our loggers
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+def main() -> None:
+    """
+    Run migrations, validate the app and start Uvicorn workers.
+    """
+    setup_logging(settings.log_level)
+
+    if settings.server_run_migrations:
+        run_migrations()
+
+    # Import the application once in the master so configuration or import
+    # errors abort here instead of crash-looping every worker.
+    importlib.import_module("src.main")
+
+    workers = resolve_workers(settings.server_workers)
+    loop = _loop_impl()
+    http = _http_impl()
+    logger.info(
+        "Starting server on %s:%s (workers=%d, loop=%s, http=%s)",
+        settings.server_host,
+        settings.server_port,
+        workers,
+        loop,
+        http,
+    )
+    uvicorn.run(
+        APP_PATH,
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        loop=loop,  # type: ignore[arg-type]
+        http=http,  # type: ignore[arg-type]
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive_timeout,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        log_level=settings.log_level.lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
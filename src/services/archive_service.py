@@ -0,0 +1,271 @@
+"""
+src/services/archive_service.py
+
+Tiered storage for closed complaints.
+
+ArchiveService moves closed complaints older than a cutoff out of the
+complaints table into monthly partition files -- gzip-compressed JSON lines,
+one file per creation month -- and records each complaint's partition and
+byte offset in complaint_archive_index, so archived complaints stay
+readable by ID.
+
+Every archival batch appends one self-contained gzip member per touched
+partition; a lookup seeks to the member's offset and decompresses only that
+member, not the whole month.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import orjson
+from sqlalchemy import delete, exists, insert, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from ..config import settings
+from ..models.complaint import Complaint
+from ..models.complaint_archive import ComplaintArchiveEntry
+from ..models.complaint_embedding import ComplaintEmbedding
+from ..schemas.enums import StatusEnum
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX = ".jsonl.gz"
+_READ_CHUNK = 64 * 1024
+
+# every column of the complaints table, "id" first (lookups match on it)
+ARCHIVED_FIELDS = tuple(column.name for column in Complaint.__table__.columns)
+
+
+class ArchiveStore:
+    """
+    Monthly partition files of archived complaints in one directory.
+
+    Attributes:
+        root (Path): Directory holding the partition files.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    @staticmethod
+    def partition_name(timestamp: datetime) -> str:
+        """Partition file name for a complaint created at `timestamp`."""
+        return f"{timestamp:%Y-%m}{PARTITION_SUFFIX}"
+
+    def append(self, partition: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Append records to a partition as one gzip member and fsync it.
+
+        A failed write is truncated away, so the file never ends in a
+        partial member.
+
+        Returns:
+            int: Byte offset of the new member.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = b"".join(orjson.dumps(record) + b"\n" for record in records)
+        with open(self.root / partition, "ab") as fh:
+            offset = fh.tell()
+            try:
+                fh.write(gzip.compress(payload))
+                fh.flush()
+                os.fsync(fh.fileno())
+            except BaseException:
+                fh.truncate(offset)
+                raise
+        return offset
+
+    def read(
+        self, partition: str, offset: int, complaint_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load one archived complaint from the member starting at `offset`.
+        """
+        prefix = b'{"id":%d,' % complaint_id
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)  # gzip framing
+        data = bytearray()
+        with open(self.root / partition, "rb") as fh:
+            fh.seek(offset)
+            while not decompressor.eof:
+                chunk = fh.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                data += decompressor.decompress(chunk)
+        for line in data.splitlines():
+            if line.startswith(prefix):
+                return orjson.loads(line)
+        return None
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every archived complaint once, partition by partition.
+
+        Records written twice (an archival batch retried after its database
+        transaction failed) are yielded once.
+        """
+        if not self.root.is_dir():
+            return
+        for path in sorted(self.root.glob(f"*{PARTITION_SUFFIX}")):
+            seen: Set[int] = set()
+            with gzip.open(path, "rb") as fh:
+                for line in fh:
+                    record = orjson.loads(line)
+                    if record["id"] not in seen:
+                        seen.add(record["id"])
+                        yield record
+
+
+# Shared store; import `archive_store` wherever needed
+archive_store = ArchiveStore(settings.archive_dir)
+
+
+class ArchiveService:
+    """
+    Service moving closed complaints to cold storage and reading them back.
+
+    Responsibilities:
+        - Select closed complaints older than a cutoff, in batches.
+        - Write them to monthly partitions and index their location.
+        - Delete them from the complaints table in the same transaction
+          as the index rows, unless they changed since they were read.
+        - Serve archived complaints by ID.
+    """
+
+    def __init__(self, session: AsyncSession, store: ArchiveStore = archive_store):
+        """
+        Initialize the ArchiveService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+            store (ArchiveStore): Partition files to write to and read from.
+        """
+        self.session = session
+        self.store = store
+
+    async def archive(
+        self,
+        older_than_days: int = settings.archive_after_days,
+        batch_size: int = settings.archive_batch_size,
+    ) -> int:
+        """
+        Move closed complaints created before the cutoff to the archive.
+
+        Complaints that a live (not yet archivable) near-duplicate points to
+        stay in the table, so the duplicate_of_id link is not lost. A
+        complaint updated (e.g. reopened) after it was read is not deleted,
+        and so not archived either; a later batch reads it again if it is
+        still archivable. The stats rollup is left untouched: archived
+        complaints still count.
+
+        Args:
+            older_than_days (int): Age threshold in days.
+            batch_size (int): Complaints moved per transaction.
+
+        Returns:
+            int: Number of archived complaints.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        archivable = (Complaint.status == StatusEnum.CLOSED) & (
+            Complaint.timestamp < cutoff
+        )
+        duplicate = aliased(Complaint)
+        referenced = exists().where(
+            duplicate.duplicate_of_id == Complaint.id,
+            or_(duplicate.status != StatusEnum.CLOSED, duplicate.timestamp >= cutoff),
+        )
+        # newest first: near-duplicates are archived no later than their
+        # original, before deleting it could clear their duplicate_of_id
+        query = (
+            select(*(getattr(Complaint, field) for field in ARCHIVED_FIELDS))
+            .where(archivable, ~referenced)
+            .order_by(Complaint.id.desc())
+            .limit(batch_size)
+        )
+
+        total = 0
+        while True:
+            rows = (await self.session.execute(query)).all()
+            if not rows:
+                break
+            read = {row.id: dict(zip(ARCHIVED_FIELDS, row)) for row in rows}
+            # delete first, only the rows still closed at the version read:
+            # the partitions then never hold a stale copy of a live complaint
+            deleted = (
+                (
+                    await self.session.execute(
+                        delete(Complaint)
+                        .where(
+                            Complaint.status == StatusEnum.CLOSED,
+                            tuple_(Complaint.id, Complaint.version).in_(
+                                [(row.id, row.version) for row in rows]
+                            ),
+                        )
+                        .returning(Complaint.id)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not deleted:
+                continue  # all changed since read; read the batch again
+            partitions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for complaint_id in deleted:
+                record = read[complaint_id]
+                partitions[self.store.partition_name(record["timestamp"])].append(
+                    record
+                )
+
+            entries: List[Dict[str, Any]] = []
+            for partition, records in partitions.items():
+                offset = await asyncio.to_thread(self.store.append, partition, records)
+                entries.extend(
+                    {
+                        "complaint_id": record["id"],
+                        "partition": partition,
+                        "member_offset": offset,
+                    }
+                    for record in records
+                )
+            await self.session.execute(insert(ComplaintArchiveEntry), entries)
+            # SQLite does not enforce the ON DELETE CASCADE of embeddings
+            await self.session.execute(
+                delete(ComplaintEmbedding).where(
+                    ComplaintEmbedding.complaint_id.in_(deleted)
+                )
+            )
+            await self.session.commit()
+            total += len(deleted)
+            logger.info(
+                "Archived %d complaints into %s", len(deleted), ", ".join(partitions)
+            )
+        logger.info("Archival complete: %d complaints older than %s", total, cutoff)
+        return total
+
+    async def get(self, complaint_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an archived complaint by ID.
+
+        Args:
+            complaint_id (int): The unique ID of the complaint.
+
+        Returns:
+            Optional[Dict[str, Any]]: The archived record, or None if the ID
+            was never archived.
+        """
+        entry = await self.session.get(ComplaintArchiveEntry, complaint_id)
+        if entry is None:
+            return None
+        return await asyncio.to_thread(
+            self.store.read,
+            entry.partition,  # type: ignore[arg-type]
+            entry.member_offset,  # type: ignore[arg-type]
+            complaint_id,
+        )
@@ -0,0 +1,245 @@
+"""
+src/services/clustering_service.py
+
+Periodic clustering of complaint embeddings to spot emerging issues.
+
+The job (python -m src.cli cluster, run from cron):
+
+    1. Embeds complaints that have no vector yet.
+    2. Streams every vector into a new similarity index snapshot
+       (see src/services/vector_index.py).
+    3. Clusters them with spherical k-means on a sample; the centroids also
+       become the snapshot's inverted-file lists.
+    4. Reports every cluster with its size, its number of recent complaints
+       and its lift: the cluster's share of recent complaints divided by its
+       share of all complaints. A lift well above 1 means the topic is
+       growing, e.g. a sudden "payment gateway outage".
+
+The report is saved to clusters.json in EMBEDDING_INDEX_DIR and served by
+GET /admin/clusters.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.complaint import Complaint
+from ..models.complaint_embedding import ComplaintEmbedding
+from .embeddings import embedding_provider
+from .similarity_service import SimilarityService
+from .vector_index import (
+    SnapshotWriter,
+    assign_clusters,
+    from_blob,
+    spherical_kmeans,
+)
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = "clusters.json"
+_READ_BATCH = 5000
+_SAMPLES_PER_CLUSTER = 3
+_SAMPLE_TEXT_LENGTH = 200
+
+
+def load_cluster_report(directory: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Read the latest clustering report; None if the job has not run."""
+    path = (directory or Path(settings.embedding_index_dir)) / REPORT_FILE
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+class ClusteringService:
+    """
+    Service building the similarity index snapshot and the cluster report.
+
+    Responsibilities:
+        - Backfill missing embeddings.
+        - Write the memory-mapped index snapshot from complaint_embeddings.
+        - Cluster the vectors and rank clusters by recent growth.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the ClusteringService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+        """
+        self.session = session
+        self.directory = Path(settings.embedding_index_dir)
+
+    async def run(
+        self,
+        clusters: int = settings.cluster_count,
+        recent_hours: float = settings.cluster_recent_hours,
+        sample_size: int = settings.cluster_sample_size,
+        embed_batch_size: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Rebuild the index snapshot and the cluster report.
+
+        Args:
+            clusters (int): Number of clusters (k).
+            recent_hours (float): Window of "recent" complaints.
+            sample_size (int): Vectors the centroids are trained on.
+            embed_batch_size (int): Complaints per embedding call.
+
+        Returns:
+            Dict[str, Any]: The report, also saved to clusters.json.
+        """
+        embedded = await SimilarityService(self.session).embed_missing(embed_batch_size)
+        if embedded:
+            logger.info("Embedded %d complaints without a vector", embedded)
+
+        base = (
+            select(ComplaintEmbedding.complaint_id)
+            .join(Complaint, Complaint.id == ComplaintEmbedding.complaint_id)
+            .where(
+                ComplaintEmbedding.model == embedding_provider.name,
+                Complaint.is_spam.is_(False),
+            )
+        )
+        count = await self.session.scalar(
+            select(func.count()).select_from(base.subquery())
+        )
+        recent_since = datetime.now(timezone.utc) - timedelta(hours=recent_hours)
+        report: Dict[str, Any] = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "model": embedding_provider.name,
+            "vectors": count or 0,
+            "recent_hours": recent_hours,
+            "recent_vectors": 0,
+            "clusters": [],
+        }
+        if count:
+            writer = SnapshotWriter(
+                self.directory, embedding_provider.name, embedding_provider.dim, count
+            )
+            recent = await self._fill(writer, base, recent_since)
+            report["vectors"] = writer.count
+            report["recent_vectors"] = int(recent.sum())
+            if writer.count:
+                report["clusters"] = await self._cluster(
+                    writer, recent, clusters, sample_size
+                )
+            else:
+                writer.discard()
+        await self.session.rollback()
+        self._save_report(report)
+        return report
+
+    async def _fill(
+        self, writer: SnapshotWriter, base: Any, recent_since: datetime
+    ) -> np.ndarray:
+        """Stream the vectors into the snapshot files; flag recent ones."""
+        recent = np.zeros(writer.count, dtype=bool)
+        naive_since = recent_since.replace(tzinfo=None)
+        filled = 0
+        last_id = 0
+        while filled < writer.count:
+            query = (
+                base.add_columns(ComplaintEmbedding.vector, Complaint.timestamp)
+                .where(ComplaintEmbedding.complaint_id > last_id)
+                .order_by(ComplaintEmbedding.complaint_id)
+                .limit(min(_READ_BATCH, writer.count - filled))
+            )
+            rows = (await self.session.execute(query)).all()
+            if not rows:
+                break
+            for complaint_id, blob, timestamp in rows:
+                writer.ids[filled] = complaint_id
+                writer.vectors[filled] = from_blob(blob)
+                since = recent_since if timestamp.tzinfo else naive_since
+                recent[filled] = timestamp >= since
+                filled += 1
+            last_id = rows[-1][0]
+        # complaints deleted meanwhile (archived) shrink the snapshot
+        writer.count = filled
+        return recent[:filled]
+
+    async def _cluster(
+        self,
+        writer: SnapshotWriter,
+        recent: np.ndarray,
+        clusters: int,
+        sample_size: int,
+    ) -> List[Dict[str, Any]]:
+        count = writer.count
+        vectors = writer.vectors[:count]
+        rng = np.random.default_rng(1)
+        sample = np.sort(rng.choice(count, min(count, sample_size), replace=False))
+        centroids = spherical_kmeans(np.asarray(vectors[sample]), clusters)
+        labels, similarity = assign_clusters(vectors, centroids)
+        # sample IDs are read before commit() drops the staging files
+        ids = np.array(writer.ids[:count])
+
+        sizes = np.bincount(labels, minlength=len(centroids))
+        recent_sizes = np.bincount(labels[recent], minlength=len(centroids))
+        total_recent = int(recent.sum())
+        # members closest to each centroid represent the cluster
+        order = np.lexsort((-similarity, labels))
+        starts = np.searchsorted(labels[order], np.arange(len(centroids)))
+        samples: Dict[int, List[int]] = {}
+        for cluster, start in enumerate(starts):
+            end = start + min(int(sizes[cluster]), _SAMPLES_PER_CLUSTER)
+            samples[cluster] = [int(ids[i]) for i in order[start:end]]
+        writer.commit(centroids, labels)
+
+        query = select(Complaint.id, Complaint.text).where(
+            Complaint.id.in_([i for ids in samples.values() for i in ids])
+        )
+        texts: Dict[int, str] = {
+            row.id: row.text for row in (await self.session.execute(query)).all()
+        }
+
+        rows: List[Dict[str, Any]] = []
+        for cluster in range(len(centroids)):
+            size, recent_size = int(sizes[cluster]), int(recent_sizes[cluster])
+            if not size:
+                continue
+            lift = (
+                (recent_size / total_recent) / (size / count) if total_recent else 0.0
+            )
+            rows.append(
+                {
+                    "cluster": cluster,
+                    "size": size,
+                    "recent": recent_size,
+                    "lift": round(lift, 3),
+                    "emerging": recent_size >= settings.cluster_emerging_min_recent
+                    and lift >= settings.cluster_emerging_lift,
+                    "sample_ids": samples[cluster],
+                    "sample_texts": [
+                        texts.get(i, "")[:_SAMPLE_TEXT_LENGTH] for i in samples[cluster]
+                    ],
+                }
+            )
+        rows.sort(key=lambda row: (row["emerging"], row["lift"] * row["recent"]))
+        rows.reverse()
+        for row in rows:
+            if row["emerging"]:
+                logger.warning(
+                    "Emerging complaint cluster %d: %d recent (lift %.1f), e.g. %r",
+                    row["cluster"],
+                    row["recent"],
+                    row["lift"],
+                    row["sample_texts"][0][:80],
+                )
+        return rows
+
+    def _save_report(self, report: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / (REPORT_FILE + ".tmp")
+        tmp.write_text(json.dumps(report, ensure_ascii=False))
+        os.replace(tmp, self.directory / REPORT_FILE)
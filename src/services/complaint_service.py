@@ -3,8 +3,9 @@ src/services/complaint_service.py
 
 ComplaintService provides business logic for handling customer complaints.
 Includes orchestration of external APIs for sentiment analysis (APILayer),
-spam check (API Ninjas), and category classification (OpenAI).
-All error handling and fallback logic are managed here.
+spam check (API Ninjas), and category classification (OpenAI); the calls
+themselves, with their timeouts and fallbacks, are the stages of the
+enrichment registry (see src/services/enrichment.py).
 
 This service is designed for asynchronous use with FastAPI and SQLAlchemy.
 """
@@ -13,24 +14,51 @@ import logging
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..clients.geoip import get_geolocation
-from ..clients.openai_client import categorize_complaint
-from ..clients.sentiment import get_sentiment
-from ..clients.spam import check_spam
+from ..clients.geoip import GeoLocation
+from ..config import settings
+from ..core.load_shedding import load_shedder
+from ..core.serialization import COMPLAINT_WITH_TEXT_FIELDS, encode_rows
 from ..models.complaint import Complaint
+from ..models.complaint_embedding import ComplaintEmbedding
 from ..schemas.complaint import (
     ComplaintCreate,
     ComplaintResponse,
     ComplaintWithTextResponse,
 )
 from ..schemas.enums import CategoryEnum, SentimentEnum, StatusEnum
+from .archive_service import ArchiveService
+from .dedup import near_duplicates
+from .enrichment import EnrichmentContext, enrichment_stages
+from .priority import classify_priority, enrichment_scheduler
+from .similarity_service import SimilarityService
+from .stats_service import StatsService
+from .vector_index import complaint_vectors, from_blob
 
 logger = logging.getLogger(__name__)
 
+# Compare-and-swap attempts of an unconditional status update under contention
+_STATUS_UPDATE_ATTEMPTS = 3
+
+
+class ComplaintVersionConflict(Exception):
+    """
+    Raised when a complaint changed since the version the caller expected.
+
+    Attributes:
+        current_version (Optional[int]): Version now stored, if known.
+    """
+
+    def __init__(self, complaint_id: int, current_version: Optional[int]):
+        super().__init__(
+            f"Complaint {complaint_id} was modified concurrently "
+            f"(current version: {current_version})"
+        )
+        self.current_version = current_version
+
 
 class ComplaintService:
     """
@@ -38,10 +66,8 @@ class ComplaintService:
 
     Responsibilities:
         - Persist new complaint records in the database.
-        - Integrate with APILayer for sentiment analysis.
-        - Integrate with API Ninjas for spam checking.
-        - Classify complaint category using OpenAI (GPT-3.5 Turbo).
-        - Provide robust error handling and fallback behaviors.
+        - Run the enrichment stages: sentiment (APILayer), spam check
+          (API Ninjas), geolocation, category (OpenAI GPT-3.5 Turbo).
         - Retrieve and filter complaints.
         - Update complaint status.
     """
@@ -60,6 +86,7 @@ class ComplaintService:
         """
         self.session = session
         self.enable_spam_check = enable_spam_check
+        self.stats = StatsService(session)
 
     async def create_complaint(
         self, data: ComplaintCreate, client_ip: Optional[str] = None
@@ -75,41 +102,92 @@ class ComplaintService:
             ComplaintResponse: Response schema including all relevant fields.
         """
         logger.info("Creating new complaint: %s", data.text[:120])
-        # Step 1: Sentiment analysis via APILayer
-        try:
-            sentiment = await get_sentiment(data.text)
-            logger.debug("Sentiment analysis result: %s", sentiment)
-        except Exception as e:
-            sentiment = SentimentEnum.UNKNOWN
-            logger.error("Sentiment API failed: %s", e, exc_info=True)
-
-        # Step 2: Spam check using API Ninjas (result not stored)
-        if self.enable_spam_check:
-            try:
-                await check_spam(data.text)
-                logger.debug("Spam check passed for complaint")
-            except Exception as e:
-                logger.error("Spam check API failed: %s", e, exc_info=True)
+        # Step 0: Near-duplicate lookup; a match reuses the original's
+        # sentiment and category instead of calling the external APIs again
+        signature = None
+        original: Optional[Complaint] = None
+        if settings.dedup_enabled:
+            signature = near_duplicates.signature(data.text)
+            match = near_duplicates.query(signature)
+            if match:
+                original = await self.session.get(Complaint, match[0])
+            if original is not None:
+                logger.info(
+                    "Complaint is a near-duplicate of id=%s (similarity=%.2f)",
+                    original.id,
+                    match[1],  # type: ignore[index]
+                )
 
-        # Step 2.5: Geolocation lookup by IP (no persistence)
-        if client_ip:
-            try:
-                await get_geolocation(client_ip)
-                logger.debug("GeoIP lookup done for %s", client_ip)
-            except Exception as e:
-                logger.error(
-                    "GeoIP lookup failed for %s: %s", client_ip, e, exc_info=True
+        # Steps 1-2.5: sentiment, spam check and geolocation (stages of the
+        # enrichment registry, run concurrently). A near-duplicate reuses
+        # the original's results, which skips those stages. Under overload
+        # (degraded mode) the expensive stages are shed or run locally and
+        # the complaint is marked for a later backfill.
+        context = EnrichmentContext(data.text, client_ip)
+        if original is not None:
+            context.results.update(
+                spam=(bool(original.is_spam), original.spam_score),
+                category=original.category,
+            )
+            # UNKNOWN is the fallback of a failed sentiment call, not a
+            # result: ask the API again
+            if original.sentiment != SentimentEnum.UNKNOWN:
+                context.results["sentiment"] = original.sentiment
+            embedding = await self.session.get(ComplaintEmbedding, original.id)
+            if embedding is not None and embedding.model == complaint_vectors.model:
+                context.results["embedding"] = from_blob(
+                    embedding.vector  # type: ignore[arg-type]
                 )
+        else:
+            context.degraded = load_shedder.degraded
+            if not self.enable_spam_check:
+                context.results["spam"] = (False, None)
+        # Remote calls wait for a scheduler slot: urgent complaints go first
+        # while enrichment is backlogged
+        priority = classify_priority(data.text, client_ip)
+        logger.debug("Enrichment priority: %s", priority.name)
+        async with enrichment_scheduler.slot(priority):
+            await enrichment_stages.run(context)
+        if context.degraded:
+            # the local category is cheap: store it with the complaint
+            await enrichment_stages.run(context, deferred=True)
+        sentiment: SentimentEnum = context.results["sentiment"]
+        is_spam, spam_score = context.results["spam"]
+        location: GeoLocation = context.results["geo"] or GeoLocation(
+            None, None, None, None, None
+        )
 
-        # Step 3: Persist the complaint with initial fields (category OTHER)
+        # Step 3: Persist the complaint with initial fields (category OTHER,
+        # or the original's category for a near-duplicate)
+        initial_category = context.results.get("category", CategoryEnum.OTHER)
         complaint = Complaint(
             text=data.text,
             status=StatusEnum.OPEN,
             sentiment=sentiment,
-            category=CategoryEnum.OTHER,
+            category=initial_category,
+            duplicate_of_id=(
+                (original.duplicate_of_id or original.id)
+                if original is not None
+                else None
+            ),
+            is_spam=is_spam,
+            spam_score=spam_score,
+            enrichment_deferred=context.degraded,
+            **location._asdict(),
         )
         self.session.add(complaint)
         try:
+            # flush first: the INSERT returns the server-side timestamp,
+            # which selects the stats bucket updated in the same transaction
+            await self.session.flush()
+            await self.stats.record(
+                complaint.timestamp,  # type: ignore[arg-type]
+                initial_category,  # type: ignore[arg-type]
+                sentiment,  # type: ignore[arg-type]
+                StatusEnum.OPEN,
+                location.country_code,
+                location.region,
+            )
             await self.session.commit()
             await self.session.refresh(complaint)
             logger.info("Complaint created in DB with id=%s", complaint.id)
@@ -118,35 +196,67 @@ class ComplaintService:
             logger.critical("DB error during complaint creation: %s", e, exc_info=True)
             raise
 
-        # Step 4: Classify the complaint category using OpenAI
-        try:
-            category = await categorize_complaint(data.text)
-            logger.debug("Complaint categorized: %s", category)
-        except Exception as e:
-            category = CategoryEnum.OTHER
-            logger.error("OpenAI API failed for categorization: %s", e, exc_info=True)
-
-        # Step 5: Update the complaint with the classified category
-        complaint.category = category  # type: ignore
-        try:
-            await self.session.commit()
-            await self.session.refresh(complaint)
-            logger.info(
-                "Complaint category updated for id=%s: %s", complaint.id, category
-            )
-        except SQLAlchemyError as e:
-            await self.session.rollback()
-            logger.critical("DB error during category update: %s", e, exc_info=True)
-            raise
+        category_pending = "category" not in context.results
+        if enrichment_stages.has_pending(context, deferred=True):
+            # Step 4: Classify the complaint category (OpenAI) and embed the
+            # text (deferred stages)
+            async with enrichment_scheduler.slot(priority):
+                await enrichment_stages.run(context, deferred=True)
+        category: CategoryEnum = context.results["category"]
+        embedding = context.results.get("embedding")
+
+        if category_pending or embedding is not None:
+            # Step 5: Update the complaint with the classified category (the
+            # status may have been changed meanwhile, e.g. closed by n8n) and
+            # store its embedding
+            try:
+                if category_pending:
+                    result = await self.session.execute(
+                        update(Complaint)
+                        .where(Complaint.id == complaint.id)
+                        .values(category=category, version=Complaint.version + 1)
+                        .returning(Complaint.status)
+                        .execution_options(synchronize_session=False)
+                    )
+                    current_status = result.scalar_one()
+                    await self.stats.move(
+                        complaint.timestamp,  # type: ignore[arg-type]
+                        (CategoryEnum.OTHER, sentiment, current_status),
+                        (category, sentiment, current_status),
+                        location.country_code,
+                        location.region,
+                    )
+                if embedding is not None:
+                    SimilarityService(self.session).store(
+                        complaint.id, embedding  # type: ignore[arg-type]
+                    )
+                await self.session.commit()
+                await self.session.refresh(complaint)
+                if category_pending:
+                    logger.info(
+                        "Complaint category updated for id=%s: %s",
+                        complaint.id,
+                        category,
+                    )
+            except SQLAlchemyError as e:
+                await self.session.rollback()
+                logger.critical("DB error during category update: %s", e, exc_info=True)
+                raise
+            if embedding is not None:
+                complaint_vectors.add(complaint.id, embedding)  # type: ignore[arg-type]
+
+        if signature is not None:
+            near_duplicates.add(complaint.id, signature)  # type: ignore[arg-type]
 
         # Step 6: Return the response schema
-        return ComplaintResponse.from_orm(complaint)
+        return ComplaintResponse.model_validate(complaint)
 
     async def get_complaint_by_id(
         self, complaint_id: int
     ) -> Optional[ComplaintResponse]:
         """
-        Retrieve a complaint by its unique identifier.
+        Retrieve a complaint by its unique identifier, falling back to the
+        cold storage archive for archived complaints.
 
         Args:
             complaint_id (int): The unique ID of the complaint.
@@ -157,61 +267,191 @@ class ComplaintService:
         logger.debug("Retrieving complaint by id=%s", complaint_id)
         complaint = await self.session.get(Complaint, complaint_id)
         if not complaint:
-            logger.warning("Complaint not found: id=%s", complaint_id)
-            return None
+            archived = await ArchiveService(self.session).get(complaint_id)
+            if archived is None:
+                logger.warning("Complaint not found: id=%s", complaint_id)
+                return None
+            logger.info("Complaint retrieved from archive: id=%s", complaint_id)
+            return ComplaintResponse.model_validate(archived)
         logger.info("Complaint retrieved: id=%s", complaint_id)
-        return ComplaintResponse.from_orm(complaint)
+        return ComplaintResponse.model_validate(complaint)
+
+    @staticmethod
+    def _list_query(
+        status: Optional[StatusEnum] = None,
+        since: Optional[datetime] = None,
+        include_spam: bool = False,
+        country_code: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> Select:
+        """
+        Build the filtered list query, selecting only the columns exposed by
+        ComplaintWithTextResponse (no ORM entity hydration).
+        """
+        query = select(
+            *(getattr(Complaint, field) for field in COMPLAINT_WITH_TEXT_FIELDS)
+        )
+        if not include_spam:
+            # leading column of ix_complaints_is_spam_status_timestamp; an
+            # equality, since PostgreSQL cannot use a btree index for IS false
+            query = query.where(Complaint.is_spam == False)  # noqa: E712
+        if status:
+            query = query.where(Complaint.status == status)
+        if since:
+            query = query.where(Complaint.timestamp >= since)
+        if country_code:
+            # leading column of ix_complaints_country_region_timestamp
+            query = query.where(Complaint.country_code == country_code.upper())
+        if region:
+            query = query.where(Complaint.region == region)
+        return query
 
     async def get_complaints(
-        self, status: Optional[StatusEnum] = None, since: Optional[datetime] = None
+        self,
+        status: Optional[StatusEnum] = None,
+        since: Optional[datetime] = None,
+        include_spam: bool = False,
+        country_code: Optional[str] = None,
+        region: Optional[str] = None,
     ) -> List[ComplaintWithTextResponse]:
         """
-        Retrieve complaints with optional filtering by status and timestamp.
+        Retrieve complaints with optional filtering by status, timestamp and
+        client location.
 
         Args:
             status (Optional[StatusEnum]): Status to filter by.
             since (Optional[datetime]): Only complaints created after this timestamp.
+            include_spam (bool): Also return complaints classified as spam.
+            country_code (Optional[str]): ISO country code to filter by.
+            region (Optional[str]): Region name to filter by.
 
         Returns:
             List[ComplaintWithTextResponse]: List of complaints.
         """
         logger.debug("Querying complaints (status=%s, since=%s)", status, since)
-        query = select(Complaint)
-        if status:
-            query = query.where(Complaint.status == status)
-        if since:
-            query = query.where(Complaint.timestamp >= since)
-        results = (await self.session.execute(query)).scalars().all()
-        logger.info("Complaints queried, count=%d", len(results))
-        return [ComplaintWithTextResponse.from_orm(c) for c in results]
+        query = self._list_query(status, since, include_spam, country_code, region)
+        rows = (await self.session.execute(query)).all()
+        logger.info("Complaints queried, count=%d", len(rows))
+        return [
+            ComplaintWithTextResponse.model_validate(
+                dict(zip(COMPLAINT_WITH_TEXT_FIELDS, row))
+            )
+            for row in rows
+        ]
+
+    async def get_complaints_json(
+        self,
+        status: Optional[StatusEnum] = None,
+        since: Optional[datetime] = None,
+        include_spam: bool = False,
+        country_code: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> bytes:
+        """
+        Same as get_complaints, but encodes rows directly to JSON bytes.
+
+        Used by the list endpoint: the rows go from the DB cursor to orjson
+        without building ORM objects or Pydantic models.
+
+        Returns:
+            bytes: JSON array of ComplaintWithTextResponse objects.
+        """
+        logger.debug("Querying complaints (status=%s, since=%s)", status, since)
+        query = self._list_query(status, since, include_spam, country_code, region)
+        rows = (await self.session.execute(query)).all()
+        logger.info("Complaints queried, count=%d", len(rows))
+        return encode_rows(rows, COMPLAINT_WITH_TEXT_FIELDS)
 
     async def update_complaint_status(
-        self, complaint_id: int, status: StatusEnum
+        self,
+        complaint_id: int,
+        status: StatusEnum,
+        expected_version: Optional[int] = None,
     ) -> Optional[ComplaintResponse]:
         """
         Update the status of a complaint by its ID.
 
+        Optimistic concurrency: the row is read without a lock and written
+        with `UPDATE ... WHERE id = :id AND version = :read_version`, so a
+        concurrent change makes the update match no row instead of being
+        overwritten. With `expected_version` (the PATCH If-Match header) a
+        mismatch fails immediately; without it the compare-and-swap is
+        retried a few times.
+
         Args:
             complaint_id (int): Complaint ID.
             status (StatusEnum): New status to set.
+            expected_version (Optional[int]): Version the caller last saw.
 
         Returns:
             Optional[ComplaintResponse]: The updated complaint if found, else None.
+
+        Raises:
+            ComplaintVersionConflict: The complaint is not at the expected
+                version, or kept changing during every attempt.
         """
         logger.debug("Updating status for complaint id=%s to %s", complaint_id, status)
-        complaint = await self.session.get(Complaint, complaint_id)
-        if not complaint:
-            logger.warning("Complaint for update not found: id=%s", complaint_id)
-            return None
-        complaint.status = status  # type: ignore
-        try:
-            await self.session.commit()
-            await self.session.refresh(complaint)
-            logger.info("Complaint id=%s status updated to %s", complaint.id, status)
-        except SQLAlchemyError as e:
-            await self.session.rollback()
-            logger.critical(
-                "DB error on status update id=%s: %s", complaint_id, e, exc_info=True
+        query = select(
+            Complaint.id,
+            Complaint.status,
+            Complaint.sentiment,
+            Complaint.category,
+            Complaint.version,
+            Complaint.timestamp,
+            Complaint.country_code,
+            Complaint.region,
+        ).where(Complaint.id == complaint_id)
+        current_version: Optional[int] = None
+        for _ in range(_STATUS_UPDATE_ATTEMPTS):
+            row = (await self.session.execute(query)).one_or_none()
+            if row is None:
+                logger.warning("Complaint for update not found: id=%s", complaint_id)
+                return None
+            current_version = row.version
+            if expected_version is not None and row.version != expected_version:
+                raise ComplaintVersionConflict(complaint_id, row.version)
+            if row.status == status:
+                # nothing to change: no write, no version bump
+                return ComplaintResponse.model_validate(row._asdict())
+
+            try:
+                result = await self.session.execute(
+                    update(Complaint)
+                    .where(Complaint.id == complaint_id)
+                    .where(Complaint.version == row.version)
+                    .values(status=status, version=row.version + 1)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:  # type: ignore[attr-defined]
+                    # changed since it was read: re-read and decide again
+                    await self.session.rollback()
+                    logger.info(
+                        "Concurrent update of complaint id=%s (version %s)",
+                        complaint_id,
+                        row.version,
+                    )
+                    continue
+                await self.stats.move(
+                    row.timestamp,
+                    (row.category, row.sentiment, row.status),
+                    (row.category, row.sentiment, status),
+                    row.country_code,
+                    row.region,
+                )
+                await self.session.commit()
+                logger.info(
+                    "Complaint id=%s status updated to %s", complaint_id, status
+                )
+            except SQLAlchemyError as e:
+                await self.session.rollback()
+                logger.critical(
+                    "DB error on status update id=%s: %s",
+                    complaint_id,
+                    e,
+                    exc_info=True,
+                )
+                raise
+            return ComplaintResponse.model_validate(
+                {**row._asdict(), "status": status, "version": row.version + 1}
             )
-            raise
-        return ComplaintResponse.from_orm(complaint)
+        raise ComplaintVersionConflict(complaint_id, current_version)
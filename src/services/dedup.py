@@ -0,0 +1,230 @@
+"""
+src/services/dedup.py
+
+Near-duplicate detection for complaint texts with MinHash signatures and a
+locality-sensitive hashing (LSH) index.
+
+Texts are normalized and split into overlapping character shingles; the
+MinHash signature estimates Jaccard similarity between shingle sets, and LSH
+banding finds candidate matches without comparing against every stored text.
+Shingling and hashing are vectorized with numpy, and only the first
+DEDUP_MAX_CHARS characters of a text are hashed, so the cost per submission
+is small and bounded however long the text is. The index is held in memory
+per worker, bounded to the most recent complaints, and rebuilt from the
+database in the background after startup.
+"""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.complaint import Complaint
+
+logger = logging.getLogger(__name__)
+
+# Permutations are (a * h + b) mod p over 32-bit shingle hashes; with a and
+# b below 2**32 the product never overflows 64 bits
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_HASH_MASK = np.uint64(0xFFFFFFFF)
+# Odd multiplier of the polynomial shingle hash (wraps modulo 2**64)
+_SHINGLE_BASE = np.uint64(0x100000001B3)
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+# Texts read per query when rebuilding the index
+_REBUILD_BATCH = 1000
+
+Signature = np.ndarray
+
+
+def shingles(text: str, size: int = 5, max_chars: Optional[int] = None) -> np.ndarray:
+    """
+    Hash the overlapping character shingles of a normalized text.
+
+    Lowercases and collapses punctuation/whitespace first, so trivial edits
+    (case, spacing, punctuation) do not change the shingle set. Only the
+    first `max_chars` characters of the text are shingled.
+
+    Returns:
+        np.ndarray: Distinct 32-bit shingle hashes (uint64).
+    """
+    normalized = _NON_WORD_RE.sub(" ", text[:max_chars].lower()).strip()
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32)
+    codes = codes.astype(np.uint64)
+    if len(codes) < size:
+        codes = np.pad(codes, (0, size - len(codes)))
+    powers = _SHINGLE_BASE ** np.arange(size, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        hashes = sliding_window_view(codes, size) @ powers
+    return np.unique((hashes ^ (hashes >> np.uint64(32))) & _HASH_MASK)
+
+
+class MinHashLSHIndex:
+    """
+    Bounded in-memory MinHash LSH index of recent complaint texts.
+
+    Attributes:
+        num_perm (int): Signature length (number of hash permutations).
+        bands (int): Number of LSH bands; num_perm must be divisible by it.
+        capacity (int): Maximum number of indexed texts (oldest evicted first).
+        threshold (float): Minimum estimated Jaccard similarity for a match.
+        max_chars (int): Characters of a text that are hashed.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        capacity: int = 20000,
+        threshold: float = 0.8,
+        max_chars: int = 2000,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        self.threshold = threshold
+        self.max_chars = max_chars
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._signatures: "OrderedDict[int, Signature]" = OrderedDict()
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> Signature:
+        """Compute the MinHash signature of a text."""
+        hashes = shingles(text, max_chars=self.max_chars)
+        permuted = (self._a * hashes + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: Signature) -> List[int]:
+        return [hash(band.tobytes()) for band in signature.reshape(self.bands, -1)]
+
+    @staticmethod
+    def similarity(left: Signature, right: Signature) -> float:
+        """Estimate Jaccard similarity as the share of equal signature slots."""
+        return int(np.count_nonzero(left == right)) / len(left)
+
+    def add(self, complaint_id: int, signature: Signature) -> None:
+        """Index a complaint, evicting the oldest entry when full."""
+        if complaint_id in self._signatures:
+            return
+        self._signatures[complaint_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(complaint_id)
+        while len(self._signatures) > self.capacity:
+            self.remove(next(iter(self._signatures)))
+
+    def remove(self, complaint_id: int) -> None:
+        """Drop a complaint from the index (no-op if absent)."""
+        signature = self._signatures.pop(complaint_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            members = self._buckets[band].get(key)
+            if members is not None:
+                members.discard(complaint_id)
+                if not members:
+                    del self._buckets[band][key]
+
+    def query(self, signature: Signature) -> Optional[Tuple[int, float]]:
+        """
+        Find the most similar indexed complaint.
+
+        Returns:
+            Optional[Tuple[int, float]]: (complaint_id, estimated similarity)
+            of the best candidate at or above the threshold, else None.
+        """
+        candidates: Set[int] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        best: Optional[Tuple[int, float]] = None
+        for candidate in candidates:
+            score = self.similarity(signature, self._signatures[candidate])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._signatures.clear()
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def replace_with(self, rebuilt: "MinHashLSHIndex") -> None:
+        """
+        Take over the entries of a rebuilt index.
+
+        Entries added to this index meanwhile are newer than any rebuilt
+        one, so they are kept, as the most recent.
+        """
+        for complaint_id, signature in self._signatures.items():
+            rebuilt.add(complaint_id, signature)
+        self._signatures = rebuilt._signatures
+        self._buckets = rebuilt._buckets
+
+
+# Shared per-process index; import `near_duplicates` wherever needed
+near_duplicates = MinHashLSHIndex(
+    num_perm=settings.dedup_num_perm,
+    bands=settings.dedup_bands,
+    capacity=settings.dedup_capacity,
+    threshold=settings.dedup_threshold,
+    max_chars=settings.dedup_max_chars,
+)
+
+
+def _signatures(
+    index: MinHashLSHIndex, rows: Sequence[Any]
+) -> List[Tuple[int, Signature]]:
+    return [(complaint_id, index.signature(text)) for complaint_id, text in rows]
+
+
+async def rebuild_index(session: AsyncSession) -> int:
+    """
+    Reload the index with the most recent complaints (up to its capacity).
+
+    Texts are read in batches and hashed in a worker thread; the live index
+    keeps serving until the rebuilt one replaces it.
+
+    Args:
+        session (AsyncSession): Async SQLAlchemy session.
+
+    Returns:
+        int: Number of indexed complaints.
+    """
+    rebuilt = MinHashLSHIndex(
+        num_perm=near_duplicates.num_perm,
+        bands=near_duplicates.bands,
+        capacity=near_duplicates.capacity,
+        threshold=near_duplicates.threshold,
+        max_chars=near_duplicates.max_chars,
+    )
+    query = (
+        select(Complaint.id, Complaint.text)
+        .order_by(Complaint.id.desc())
+        .limit(near_duplicates.capacity)
+    )
+    result = await session.stream(query.execution_options(yield_per=_REBUILD_BATCH))
+    batches: List[List[Tuple[int, Signature]]] = []
+    async for rows in result.partitions():
+        batches.append(await asyncio.to_thread(_signatures, rebuilt, rows))
+    # insert oldest first so eviction order matches arrival order
+    for batch in reversed(batches):
+        for complaint_id, signature in reversed(batch):
+            rebuilt.add(complaint_id, signature)
+    near_duplicates.replace_with(rebuilt)
+    logger.info("Near-duplicate index rebuilt with %d complaints", len(rebuilt))
+    return len(rebuilt)
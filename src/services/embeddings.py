@@ -0,0 +1,162 @@
+"""
+src/services/embeddings.py
+
+Embedding providers turning complaint texts into unit-length float32
+vectors, whose dot product is their cosine similarity.
+
+Two providers are available, selected by EMBEDDING_PROVIDER:
+
+    - hashing: local hashing vectorizer over words and character trigrams.
+      No network, no cost, deterministic; good enough for grouping
+      complaints that share wording, and for offline development and tests.
+    - openai: the OpenAI embeddings API through the shared client (and its
+      hedger); captures meaning beyond shared words.
+
+Vectors of different providers (or dimensions) are not comparable, so each
+provider has a `name` stored alongside every vector.
+"""
+
+import logging
+import re
+import zlib
+from typing import Any, Awaitable, Sequence
+
+import numpy as np
+
+from ..clients.hedging import hedger_for
+from ..clients.openai_client import get_client
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale every row to unit length (all-zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+
+class EmbeddingProvider:
+    """
+    Base class of embedding providers.
+
+    Attributes:
+        name (str): Identifies the vector space (provider, model, dimension).
+        dim (int): Vector dimension.
+        remote (bool): Whether embedding calls an upstream API.
+    """
+
+    name = "none"
+    dim = 0
+    remote = False
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Complaint texts.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim), one unit
+            vector per text.
+        """
+        raise NotImplementedError
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Local hashing vectorizer.
+
+    Words and the character trigrams of every word are hashed into `dim`
+    signed buckets (the sign halves the damage of hash collisions); counts
+    are log-damped so repeated words do not dominate. Trigrams let
+    inflected forms ("charged", "charge", "списали", "списание") overlap.
+    """
+
+    remote = False
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing:{dim}"
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Embed one text (synchronously)."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in _NON_WORD_RE.sub(" ", text.lower()).split():
+            padded = f" {word} "
+            features = [word] + [
+                padded[i : i + 3] for i in range(len(padded) - 2)  # noqa: E203
+            ]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vector[h % self.dim] += -1.0 if h >> 31 else 1.0
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        return normalize_rows(vector[np.newaxis])[0]
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self.embed_one(text) for text in texts])
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    OpenAI embeddings API (text-embedding-3 models accept a dimension).
+    """
+
+    remote = True
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 256):
+        self.model = model
+        self.dim = dim
+        self.name = f"openai:{model}:{dim}"
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        def attempt() -> Awaitable[Any]:
+            return get_client().embeddings.create(
+                model=self.model, input=list(texts), dimensions=self.dim
+            )
+
+        if len(texts) == 1:
+            # the same input always yields the same vector, so it may be
+            # hedged; on its own hedger, as embeddings are much faster than
+            # the chat completions of categorization
+            response = await hedger_for("openai-embeddings").call(attempt)
+        else:
+            # batches (the clustering job) are slower and too costly to
+            # send twice: not hedged, and kept out of the latency samples
+            response = await attempt()
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return normalize_rows(
+            np.array([item.embedding for item in ordered], dtype=np.float32)
+        )
+
+
+def create_embedding_provider(
+    provider: str = "hashing",
+    model: str = "text-embedding-3-small",
+    dim: int = 256,
+) -> EmbeddingProvider:
+    """
+    Create the provider named by EMBEDDING_PROVIDER.
+
+    Raises:
+        ValueError: Unknown provider name.
+    """
+    if provider == "hashing":
+        return HashingEmbeddingProvider(dim)
+    if provider == "openai":
+        return OpenAIEmbeddingProvider(model, dim)
+    raise ValueError(f"Unknown embedding provider: {provider!r}")
+
+
+# Shared per-process provider; import `embedding_provider` wherever needed
+embedding_provider = create_embedding_provider(
+    settings.embedding_provider, settings.embedding_model, settings.embedding_dim
+)
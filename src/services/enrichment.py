@@ -0,0 +1,471 @@
+"""
+src/services/enrichment.py
+
+Registry of the enrichment stages run for every new complaint.
+
+A stage computes one result (sentiment, spam verdict, location, category,
+embedding) from the complaint text and client IP. Each stage declares:
+
+    - depends_on: stages whose results it reads (it runs after them)
+    - timeout: seconds before it is abandoned for its fallback
+    - fallback: result used when it is disabled, fails or times out
+    - deferred: runs after the complaint is stored (the category and the
+      embedding, so the complaint is saved before the slow OpenAI calls)
+    - cost_per_call: estimated price of one upstream API call
+    - sheddable / degraded_run: what the stage does in degraded mode (see
+      src/core/load_shedding.py): a sheddable stage is skipped for its
+      fallback, a stage with a degraded_run uses that cheap local version
+
+Stages whose dependencies are met run concurrently. Stages are toggled by
+ENRICHMENT_DISABLED_STAGES at startup or through the admin API at runtime
+(per worker process), so expensive stages can be shed without a redeploy.
+Per-stage latency, outcome and API-call cost counters feed the admin
+metrics.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ..clients.geoip import get_geolocation, parse_geolocation
+from ..clients.hedging import count_hedges
+from ..clients.openai_client import categorize_complaint
+from ..clients.sentiment import get_sentiment
+from ..clients.spam import check_spam
+from ..config import settings
+from ..schemas.enums import CategoryEnum, SentimentEnum
+from .embeddings import embedding_provider
+from .spam_filter import spam_filter
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_SAMPLES = 500
+
+
+@dataclass
+class EnrichmentContext:
+    """
+    Inputs and results of one complaint's enrichment.
+
+    Attributes:
+        text: Complaint text.
+        client_ip: Submitting client, if known.
+        results: Result per stage name; values set before a run (e.g. copied
+            from a near-duplicate) skip that stage.
+        api_calls: Upstream API requests made, per stage name (hedges
+            included).
+        degraded: Enrich in degraded (load shedding) mode.
+    """
+
+    text: str
+    client_ip: Optional[str] = None
+    results: Dict[str, Any] = field(default_factory=dict)
+    api_calls: "Counter[str]" = field(default_factory=Counter)
+    degraded: bool = False
+
+
+StageFunc = Callable[[EnrichmentContext], Awaitable[Any]]
+
+
+@dataclass
+class EnrichmentStage:
+    """
+    One pluggable enrichment step.
+
+    Attributes:
+        name: Unique stage name (also the key of its result).
+        run: Coroutine function computing the result from the context.
+        fallback: Result when the stage is disabled, fails or times out.
+        timeout: Seconds before the stage is abandoned.
+        depends_on: Stages that must finish first.
+        deferred: Run after the complaint is stored.
+        cost_per_call: Estimated cost of one upstream API call.
+        enabled: Whether the stage runs.
+        sheddable: Skipped for the fallback in degraded mode.
+        degraded_run: Local replacement of `run` in degraded mode.
+    """
+
+    name: str
+    run: StageFunc
+    fallback: Any
+    timeout: float
+    depends_on: Tuple[str, ...] = ()
+    deferred: bool = False
+    cost_per_call: float = 0.0
+    enabled: bool = True
+    sheddable: bool = False
+    degraded_run: Optional[StageFunc] = None
+
+
+class StageMetrics:
+    """
+    Counters of one stage since startup.
+
+    Attributes:
+        runs: Completed runs (including failures and timeouts).
+        failures: Runs that raised and used the fallback.
+        timeouts: Runs abandoned after the timeout.
+        skipped: Complaints for which the stage was disabled.
+        shed: Complaints enriched in degraded mode (stage skipped or run
+            locally).
+        api_calls: Upstream API requests made, hedges included.
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.shed = 0
+        self.api_calls = 0
+        self.latencies: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+
+class EnrichmentRegistry:
+    """
+    Ordered set of enrichment stages with their metrics.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, EnrichmentStage] = {}
+        self._metrics: Dict[str, StageMetrics] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def __getitem__(self, name: str) -> EnrichmentStage:
+        return self._stages[name]
+
+    @property
+    def stages(self) -> List[EnrichmentStage]:
+        """Registered stages in registration order."""
+        return list(self._stages.values())
+
+    def register(self, stage: EnrichmentStage) -> EnrichmentStage:
+        """
+        Add a stage; its dependencies must already be registered.
+
+        Raises:
+            ValueError: Duplicate name, unknown dependency, or a stage that
+                runs before the insert depending on a deferred one.
+        """
+        if stage.name in self._stages:
+            raise ValueError(f"Enrichment stage {stage.name!r} already registered")
+        for dependency in stage.depends_on:
+            if dependency not in self._stages:
+                raise ValueError(
+                    f"Stage {stage.name!r} depends on unknown stage {dependency!r}"
+                )
+            if self._stages[dependency].deferred and not stage.deferred:
+                raise ValueError(
+                    f"Stage {stage.name!r} cannot depend on deferred {dependency!r}"
+                )
+        self._stages[stage.name] = stage
+        self._metrics[stage.name] = StageMetrics()
+        return stage
+
+    def set_enabled(self, name: str, enabled: bool) -> EnrichmentStage:
+        """Enable or disable a stage at runtime (KeyError if unknown)."""
+        stage = self._stages[name]
+        stage.enabled = enabled
+        logger.warning(
+            "Enrichment stage %r %s", name, "enabled" if enabled else "disabled"
+        )
+        return stage
+
+    def has_pending(self, context: EnrichmentContext, deferred: bool = False) -> bool:
+        """Whether a stage of the phase has no result yet."""
+        return any(
+            stage.deferred == deferred and stage.name not in context.results
+            for stage in self._stages.values()
+        )
+
+    async def run(self, context: EnrichmentContext, deferred: bool = False) -> None:
+        """
+        Run the stages of one phase, filling `context.results`.
+
+        Stages run as soon as their dependencies have results; a stage that
+        already has a result is skipped. Failures never propagate: the
+        stage's fallback is used instead.
+
+        Args:
+            context (EnrichmentContext): Complaint being enriched.
+            deferred (bool): Run the deferred (after insert) phase.
+        """
+        pending = [
+            stage
+            for stage in self._stages.values()
+            if stage.deferred == deferred and stage.name not in context.results
+        ]
+        while pending:
+            ready = [
+                stage
+                for stage in pending
+                if all(name in context.results for name in stage.depends_on)
+            ]
+            # a dependency of another phase that never ran: run anyway, the
+            # stage falls back if it needs the missing result
+            ready = ready or pending
+            pending = [stage for stage in pending if stage not in ready]
+            await asyncio.gather(*(self._run_stage(stage, context) for stage in ready))
+
+    async def _run_stage(
+        self, stage: EnrichmentStage, context: EnrichmentContext
+    ) -> None:
+        metrics = self._metrics[stage.name]
+        if not stage.enabled:
+            metrics.skipped += 1
+            context.results[stage.name] = stage.fallback
+            return
+        run = stage.run
+        if context.degraded and (stage.sheddable or stage.degraded_run):
+            metrics.shed += 1
+            if stage.degraded_run is None:
+                context.results[stage.name] = stage.fallback
+                return
+            run = stage.degraded_run
+        started = time.monotonic()
+        # stages count their logical calls; a hedged call sent one more
+        with count_hedges() as hedges:
+            try:
+                result = await asyncio.wait_for(run(context), stage.timeout)
+            except asyncio.TimeoutError:
+                metrics.timeouts += 1
+                logger.error("Enrichment stage %r timed out", stage.name)
+                result = stage.fallback
+            except Exception as e:
+                metrics.failures += 1
+                logger.error(
+                    "Enrichment stage %r failed: %s", stage.name, e, exc_info=True
+                )
+                result = stage.fallback
+        context.api_calls[stage.name] += hedges.started
+        metrics.runs += 1
+        metrics.latencies.append(time.monotonic() - started)
+        metrics.api_calls += context.api_calls[stage.name]
+        context.results[stage.name] = result
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Configuration and counters of every stage (latencies in ms)."""
+        rows = []
+        for stage in self._stages.values():
+            metrics = self._metrics[stage.name]
+            latencies = sorted(metrics.latencies)
+            rows.append(
+                {
+                    "name": stage.name,
+                    "enabled": stage.enabled,
+                    "deferred": stage.deferred,
+                    "sheddable": stage.sheddable or stage.degraded_run is not None,
+                    "depends_on": list(stage.depends_on),
+                    "timeout_seconds": stage.timeout,
+                    "runs": metrics.runs,
+                    "failures": metrics.failures,
+                    "timeouts": metrics.timeouts,
+                    "skipped": metrics.skipped,
+                    "shed": metrics.shed,
+                    "api_calls": metrics.api_calls,
+                    "cost": metrics.api_calls * stage.cost_per_call,
+                    "latency_ms_avg": (
+                        sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+                    ),
+                    "latency_ms_p95": (
+                        latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                        * 1000
+                        if latencies
+                        else 0.0
+                    ),
+                }
+            )
+        return rows
+
+
+# Built-in stages
+
+
+async def sentiment_stage(context: EnrichmentContext) -> SentimentEnum:
+    """Sentiment of the text via APILayer."""
+    context.api_calls["sentiment"] += 1
+    return await get_sentiment(context.text)
+
+
+def prefilter_spam(context: EnrichmentContext) -> Tuple[Optional[bool], float]:
+    """Local pre-filter verdict (None: ask the remote API) and score."""
+    text = context.text
+    verdict = spam_filter.evaluate(text, context.client_ip)
+    if verdict.is_spam is not None:
+        logger.debug(
+            "Spam pre-filter decided is_spam=%s (score=%.2f: %s)",
+            verdict.is_spam,
+            verdict.score,
+            verdict.reason,
+        )
+        if verdict.is_spam:
+            spam_filter.remember(text)
+    return verdict.is_spam, verdict.score
+
+
+async def spam_stage(context: EnrichmentContext) -> Tuple[bool, Optional[float]]:
+    """
+    Spam verdict (is_spam, score from 0 to 1): the local pre-filter decides
+    clear spam, the other texts go to the remote API.
+    """
+    is_spam, local_score = prefilter_spam(context)
+    if is_spam is not None:
+        return is_spam, local_score
+    return await remote_spam_check(context, local_score)
+
+
+async def remote_spam_check(
+    context: EnrichmentContext, local_score: float
+) -> Tuple[bool, Optional[float]]:
+    """Spam verdict of the remote API; not spam if the call fails."""
+    text = context.text
+    context.api_calls["spam"] += 1
+    try:
+        result = await check_spam(text)
+    except Exception as e:
+        logger.error("Spam check API failed: %s", e, exc_info=True)
+        return False, local_score
+    if result.is_spam:
+        spam_filter.remember(text)
+    score = result.score if result.score is not None else local_score
+    return result.is_spam, score
+
+
+async def local_spam_stage(
+    context: EnrichmentContext,
+) -> Tuple[bool, Optional[float]]:
+    """Degraded spam verdict: the local pre-filter only, ambiguous is ham."""
+    is_spam, score = prefilter_spam(context)
+    return bool(is_spam), score
+
+
+async def geo_stage(context: EnrichmentContext) -> Optional[Any]:
+    """Location of the client IP (a GeoLocation, or None)."""
+    if not context.client_ip:
+        return None
+    context.api_calls["geo"] += 1
+    return parse_geolocation(await get_geolocation(context.client_ip))
+
+
+async def category_stage(context: EnrichmentContext) -> CategoryEnum:
+    """Category via OpenAI; spam is not worth a classification call."""
+    is_spam, _ = context.results.get("spam", (False, None))
+    if is_spam:
+        return CategoryEnum.OTHER
+    context.api_calls["category"] += 1
+    return await categorize_complaint(context.text)
+
+
+# Keywords of the degraded, local categorization (English / Russian)
+_PAYMENT_KEYWORDS = re.compile(
+    r"\b(?:pay|paid|payment|charge[ds]?|refund|billing|invoice|card|bank"
+    r"|subscription|price|оплат|плат[её]ж|деньг|списа|возврат|карт|счёт|счет)",
+    re.IGNORECASE,
+)
+_TECHNICAL_KEYWORDS = re.compile(
+    r"\b(?:error|bug|crash\w*|freez\w*|login|log in|password|app|website|site"
+    r"|page|load\w*|server|connect\w*|update|ошибк|сбой|вылета|зависа|не работает"
+    r"|пароль|приложени|сайт|страниц|загруз|подключ|обновлени)",
+    re.IGNORECASE,
+)
+
+
+async def local_category_stage(context: EnrichmentContext) -> CategoryEnum:
+    """Degraded category from keywords, without calling OpenAI."""
+    is_spam, _ = context.results.get("spam", (False, None))
+    if is_spam:
+        return CategoryEnum.OTHER
+    payment = len(_PAYMENT_KEYWORDS.findall(context.text))
+    technical = len(_TECHNICAL_KEYWORDS.findall(context.text))
+    if payment == technical == 0:
+        return CategoryEnum.OTHER
+    return CategoryEnum.PAYMENT if payment >= technical else CategoryEnum.TECHNICAL
+
+
+async def embedding_stage(context: EnrichmentContext) -> Optional[Any]:
+    """Embedding vector of the text (None for spam, not worth indexing)."""
+    is_spam, _ = context.results.get("spam", (False, None))
+    if is_spam:
+        return None
+    if embedding_provider.remote:
+        context.api_calls["embedding"] += 1
+    return (await embedding_provider.embed([context.text]))[0]
+
+
+def build_registry(
+    disabled: Sequence[str] = (),
+    timeouts: Optional[Dict[str, float]] = None,
+    costs: Optional[Dict[str, float]] = None,
+) -> EnrichmentRegistry:
+    """
+    Create the registry of built-in stages.
+
+    Args:
+        disabled: Names of stages to start disabled.
+        timeouts: Per-stage timeout overrides in seconds.
+        costs: Per-stage cost of one upstream API call.
+
+    Returns:
+        EnrichmentRegistry: sentiment, spam, geo and (deferred) category
+        and embedding.
+    """
+    timeouts = timeouts or {}
+    costs = costs or {}
+    registry = EnrichmentRegistry()
+    for stage in (
+        EnrichmentStage("sentiment", sentiment_stage, SentimentEnum.UNKNOWN, 10.0),
+        EnrichmentStage(
+            "spam", spam_stage, (False, None), 10.0, degraded_run=local_spam_stage
+        ),
+        EnrichmentStage("geo", geo_stage, None, 6.0, sheddable=True),
+        EnrichmentStage(
+            "category",
+            category_stage,
+            CategoryEnum.OTHER,
+            30.0,
+            depends_on=("spam",),
+            deferred=True,
+            degraded_run=local_category_stage,
+        ),
+        EnrichmentStage(
+            "embedding",
+            embedding_stage,
+            None,
+            15.0,
+            depends_on=("spam",),
+            deferred=True,
+            sheddable=True,
+        ),
+    ):
+        stage.timeout = timeouts.get(stage.name, stage.timeout)
+        stage.cost_per_call = costs.get(stage.name, 0.0)
+        stage.enabled = stage.name not in disabled
+        registry.register(stage)
+    unknown = set(disabled) - {stage.name for stage in registry.stages}
+    if unknown:
+        logger.warning("Unknown enrichment stages disabled: %s", sorted(unknown))
+    return registry
+
+
+# Shared per-process registry; import `enrichment_stages` wherever needed
+enrichment_stages = build_registry(
+    disabled=settings.enrichment_disabled_stages,
+    timeouts=settings.enrichment_stage_timeouts,
+    costs=settings.enrichment_stage_costs,
+)
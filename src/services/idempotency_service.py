@@ -0,0 +1,229 @@
+"""
+src/services/idempotency_service.py
+
+Idempotency-Key support for POST /complaints.
+
+The first request with a key claims it by inserting a row into
+idempotency_keys and stores its response there when done; repeats within
+the TTL get that stored response instead of creating (and enriching) a
+second complaint. A repeat arriving while the original is still running
+waits for it: on the in-process original's completion when both reached the
+same worker, otherwise by polling the row.
+
+An original that fails releases its key, so the client's retry runs the
+request again. A claim left behind by a crashed worker is taken over once
+it is older than IDEMPOTENCY_LOCK_SECONDS.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 0.1
+
+# Originals running in this worker, so duplicates wait without polling
+_in_flight: Dict[str, "asyncio.Future[None]"] = {}
+_last_purge = 0.0
+
+
+class IdempotencyKeyMismatch(Exception):
+    """Raised when a key is reused with a different request payload."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """Raised when the original request is still running after the wait."""
+
+
+class StoredResponse(NamedTuple):
+    """
+    Response recorded for an idempotency key.
+
+    Attributes:
+        status_code: HTTP status of the original response.
+        body: JSON body of the original response.
+    """
+
+    status_code: int
+    body: bytes
+
+
+def request_fingerprint(payload: bytes) -> str:
+    """Hash a request payload for comparison with the stored request."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Service for claiming idempotency keys and replaying stored responses.
+
+    Responsibilities:
+        - Claim a key for the first request (one INSERT, committed at once).
+        - Replay the stored response for repeats within the TTL.
+        - Make concurrent repeats wait for the in-flight original.
+        - Release the key of a failed original; purge expired keys.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the IdempotencyService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+        """
+        self.session = session
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Claim a key, or wait for and return the response already stored
+        for it.
+
+        Args:
+            key (str): Client-supplied Idempotency-Key.
+            fingerprint (str): request_fingerprint() of the payload.
+
+        Returns:
+            Optional[StoredResponse]: The stored response of an earlier
+            request with this key, or None when this request now owns the
+            key and must call complete() or abandon().
+
+        Raises:
+            IdempotencyKeyMismatch: The key was used for another payload.
+            IdempotencyKeyInProgress: The original is still running after
+                IDEMPOTENCY_WAIT_SECONDS.
+        """
+        await self._purge_expired_if_due()
+        deadline = time.monotonic() + settings.idempotency_wait_seconds
+        while True:
+            if await self._claim(key, fingerprint):
+                _in_flight[key] = asyncio.get_running_loop().create_future()
+                return None
+
+            query = select(
+                IdempotencyKey.request_hash,
+                IdempotencyKey.status_code,
+                IdempotencyKey.response_body,
+                IdempotencyKey.created_at,
+            ).where(IdempotencyKey.key == key)
+            row = (await self.session.execute(query)).first()
+            # end the read transaction so the next poll sees new commits
+            await self.session.rollback()
+            if row is None:
+                continue  # released or expired meanwhile: claim again
+            request_hash, status_code, body, created_at = row
+            if request_hash != fingerprint:
+                raise IdempotencyKeyMismatch(
+                    f"Idempotency-Key {key!r} was used for a different request"
+                )
+            if status_code is not None:
+                logger.info("Replaying stored response for Idempotency-Key %r", key)
+                return StoredResponse(status_code, body)
+            if await self._take_over_stale(key, created_at):
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise IdempotencyKeyInProgress(
+                    f"Request with Idempotency-Key {key!r} is still in progress"
+                )
+            original = _in_flight.get(key)
+            if original is not None:
+                await asyncio.wait({original}, timeout=remaining)
+            else:
+                await asyncio.sleep(min(_POLL_SECONDS, remaining))
+
+    async def complete(self, key: str, status_code: int, body: bytes) -> None:
+        """
+        Store the response of the request owning `key` and wake waiters.
+        """
+        try:
+            await self.session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=status_code, response_body=body)
+            )
+            await self.session.commit()
+        finally:
+            self._wake(key)
+
+    async def abandon(self, key: str) -> None:
+        """
+        Release the key of a failed request, so a retry runs it again.
+        """
+        self._wake(key)
+        try:
+            await self.session.rollback()
+            await self.session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+                )
+            )
+            await self.session.commit()
+        except Exception as e:
+            # the claim expires as stale after IDEMPOTENCY_LOCK_SECONDS
+            logger.error("Could not release Idempotency-Key %r: %s", key, e)
+
+    async def _claim(self, key: str, fingerprint: str) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            # an expired key is free for reuse
+            await self.session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.expires_at < now
+                )
+            )
+            await self.session.execute(
+                insert(IdempotencyKey).values(
+                    key=key,
+                    request_hash=fingerprint,
+                    expires_at=now
+                    + timedelta(seconds=settings.idempotency_ttl_seconds),
+                )
+            )
+            await self.session.commit()
+            return True
+        except IntegrityError:
+            await self.session.rollback()
+            return False
+
+    async def _take_over_stale(self, key: str, created_at: datetime) -> bool:
+        """Drop an in-progress claim whose owner apparently died."""
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age = datetime.now(timezone.utc) - created_at
+        if age.total_seconds() < settings.idempotency_lock_seconds:
+            return False
+        logger.warning("Taking over stale Idempotency-Key %r", key)
+        await self.abandon(key)
+        return True
+
+    async def _purge_expired_if_due(self) -> None:
+        global _last_purge
+        now = time.monotonic()
+        if now - _last_purge < settings.idempotency_purge_interval_seconds:
+            return
+        _last_purge = now
+        result = await self.session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.expires_at < datetime.now(timezone.utc)
+            )
+        )
+        await self.session.commit()
+        logger.info("Purged %d expired idempotency keys", result.rowcount)
+
+    @staticmethod
+    def _wake(key: str) -> None:
+        original = _in_flight.pop(key, None)
+        if original is not None and not original.done():
+            original.set_result(None)
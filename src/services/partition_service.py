@@ -0,0 +1,388 @@
+"""
+src/services/partition_service.py
+
+Optional monthly partitioning of the complaints table (PostgreSQL only).
+
+`enable` converts complaints into a declaratively partitioned table, one
+partition per creation month (complaints_y2025m01, ...) plus a default
+partition catching timestamps outside every month. Afterwards:
+
+    - Queries filtering on `timestamp` (the list endpoint's `since`, the
+      archive job's cutoff) scan only the partitions of the requested months.
+    - Indexes and VACUUM work per month instead of on one huge table.
+    - Old months can be detached in one statement instead of deleted row by
+      row (`detach`).
+
+PostgreSQL requires the partition key in every unique constraint, so the
+primary key becomes (id, timestamp) -- IDs stay unique, they still come from
+the one sequence -- and foreign keys pointing at complaints (duplicate_of_id,
+complaint_embeddings) are dropped; the ORM still declares them, and
+ArchiveService already deletes dependent rows itself.
+
+SQLite has no partitioning; splitting the table across attached database
+files would break the full-text search triggers and foreign keys, so on
+SQLite old complaints are moved out by ArchiveService instead.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.complaint import Complaint
+from ..schemas.enums import StatusEnum
+
+logger = logging.getLogger(__name__)
+
+TABLE = "complaints"
+DEFAULT_PARTITION = f"{TABLE}_default"
+_LEGACY_TABLE = f"{TABLE}_unpartitioned"
+_PARTITION_RE = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing `moment`."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """The month `months` after (or before) the first instant `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding complaints created in `month`."""
+    return f"{TABLE}_y{month:%Y}m{month:%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Month of a partition name; None for the default partition."""
+    match = _PARTITION_RE.match(name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class PartitionInfo:
+    """One partition of the complaints table."""
+
+    name: str
+    month: Optional[datetime]
+    estimated_rows: int
+
+
+class PartitionService:
+    """
+    Service managing the monthly partitions of the complaints table.
+
+    Responsibilities:
+        - Convert the complaints table into a partitioned one.
+        - Create partitions ahead of time (run from cron).
+        - List partitions and detach (optionally drop) old ones.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the PartitionService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+        """
+        self.session = session
+
+    def _require_postgres(self) -> None:
+        dialect = self.session.get_bind().dialect.name
+        if dialect != "postgresql":
+            raise NotImplementedError(f"Partitioning not supported on {dialect}")
+
+    async def is_partitioned(self) -> bool:
+        """Whether the complaints table is already partitioned."""
+        self._require_postgres()
+        relkind = await self.session.scalar(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": TABLE},
+        )
+        return relkind == "p"
+
+    async def enable(self, months_ahead: int = settings.partition_months_ahead) -> int:
+        """
+        Convert the complaints table into monthly partitions, in one
+        transaction.
+
+        Existing rows are copied, so the table is locked for the duration;
+        run it in a maintenance window.
+
+        Args:
+            months_ahead (int): Partitions created after the current month.
+
+        Returns:
+            int: Number of complaints copied.
+        """
+        if await self.is_partitioned():
+            logger.info("The %s table is already partitioned", TABLE)
+            return 0
+        execute = self.session.execute
+
+        indexes = (
+            await execute(
+                text(
+                    "SELECT indexname, indexdef FROM pg_indexes "
+                    "WHERE schemaname = current_schema() AND tablename = :table "
+                    "AND indexname NOT IN (SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = to_regclass(:table) AND contype = 'p')"
+                ),
+                {"table": TABLE},
+            )
+        ).all()
+        referencing = (
+            await execute(
+                text(
+                    "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+                    "WHERE contype = 'f' AND confrelid = to_regclass(:table)"
+                ),
+                {"table": TABLE},
+            )
+        ).all()
+        primary_key = await self.session.scalar(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE contype = 'p' AND conrelid = to_regclass(:table)"
+            ),
+            {"table": TABLE},
+        )
+        comment = await self.session.scalar(
+            text("SELECT obj_description(to_regclass(:table), 'pg_class')"),
+            {"table": TABLE},
+        )
+        for table, constraint in referencing:
+            logger.info("Dropping foreign key %s on %s", constraint, table)
+            await execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"'))
+
+        await execute(text(f"ALTER TABLE {TABLE} RENAME TO {_LEGACY_TABLE}"))
+        if primary_key:
+            # frees the name of the primary key index for the new table
+            await execute(
+                text(
+                    f'ALTER TABLE {_LEGACY_TABLE} RENAME CONSTRAINT "{primary_key}" '
+                    f"TO {_LEGACY_TABLE}_pkey"
+                )
+            )
+        for name, _ in indexes:
+            await execute(text(f'DROP INDEX "{name}"'))
+        await execute(
+            text(
+                f"CREATE TABLE {TABLE} (LIKE {_LEGACY_TABLE} INCLUDING DEFAULTS "
+                "INCLUDING GENERATED INCLUDING COMMENTS INCLUDING STORAGE) "
+                'PARTITION BY RANGE ("timestamp")'
+            )
+        )
+        await execute(text(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id, "timestamp")'))
+        for _, definition in indexes:
+            # created on the parent, cascades to every partition
+            await execute(text(definition))
+        if comment:
+            # utility statements take no bind parameters
+            quoted = comment.replace("'", "''").replace(":", "\\:")
+            await execute(text(f"COMMENT ON TABLE {TABLE} IS '{quoted}'"))
+        sequence = await self.session.scalar(
+            text("SELECT pg_get_serial_sequence(:table, 'id')"),
+            {"table": _LEGACY_TABLE},
+        )
+        if sequence:
+            await execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id"))
+
+        oldest = await self.session.scalar(
+            text(f'SELECT min("timestamp") FROM {_LEGACY_TABLE}')
+        )
+        first = month_start(oldest or datetime.now(timezone.utc))
+        await self._create_partitions(first, months_ahead)
+        await execute(
+            text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+        )
+
+        columns = ", ".join(
+            f'"{column}"'
+            for column in (
+                await self.session.scalars(
+                    text(
+                        "SELECT column_name FROM information_schema.columns "
+                        "WHERE table_schema = current_schema() "
+                        "AND table_name = :table AND is_generated = 'NEVER' "
+                        "ORDER BY ordinal_position"
+                    ),
+                    {"table": _LEGACY_TABLE},
+                )
+            ).all()
+        )
+        result = await execute(
+            text(
+                f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {_LEGACY_TABLE}"
+            )
+        )
+        copied = result.rowcount  # type: ignore[attr-defined]
+        await execute(text(f"DROP TABLE {_LEGACY_TABLE}"))
+        await self.session.commit()
+        await execute(text(f"ANALYZE {TABLE}"))
+        await self.session.commit()
+        logger.info("Partitioned %s by month: %d complaints copied", TABLE, copied)
+        return copied
+
+    async def ensure_partitions(
+        self, months_ahead: int = settings.partition_months_ahead
+    ) -> List[str]:
+        """
+        Create the partitions of the current month and the next ones.
+
+        Args:
+            months_ahead (int): Partitions created after the current month.
+
+        Returns:
+            List[str]: Names of the partitions created.
+        """
+        if not await self.is_partitioned():
+            raise RuntimeError(f"The {TABLE} table is not partitioned")
+        created = await self._create_partitions(
+            month_start(datetime.now(timezone.utc)), months_ahead
+        )
+        await self.session.commit()
+        return created
+
+    async def _create_partitions(self, first: datetime, months_ahead: int) -> List[str]:
+        existing = {info.name for info in await self._partitions()}
+        last = add_months(month_start(datetime.now(timezone.utc)), months_ahead)
+        created: List[str] = []
+        month = first
+        while month <= last:
+            name = partition_name(month)
+            if name not in existing:
+                end = add_months(month, 1)
+                if DEFAULT_PARTITION in existing and await self._count(
+                    month, end, table=DEFAULT_PARTITION
+                ):
+                    # attaching would have to move rows out of the default
+                    # partition under an exclusive lock; they stay there
+                    logger.warning(
+                        "Skipping partition %s: the default partition holds "
+                        "complaints of that month",
+                        name,
+                    )
+                else:
+                    await self.session.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF {TABLE} "
+                            f"FOR VALUES FROM ('{month.isoformat()}') "
+                            f"TO ('{end.isoformat()}')"
+                        )
+                    )
+                    created.append(name)
+                    logger.info("Created partition %s", name)
+            month = add_months(month, 1)
+        return created
+
+    async def _partitions(self) -> List[PartitionInfo]:
+        rows = (
+            await self.session.execute(
+                text(
+                    "SELECT c.relname, c.reltuples FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+                ),
+                {"table": TABLE},
+            )
+        ).all()
+        return [
+            PartitionInfo(name, partition_month(name), max(0, int(rows_estimate)))
+            for name, rows_estimate in rows
+        ]
+
+    async def list_partitions(self) -> List[PartitionInfo]:
+        """
+        List the partitions of the complaints table, oldest month first
+        (row counts are planner estimates, refreshed by ANALYZE).
+        """
+        self._require_postgres()
+        return await self._partitions()
+
+    async def _count(
+        self,
+        start: datetime,
+        end: datetime,
+        table: str = TABLE,
+        status: Optional[StatusEnum] = None,
+    ) -> int:
+        if table == TABLE:
+            query = select(func.count()).where(
+                Complaint.timestamp >= start, Complaint.timestamp < end
+            )
+            if status is not None:
+                query = query.where(Complaint.status == status)
+            return await self.session.scalar(query) or 0
+        return (
+            await self.session.scalar(
+                text(
+                    f'SELECT count(*) FROM {table} WHERE "timestamp" >= :start '
+                    'AND "timestamp" < :end'
+                ),
+                {"start": start, "end": end},
+            )
+            or 0
+        )
+
+    async def detach(
+        self, before: datetime, drop: bool = False, force: bool = False
+    ) -> List[str]:
+        """
+        Detach the partitions of every month before `before`.
+
+        A detached partition becomes a standalone table of the same name
+        (kept for export unless `drop`); its complaints disappear from the
+        API, though the stats rollup still counts them. Run the archive job
+        first so closed complaints stay readable by ID.
+
+        Args:
+            before (datetime): Months starting before this are detached.
+            drop (bool): Drop the detached tables.
+            force (bool): Also detach partitions holding open complaints.
+
+        Returns:
+            List[str]: Names of the detached partitions.
+        """
+        self._require_postgres()
+        cutoff = month_start(before)
+        detached: List[str] = []
+        for info in await self._partitions():
+            if info.month is None or info.month >= cutoff:
+                continue
+            end = add_months(info.month, 1)
+            still_open = await self._count(info.month, end, status=StatusEnum.OPEN)
+            if still_open and not force:
+                logger.warning(
+                    "Keeping partition %s: %d complaints are still open",
+                    info.name,
+                    still_open,
+                )
+                continue
+            await self.session.execute(
+                text(
+                    "DELETE FROM complaint_embeddings "
+                    f"WHERE complaint_id IN (SELECT id FROM {info.name})"
+                )
+            )
+            await self.session.execute(
+                text(f"ALTER TABLE {TABLE} DETACH PARTITION {info.name}")
+            )
+            if drop:
+                await self.session.execute(text(f"DROP TABLE {info.name}"))
+            await self.session.commit()
+            detached.append(info.name)
+            logger.info("%s partition %s", "Dropped" if drop else "Detached", info.name)
+        return detached
@@ -0,0 +1,276 @@
+"""
+src/services/priority.py
+
+Priority scheduling of complaint enrichment (sentiment, spam, geolocation
+and category calls to the external APIs).
+
+Each complaint gets a priority from cheap local signals before any remote
+call is made; while enrichment is backlogged, waiting steps are started in
+priority order instead of arrival order. Every priority has its own
+concurrency limit within a shared capacity, and waiters age: each
+`aging_seconds` spent in the queue promotes a waiter by one level, so low
+priority work is delayed but never starved.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from ..config import settings
+from .spam_filter import spam_filter
+
+logger = logging.getLogger(__name__)
+
+# Money at stake: charges, refunds, card and bank trouble (English / Russian)
+_PAYMENT_RE = re.compile(
+    r"\b(?:pay|paid|payment|charge[ds]?|refund|money|card|bank|billing|invoice"
+    r"|fraud|stolen|оплат|деньг|списа|возврат|карт|мошен)",
+    re.IGNORECASE,
+)
+# Strongly negative wording
+_NEGATIVE_RE = re.compile(
+    r"\b(?:unacceptable|furious|angry|outrageous|worst|terrible|awful|scam"
+    r"|lawyer|lawsuit|court|never again|disgusting|ужасн|отвратительн|безобраз"
+    r"|обман|суд)",
+    re.IGNORECASE,
+)
+_MIN_TEXT_LENGTH = 20
+_WAIT_SAMPLES = 1000
+
+
+class Priority(IntEnum):
+    """Enrichment priority; lower values are served first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+def classify_priority(text: str, client_ip: Optional[str] = None) -> Priority:
+    """
+    Derive a complaint's enrichment priority from local signals only.
+
+    Signals:
+        - payment keywords (+2) and strongly negative words (+1 each, max 2)
+        - a repeat customer: earlier submissions from the same IP within
+          the spam filter's window, below its abuse threshold (+1)
+        - a very short text (-2) or an IP over the abuse threshold (-2)
+
+    Args:
+        text: Complaint text.
+        client_ip: Submitting client, if known.
+
+    Returns:
+        Priority: HIGH for a score of 3 or more, LOW below 0, else NORMAL.
+    """
+    score = 0
+    if _PAYMENT_RE.search(text):
+        score += 2
+    score += min(2, len(_NEGATIVE_RE.findall(text)))
+    if len(text.strip()) < _MIN_TEXT_LENGTH:
+        score -= 2
+    if client_ip:
+        submissions = spam_filter.rates.count(client_ip)
+        if submissions > spam_filter.max_per_ip:
+            score -= 2
+        elif submissions:
+            score += 1
+    if score >= 3:
+        return Priority.HIGH
+    if score < 0:
+        return Priority.LOW
+    return Priority.NORMAL
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued", "future", "granted")
+
+    def __init__(self, priority: Priority, future: "asyncio.Future[None]"):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.future = future
+        self.granted = False
+
+
+class _PriorityMetrics:
+    __slots__ = ("admitted", "waits")
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.waits: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+
+class PriorityScheduler:
+    """
+    Admission of concurrent work in priority order, with aging.
+
+    Attributes:
+        capacity (int): Concurrent slots across all priorities.
+        limits (Dict[Priority, int]): Concurrent slots per priority.
+        aging_seconds (float): Wait that promotes a waiter by one level.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        limits: Optional[Dict[Priority, int]] = None,
+        aging_seconds: float = 2.0,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        limits = limits or {}
+        self.capacity = capacity
+        self.limits = {
+            priority: max(1, min(capacity, limits.get(priority, capacity)))
+            for priority in Priority
+        }
+        self.aging_seconds = aging_seconds
+        self._running = dict.fromkeys(Priority, 0)
+        self._queues: Dict[Priority, Deque[_Waiter]] = {
+            priority: deque() for priority in Priority
+        }
+        self._metrics = {priority: _PriorityMetrics() for priority in Priority}
+
+    @property
+    def running(self) -> int:
+        """Slots currently held across all priorities."""
+        return sum(self._running.values())
+
+    @property
+    def waiting(self) -> int:
+        """Waiters currently queued across all priorities."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _can_start(self, priority: Priority) -> bool:
+        return (
+            self.running < self.capacity
+            and self._running[priority] < self.limits[priority]
+        )
+
+    def _start(self, priority: Priority, waited: float) -> None:
+        self._running[priority] += 1
+        metrics = self._metrics[priority]
+        metrics.admitted += 1
+        metrics.waits.append(waited)
+
+    async def acquire(self, priority: Priority) -> None:
+        """
+        Wait for a slot of the given priority.
+
+        Starts at once when nothing is queued and a slot is free; otherwise
+        queues behind the waiters the scheduler prefers.
+        """
+        if not self.waiting and self._can_start(priority):
+            self._start(priority, 0.0)
+            return
+        waiter = _Waiter(priority, asyncio.get_running_loop().create_future())
+        self._queues[priority].append(waiter)
+        # the queued waiters may be held back only by their own limits
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.granted:
+                # granted while being cancelled: hand the slot on
+                self.release(priority)
+            elif waiter in self._queues[priority]:
+                self._queues[priority].remove(waiter)
+            raise
+
+    def release(self, priority: Priority) -> None:
+        """Return a slot and start the next preferred waiters."""
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self.running < self.capacity:
+            best: Optional[_Waiter] = None
+            best_key = None
+            for priority, queue in self._queues.items():
+                # drop waiters cancelled before their task could dequeue them
+                while queue and queue[0].future.done():
+                    queue.popleft()
+                if not queue or self._running[priority] >= self.limits[priority]:
+                    continue
+                head = queue[0]
+                # fully aged waiters tie with HIGH and go in arrival order
+                promoted = int((now - head.enqueued) / self.aging_seconds)
+                key = (max(Priority.HIGH, priority - promoted), head.enqueued)
+                if best_key is None or key < best_key:
+                    best, best_key = head, key
+            if best is None:
+                return
+            self._queues[best.priority].popleft()
+            best.granted = True
+            self._start(best.priority, now - best.enqueued)
+            best.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """
+        Hold a slot of the given priority for the body of the block.
+
+        Example:
+            async with enrichment_scheduler.slot(Priority.HIGH):
+                sentiment = await get_sentiment(text)
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current queue depth, running slots and recent wait times (ms) per
+        priority.
+        """
+        now = time.monotonic()
+        priorities: List[Dict[str, Any]] = []
+        for priority in Priority:
+            queue = self._queues[priority]
+            metrics = self._metrics[priority]
+            waits = sorted(metrics.waits)
+            priorities.append(
+                {
+                    "priority": priority.name.lower(),
+                    "limit": self.limits[priority],
+                    "running": self._running[priority],
+                    "waiting": len(queue),
+                    "oldest_wait_ms": (
+                        (now - queue[0].enqueued) * 1000 if queue else 0.0
+                    ),
+                    "admitted": metrics.admitted,
+                    "wait_ms_avg": sum(waits) / len(waits) * 1000 if waits else 0.0,
+                    "wait_ms_p95": (
+                        waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000
+                        if waits
+                        else 0.0
+                    ),
+                    "wait_ms_max": waits[-1] * 1000 if waits else 0.0,
+                }
+            )
+        return {
+            "capacity": self.capacity,
+            "running": self.running,
+            "waiting": self.waiting,
+            "aging_seconds": self.aging_seconds,
+            "priorities": priorities,
+        }
+
+
+# Shared per-process scheduler; import `enrichment_scheduler` wherever needed
+enrichment_scheduler = PriorityScheduler(
+    capacity=settings.enrichment_concurrency,
+    limits={
+        Priority.NORMAL: settings.enrichment_normal_limit,
+        Priority.LOW: settings.enrichment_low_limit,
+    },
+    aging_seconds=settings.enrichment_aging_seconds,
+)
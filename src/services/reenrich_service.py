@@ -0,0 +1,309 @@
+"""
+src/services/reenrich_service.py
+
+Re-enrichment of stored complaints whose sentiment or category is only a
+fallback: UNKNOWN sentiment or OTHER category, typically left behind when an
+upstream API call failed at creation time, and complaints created in
+degraded mode (enrichment_deferred, see src/core/load_shedding.py), whose
+spam check and category are redone in full. Their location cannot be
+backfilled: client IPs are not stored.
+
+The job walks the complaints table by ascending ID in keyset-paginated
+batches, calls the upstream APIs again with bounded concurrency and a
+per-API rate limit, and writes each batch back in one transaction. Progress
+is saved to a checkpoint file after every batch, so an interrupted run
+resumes where it stopped; a run that completes its scan removes the file, so
+the next run starts a fresh scan up to the then newest complaint.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..clients.openai_client import categorize_complaint
+from ..clients.sentiment import get_sentiment
+from ..config import settings
+from ..core.ratelimit import InMemorySlidingWindowBackend, RateLimitBackend
+from ..models.complaint import Complaint
+from ..schemas.enums import CategoryEnum, SentimentEnum
+from .enrichment import EnrichmentContext, prefilter_spam, remote_spam_check
+from .stats_service import StatsService
+
+logger = logging.getLogger(__name__)
+
+_ROW_FIELDS = (
+    "id",
+    "text",
+    "sentiment",
+    "category",
+    "version",
+    "timestamp",
+    "country_code",
+    "region",
+    "enrichment_deferred",
+)
+
+
+@dataclass
+class ReenrichCheckpoint:
+    """
+    Progress of a re-enrichment run, saved after every batch.
+
+    Attributes:
+        last_id: Highest complaint ID already processed.
+        until_id: Highest complaint ID when the run started (newer complaints
+            are enriched on creation and not scanned).
+        scanned: Complaints examined.
+        updated: Complaints whose sentiment or category changed, or whose
+            deferred enrichment was completed.
+        unchanged: Complaints the upstream APIs still could not enrich.
+        conflicts: Complaints modified concurrently, left as they were.
+    """
+
+    last_id: int = 0
+    until_id: int = 0
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    conflicts: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ReenrichCheckpoint"]:
+        """Read a checkpoint file; None if it does not exist."""
+        try:
+            return cls(**json.loads(path.read_text()))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: Path) -> None:
+        """Write the checkpoint atomically (a crash leaves the old one)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        os.replace(tmp, path)
+
+
+@dataclass
+class _Result:
+    row: Dict[str, Any]
+    sentiment: SentimentEnum
+    category: CategoryEnum
+    changes: Dict[str, Any] = field(default_factory=dict)
+
+
+class ReenrichService:
+    """
+    Service re-running upstream enrichment for fallback-valued complaints.
+
+    Responsibilities:
+        - Select complaints with UNKNOWN sentiment, OTHER category or
+          deferred enrichment in ascending ID batches (keyset pagination,
+          no OFFSET).
+        - Call the Sentiment and OpenAI APIs again for the fallback fields
+          only (plus the spam check and category of deferred complaints),
+          with bounded concurrency and a per-API rate limit.
+        - Write each batch in one transaction, bumping the version and
+          moving the stats rollup; complaints changed meanwhile are skipped.
+        - Save a resumable checkpoint after every batch, and drop it when
+          the scan is complete.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        rate_limiter: Optional[RateLimitBackend] = None,
+    ):
+        """
+        Initialize the ReenrichService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+            rate_limiter (Optional[RateLimitBackend]): Shared state for the
+                per-API rate limit (in-memory by default).
+        """
+        self.session = session
+        self.stats = StatsService(session)
+        self.rate_limiter = rate_limiter or InMemorySlidingWindowBackend()
+
+    async def run(
+        self,
+        checkpoint_path: Optional[Path] = None,
+        batch_size: int = settings.reenrich_batch_size,
+        concurrency: int = settings.reenrich_concurrency,
+        rate_per_second: int = settings.reenrich_rate_per_second,
+        limit: Optional[int] = None,
+    ) -> ReenrichCheckpoint:
+        """
+        Re-enrich fallback-valued complaints, resuming from a checkpoint.
+
+        Args:
+            checkpoint_path (Optional[Path]): Progress file; an existing one
+                is resumed, and it is removed once the scan completes. None
+                runs without saving progress.
+            batch_size (int): Complaints per batch and transaction.
+            concurrency (int): Concurrent upstream calls.
+            rate_per_second (int): Calls per second and upstream API.
+            limit (Optional[int]): Stop after scanning this many complaints.
+
+        Returns:
+            ReenrichCheckpoint: Progress of the run (cumulative when resumed).
+        """
+        progress = None
+        if checkpoint_path is not None:
+            progress = ReenrichCheckpoint.load(checkpoint_path)
+            if progress is not None:
+                logger.info("Resuming re-enrichment after id=%d", progress.last_id)
+        if progress is None:
+            until_id = await self.session.scalar(select(func.max(Complaint.id)))
+            progress = ReenrichCheckpoint(until_id=until_id or 0)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        scanned = 0
+        while limit is None or scanned < limit:
+            size = batch_size if limit is None else min(batch_size, limit - scanned)
+            rows = await self._next_batch(progress, size)
+            if not rows:
+                if checkpoint_path is not None:
+                    checkpoint_path.unlink(missing_ok=True)
+                logger.info(
+                    "Re-enrichment scan complete up to id=%d", progress.until_id
+                )
+                break
+            results = await asyncio.gather(
+                *(self._enrich(row, semaphore, rate_per_second) for row in rows)
+            )
+            updated, conflicts = await self._write(results)
+
+            scanned += len(rows)
+            progress.last_id = rows[-1]["id"]
+            progress.scanned += len(rows)
+            progress.updated += updated
+            progress.conflicts += conflicts
+            progress.unchanged += len(rows) - updated - conflicts
+            if checkpoint_path is not None:
+                progress.save(checkpoint_path)
+            logger.info(
+                "Re-enriched up to id=%d: %d updated, %d conflicts in batch",
+                progress.last_id,
+                updated,
+                conflicts,
+            )
+        return progress
+
+    async def _next_batch(
+        self, progress: ReenrichCheckpoint, size: int
+    ) -> List[Dict[str, Any]]:
+        query = (
+            select(*(getattr(Complaint, name) for name in _ROW_FIELDS))
+            .where(
+                Complaint.id > progress.last_id,
+                Complaint.id <= progress.until_id,
+                # deferred spam was decided by the local pre-filter alone
+                or_(
+                    Complaint.is_spam == False,  # noqa: E712
+                    Complaint.enrichment_deferred == True,  # noqa: E712
+                ),
+                or_(
+                    Complaint.sentiment == SentimentEnum.UNKNOWN,
+                    Complaint.category == CategoryEnum.OTHER,
+                    Complaint.enrichment_deferred == True,  # noqa: E712
+                ),
+            )
+            .order_by(Complaint.id)
+            .limit(size)
+        )
+        rows = (await self.session.execute(query)).all()
+        # end the read transaction: the upstream calls take a while
+        await self.session.rollback()
+        return [dict(zip(_ROW_FIELDS, row)) for row in rows]
+
+    async def _throttle(self, api: str, rate_per_second: int) -> None:
+        while True:
+            allowed, retry_after = await self.rate_limiter.hit(
+                f"reenrich:{api}", rate_per_second, 1.0
+            )
+            if allowed:
+                return
+            await asyncio.sleep(retry_after)
+
+    async def _enrich(
+        self, row: Dict[str, Any], semaphore: asyncio.Semaphore, rate_per_second: int
+    ) -> _Result:
+        result = _Result(row, row["sentiment"], row["category"])
+        deferred = row["enrichment_deferred"]
+        async with semaphore:
+            if row["sentiment"] == SentimentEnum.UNKNOWN:
+                await self._throttle("sentiment", rate_per_second)
+                result.sentiment = await get_sentiment(row["text"])
+            if deferred:
+                # degraded mode only ran the local spam pre-filter; the
+                # API is called (and throttled) only if it stays undecided
+                context = EnrichmentContext(row["text"])
+                local_verdict, local_score = prefilter_spam(context)
+                if local_verdict is None:
+                    await self._throttle("spam", rate_per_second)
+                    is_spam, spam_score = await remote_spam_check(context, local_score)
+                else:
+                    is_spam, spam_score = local_verdict, local_score
+                result.changes.update(
+                    is_spam=is_spam, spam_score=spam_score, enrichment_deferred=False
+                )
+                if is_spam:
+                    result.category = CategoryEnum.OTHER
+            if not result.changes.get("is_spam") and (
+                deferred or row["category"] == CategoryEnum.OTHER
+            ):
+                await self._throttle("openai", rate_per_second)
+                result.category = await categorize_complaint(row["text"])
+        if result.sentiment != row["sentiment"]:
+            result.changes["sentiment"] = result.sentiment
+        if result.category != row["category"]:
+            result.changes["category"] = result.category
+        return result
+
+    async def _write(self, results: Sequence[_Result]) -> Tuple[int, int]:
+        """
+        Apply a batch of changes in one transaction.
+
+        Each UPDATE is conditional on the version read with the batch, so a
+        complaint changed in the meantime (status update, another run) is
+        left alone and counted as a conflict.
+        """
+        updated = conflicts = 0
+        try:
+            for result in results:
+                if not result.changes:
+                    continue
+                row = result.row
+                current_status = await self.session.scalar(
+                    update(Complaint)
+                    .where(
+                        Complaint.id == row["id"], Complaint.version == row["version"]
+                    )
+                    .values(**result.changes, version=Complaint.version + 1)
+                    .returning(Complaint.status)
+                    .execution_options(synchronize_session=False)
+                )
+                if current_status is None:
+                    conflicts += 1
+                    continue
+                await self.stats.move(
+                    row["timestamp"],
+                    (row["category"], row["sentiment"], current_status),
+                    (result.category, result.sentiment, current_status),
+                    row["country_code"],
+                    row["region"],
+                )
+                updated += 1
+            await self.session.commit()
+        except BaseException:
+            await self.session.rollback()
+            raise
+        return updated, conflicts
@@ -0,0 +1,189 @@
+"""
+src/services/search_service.py
+
+SearchService runs ranked full-text queries over complaint text.
+
+SQLite uses the external-content FTS5 table `complaints_fts` (kept in sync
+by triggers), PostgreSQL the generated `text_tsv` column with its GIN index;
+both are created by the Alembic migration 9e4f1a6b2d30. On both, every word
+of the query must match, and a word ending in `*` matches as a prefix.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Select, column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.complaint import Complaint
+from ..schemas.complaint import ComplaintSearchResult
+from ..schemas.enums import CategoryEnum, StatusEnum
+
+logger = logging.getLogger(__name__)
+
+MARK_START = "<mark>"
+MARK_END = "</mark>"
+SNIPPET_WORDS = 16
+
+_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+# FTS5 virtual table (not mapped: it only exists in the database)
+complaints_fts = table("complaints_fts", column("rowid"), column("text"))
+
+
+def fts5_query(query: str) -> str:
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted phrase (so FTS5 operators and punctuation in
+    the input cannot cause syntax errors); a trailing `*` keeps prefix
+    matching. Terms are implicitly AND-ed.
+
+    Example:
+        'charged twice!' -> '"charged" "twice"'
+        'refund*'        -> '"refund"*'
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(query):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def tsquery_text(query: str) -> str:
+    """
+    Turn free user input into a safe PostgreSQL to_tsquery expression with
+    the same meaning as fts5_query.
+
+    Words only contain word characters, so tsquery operators in the input
+    are dropped; a trailing `*` becomes the `:*` prefix marker. Terms are
+    AND-ed.
+
+    Example:
+        'charged twice!'  -> 'charged & twice'
+        'refund* charged' -> 'refund:* & charged'
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(query):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        terms.append(f"{word}:*" if prefix else word)
+    return " & ".join(terms)
+
+
+class SearchService:
+    """
+    Service for full-text search over complaints.
+
+    Responsibilities:
+        - Build dialect-specific ranked queries (FTS5 or tsvector).
+        - Apply the standard status/category/since filters.
+        - Return ranked hits with highlighted snippets.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the SearchService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+        """
+        self.session = session
+
+    def _sqlite_query(self, query: str) -> Optional[Select]:
+        match = fts5_query(query)
+        if not match:
+            return None
+        # FTS5 auxiliary functions and MATCH take the table name itself
+        fts = literal_column("complaints_fts")  # type: ignore[var-annotated]
+        return (
+            select(
+                Complaint.id,
+                Complaint.text,
+                Complaint.status,
+                Complaint.sentiment,
+                Complaint.category,
+                Complaint.timestamp,
+                # bm25() is lower-is-better; negate for a natural score
+                (-func.bm25(fts)).label("rank"),
+                func.snippet(fts, 0, MARK_START, MARK_END, "…", SNIPPET_WORDS).label(
+                    "snippet"
+                ),
+            )
+            .select_from(complaints_fts)
+            .join(Complaint, Complaint.id == complaints_fts.c.rowid)
+            .where(fts.op("MATCH")(match))
+            .order_by(func.bm25(fts))
+        )
+
+    def _postgres_query(self, query: str) -> Optional[Select]:
+        text = tsquery_text(query)
+        if not text:
+            return None
+        tsquery = func.to_tsquery("simple", text)
+        tsv = literal_column("complaints.text_tsv")  # type: ignore[var-annotated]
+        rank = func.ts_rank_cd(tsv, tsquery)
+        options = (
+            f"StartSel={MARK_START}, StopSel={MARK_END}, "
+            f"MaxWords={SNIPPET_WORDS}, MinWords=5, MaxFragments=1"
+        )
+        return (
+            select(
+                Complaint.id,
+                Complaint.text,
+                Complaint.status,
+                Complaint.sentiment,
+                Complaint.category,
+                Complaint.timestamp,
+                rank.label("rank"),
+                func.ts_headline("simple", Complaint.text, tsquery, options).label(
+                    "snippet"
+                ),
+            )
+            .where(tsv.op("@@")(tsquery))
+            .order_by(rank.desc())
+        )
+
+    async def search(
+        self,
+        query: str,
+        status: Optional[StatusEnum] = None,
+        category: Optional[CategoryEnum] = None,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+    ) -> List[ComplaintSearchResult]:
+        """
+        Find complaints whose text matches `query`, best matches first.
+
+        Args:
+            query (str): Words to search for (all must match).
+            status (Optional[StatusEnum]): Status to filter by.
+            category (Optional[CategoryEnum]): Category to filter by.
+            since (Optional[datetime]): Only complaints created after this time.
+            limit (int): Maximum number of hits.
+
+        Returns:
+            List[ComplaintSearchResult]: Ranked hits with snippets.
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            stmt = self._sqlite_query(query)
+        elif dialect == "postgresql":
+            stmt = self._postgres_query(query)
+        else:
+            raise NotImplementedError(f"Full-text search not supported on {dialect}")
+        if stmt is None:
+            return []
+
+        if status:
+            stmt = stmt.where(Complaint.status == status)
+        if category:
+            stmt = stmt.where(Complaint.category == category)
+        if since:
+            stmt = stmt.where(Complaint.timestamp >= since)
+        rows = (await self.session.execute(stmt.limit(limit))).mappings().all()
+        logger.info("Full-text search %r: %d hits", query[:60], len(rows))
+        return [ComplaintSearchResult.model_validate(dict(row)) for row in rows]
@@ -0,0 +1,157 @@
+"""
+src/services/similarity_service.py
+
+SimilarityService finds complaints similar to a given one by embedding
+similarity, and backfills embeddings of complaints stored without one
+(created before embeddings existed, in degraded mode, or when the provider
+changed).
+"""
+
+import logging
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.complaint import Complaint
+from ..models.complaint_embedding import ComplaintEmbedding
+from ..schemas.complaint import SimilarComplaint
+from .embeddings import embedding_provider
+from .vector_index import complaint_vectors, from_blob, refresh_vector_index, to_blob
+
+logger = logging.getLogger(__name__)
+
+# Extra candidates fetched, since some may be spam or archived by now
+_OVERFETCH = 10
+
+
+class SimilarityService:
+    """
+    Service for embedding-based similarity between complaints.
+
+    Responsibilities:
+        - Return the complaints most similar to a given one.
+        - Store embeddings and backfill missing ones in batches.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the SimilarityService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+        """
+        self.session = session
+
+    async def similar(
+        self, complaint_id: int, limit: int = 10
+    ) -> Optional[List[SimilarComplaint]]:
+        """
+        Find the complaints most similar to one complaint.
+
+        Args:
+            complaint_id (int): The reference complaint.
+            limit (int): Maximum number of results.
+
+        Returns:
+            Optional[List[SimilarComplaint]]: Non-spam complaints, most
+            similar first; None if the complaint does not exist.
+        """
+        complaint = await self.session.get(Complaint, complaint_id)
+        if complaint is None:
+            return None
+        vector = await self._vector_of(complaint)
+        await refresh_vector_index(self.session)
+        hits = complaint_vectors.search(
+            vector, limit + _OVERFETCH, exclude=(complaint_id,)
+        )
+        if not hits:
+            return []
+        query = select(
+            Complaint.id,
+            Complaint.text,
+            Complaint.status,
+            Complaint.sentiment,
+            Complaint.category,
+            Complaint.timestamp,
+        ).where(
+            Complaint.id.in_([hit_id for hit_id, _ in hits]),
+            Complaint.is_spam.is_(False),
+        )
+        rows = {row.id: row for row in (await self.session.execute(query)).all()}
+        results = [
+            SimilarComplaint(**rows[hit_id]._asdict(), similarity=score)
+            for hit_id, score in hits
+            if hit_id in rows
+        ]
+        logger.info(
+            "Found %d complaints similar to id=%s", len(results[:limit]), complaint_id
+        )
+        return results[:limit]
+
+    async def _vector_of(self, complaint: Complaint) -> np.ndarray:
+        stored = await self.session.get(ComplaintEmbedding, complaint.id)
+        if stored is not None and stored.model == embedding_provider.name:
+            return from_blob(stored.vector)  # type: ignore[arg-type]
+        # not embedded (yet): embed on the fly without storing
+        return (await embedding_provider.embed([complaint.text]))[0]  # type: ignore
+
+    def store(self, complaint_id: int, vector: np.ndarray) -> None:
+        """Add (or replace) a complaint's embedding in the session."""
+        self.session.add(
+            ComplaintEmbedding(
+                complaint_id=complaint_id,
+                model=embedding_provider.name,
+                vector=to_blob(vector),
+            )
+        )
+
+    async def embed_missing(self, batch_size: int = 100) -> int:
+        """
+        Embed non-spam complaints that have no vector of the current
+        provider, one batch and transaction at a time.
+
+        Args:
+            batch_size (int): Complaints embedded per provider call.
+
+        Returns:
+            int: Number of complaints embedded.
+        """
+        embedded = 0
+        last_id = 0
+        while True:
+            query = (
+                select(Complaint.id, Complaint.text)
+                .outerjoin(
+                    ComplaintEmbedding,
+                    and_(
+                        ComplaintEmbedding.complaint_id == Complaint.id,
+                        ComplaintEmbedding.model == embedding_provider.name,
+                    ),
+                )
+                .where(
+                    Complaint.id > last_id,
+                    Complaint.is_spam.is_(False),
+                    ComplaintEmbedding.complaint_id.is_(None),
+                )
+                .order_by(Complaint.id)
+                .limit(batch_size)
+            )
+            rows = (await self.session.execute(query)).all()
+            await self.session.rollback()
+            if not rows:
+                return embedded
+            vectors = await embedding_provider.embed([text for _, text in rows])
+            for (complaint_id, _), vector in zip(rows, vectors):
+                await self.session.merge(
+                    ComplaintEmbedding(
+                        complaint_id=complaint_id,
+                        model=embedding_provider.name,
+                        vector=to_blob(vector),
+                    )
+                )
+            await self.session.commit()
+            embedded += len(rows)
+            last_id = rows[-1][0]
+            logger.info("Embedded complaints up to id=%d (%d)", last_id, embedded)
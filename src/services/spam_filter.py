@@ -0,0 +1,260 @@
+"""
+src/services/spam_filter.py
+
+In-process spam pre-filter that settles obvious spam locally, so the remote
+APILayer Spam Checker only sees the rest.
+
+The signals below are evidence of spam; their absence is no evidence of a
+clean text, so a low score settles a text as clean only when
+SPAM_LOCAL_CLEAN is set.
+
+Signals:
+    - URL and phone number density
+    - runs of repeated characters and shouting (mostly upper case)
+    - a Bloom filter of normalized signatures of known spam texts
+    - per-IP submission rate over a sliding window
+"""
+
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Iterator, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.complaint import Complaint
+
+logger = logging.getLogger(__name__)
+
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_REPEAT_RE = re.compile(r"(\S)\1{5,}")
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class SpamVerdict(NamedTuple):
+    """
+    Outcome of the local pre-filter.
+
+    Attributes:
+        is_spam: True/False when the text is clearly spam/ham, None when it is
+            ambiguous and should go to the remote checker.
+        score: Local spam likelihood from 0 (clean) to 1 (spam).
+        reason: Short description of the deciding signal (for logs).
+    """
+
+    is_spam: Optional[bool]
+    score: float
+    reason: str
+
+
+def spam_signature(text: str) -> bytes:
+    """
+    Normalize a text for signature matching and hash it.
+
+    Case, whitespace and digit sequences are normalized, so template spam
+    with changing numbers (order IDs, phone numbers) maps to one signature.
+    """
+    normalized = _SPACE_RE.sub(" ", _DIGITS_RE.sub("0", text.lower())).strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Compact Bloom filter over byte keys (no false negatives, tunable false
+    positive rate).
+
+    Attributes:
+        size (int): Number of bits.
+        hashes (int): Number of bit positions per key.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        # double hashing: position_i = h1 + i * h2
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: bytes) -> None:
+        """Insert a key."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def clear(self) -> None:
+        """Reset every bit."""
+        self._bits = bytearray(len(self._bits))
+
+
+class SubmissionRateTracker:
+    """
+    Sliding-window submission counter per client IP.
+
+    Tracks at most `max_clients` IPs (least recently seen evicted first), so
+    memory stays bounded under many distinct clients.
+    """
+
+    def __init__(self, window_seconds: float, max_clients: int = 100_000):
+        self.window = window_seconds
+        self.max_clients = max_clients
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def hit(self, client_ip: str, now: Optional[float] = None) -> int:
+        """
+        Record one submission and return the count inside the window.
+        """
+        now = time.monotonic() if now is None else now
+        hits = self._hits.pop(client_ip, None) or deque()
+        hits.append(now)
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        self._hits[client_ip] = hits
+        if len(self._hits) > self.max_clients:
+            self._hits.popitem(last=False)
+        return len(hits)
+
+    def count(self, client_ip: str, now: Optional[float] = None) -> int:
+        """
+        Return the submissions inside the window without recording one.
+        """
+        hits = self._hits.get(client_ip)
+        if not hits:
+            return 0
+        now = time.monotonic() if now is None else now
+        return sum(1 for hit in hits if hit > now - self.window)
+
+
+class SpamPreFilter:
+    """
+    Local heuristics deciding clear spam (and optionally clear ham) and
+    deferring the rest.
+
+    Attributes:
+        low (float): Scores at or below are treated as clean, if `clean`.
+        high (float): Scores at or above are treated as spam.
+        clean (bool): Whether low scores decide ham locally.
+        max_per_ip (int): Submissions per window before an IP looks abusive.
+    """
+
+    def __init__(
+        self,
+        low: float = 0.2,
+        high: float = 0.8,
+        max_per_ip: int = 20,
+        ip_window_seconds: float = 3600,
+        bloom_capacity: int = 100_000,
+        bloom_error_rate: float = 0.001,
+        clean: bool = False,
+    ):
+        self.low = low
+        self.high = high
+        self.clean = clean
+        self.max_per_ip = max_per_ip
+        self.signatures = BloomFilter(bloom_capacity, bloom_error_rate)
+        self.rates = SubmissionRateTracker(ip_window_seconds)
+
+    def remember(self, text: str) -> None:
+        """Add a confirmed spam text to the known-signature filter."""
+        self.signatures.add(spam_signature(text))
+
+    def evaluate(self, text: str, client_ip: Optional[str] = None) -> SpamVerdict:
+        """
+        Score a text and record the submission for its client IP.
+
+        Args:
+            text: Complaint text.
+            client_ip: Submitting client, if known.
+
+        Returns:
+            SpamVerdict: Clear spam (or, with `clean`, ham) decision or an
+            ambiguous verdict.
+        """
+        submissions = self.rates.hit(client_ip) if client_ip else 0
+        if spam_signature(text) in self.signatures:
+            return SpamVerdict(True, 1.0, "known spam signature")
+
+        words = max(1, len(text.split()))
+        score = 0.0
+        reasons = []
+        urls = len(_URL_RE.findall(text))
+        if urls:
+            # a link in a long complaint is normal, several in a short one is not
+            score += min(0.6, 0.25 * urls + 2.0 * urls / words)
+            reasons.append(f"{urls} url(s)")
+        phones = len(_PHONE_RE.findall(text))
+        if phones:
+            score += min(0.5, 0.25 * phones)
+            reasons.append(f"{phones} phone number(s)")
+        if _REPEAT_RE.search(text):
+            score += 0.3
+            reasons.append("repeated characters")
+        letters = [c for c in text if c.isalpha()]
+        if len(letters) >= 20 and sum(c.isupper() for c in letters) > 0.7 * len(
+            letters
+        ):
+            score += 0.2
+            reasons.append("mostly upper case")
+        if submissions > self.max_per_ip:
+            score += 0.4
+            reasons.append(f"{submissions} submissions from {client_ip}")
+
+        score = min(1.0, score)
+        reason = ", ".join(reasons) or "no spam signals"
+        if score >= self.high:
+            return SpamVerdict(True, score, reason)
+        if self.clean and score <= self.low:
+            return SpamVerdict(False, score, reason)
+        return SpamVerdict(None, score, reason)
+
+
+# Shared per-process pre-filter; import `spam_filter` wherever needed
+spam_filter = SpamPreFilter(
+    low=settings.spam_local_low,
+    high=settings.spam_local_high,
+    max_per_ip=settings.spam_ip_max_submissions,
+    ip_window_seconds=settings.spam_ip_window_seconds,
+    bloom_capacity=settings.spam_bloom_capacity,
+    clean=settings.spam_local_clean,
+)
+
+
+async def load_spam_signatures(session: AsyncSession) -> int:
+    """
+    Seed the Bloom filter with the most recent stored spam complaints.
+
+    Args:
+        session (AsyncSession): Async SQLAlchemy session.
+
+    Returns:
+        int: Number of signatures loaded.
+    """
+    spam_filter.signatures.clear()
+    query = (
+        select(Complaint.text)
+        .where(Complaint.is_spam.is_(True))
+        .order_by(Complaint.id.desc())
+        .limit(settings.spam_bloom_capacity)
+    )
+    texts = (await session.execute(query)).scalars().all()
+    for text in texts:
+        spam_filter.remember(text)
+    logger.info("Spam pre-filter loaded %d known spam signatures", len(texts))
+    return len(texts)
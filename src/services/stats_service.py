@@ -0,0 +1,279 @@
+"""
+src/services/stats_service.py
+
+StatsService maintains and queries the complaint_stats rollup table.
+
+Every complaint insert or status/category change adjusts the matching hourly
+bucket inside the caller's transaction, so statistics queries read a number
+of rows proportional to the requested time range, not to the table size.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.complaint import Complaint
+from ..models.complaint_stats import ComplaintStats
+from ..schemas.enums import (
+    CategoryEnum,
+    GranularityEnum,
+    SentimentEnum,
+    StatsDimensionEnum,
+    StatusEnum,
+)
+from ..schemas.stats import ComplaintStatsBucket
+from .archive_service import archive_store
+
+logger = logging.getLogger(__name__)
+
+_UPSERT = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+BucketKey = Tuple[datetime, CategoryEnum, SentimentEnum, StatusEnum, str, str]
+
+DEFAULT_DIMENSIONS = (
+    StatsDimensionEnum.CATEGORY,
+    StatsDimensionEnum.SENTIMENT,
+    StatsDimensionEnum.STATUS,
+)
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    """Truncate a timestamp to the start of its hour."""
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+class StatsService:
+    """
+    Service for the incrementally maintained complaint statistics.
+
+    Responsibilities:
+        - Adjust rollup counters inside the complaint write transaction.
+        - Serve hourly or daily aggregates with optional filters.
+        - Rebuild the rollup table from the complaints table (backfill).
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the StatsService.
+
+        Args:
+            session (AsyncSession): Async SQLAlchemy session.
+        """
+        self.session = session
+
+    async def record(
+        self,
+        timestamp: datetime,
+        category: CategoryEnum,
+        sentiment: SentimentEnum,
+        status: StatusEnum,
+        country_code: Optional[str] = None,
+        region: Optional[str] = None,
+        delta: int = 1,
+    ) -> None:
+        """
+        Add `delta` to the bucket of a complaint (upsert, no commit).
+
+        Args:
+            timestamp (datetime): Creation time of the complaint.
+            category (CategoryEnum): Complaint category.
+            sentiment (SentimentEnum): Complaint sentiment.
+            status (StatusEnum): Complaint status.
+            country_code (Optional[str]): Client country, if known.
+            region (Optional[str]): Client region, if known.
+            delta (int): +1 when a complaint enters the bucket, -1 when it leaves.
+        """
+        values = {
+            "bucket": hour_bucket(timestamp),
+            "category": category,
+            "sentiment": sentiment,
+            "status": status,
+            "country_code": country_code or "",
+            "region": region or "",
+            "count": delta,
+        }
+        dialect = self.session.get_bind().dialect.name
+        upsert = _UPSERT.get(dialect)
+        if upsert is None:
+            raise NotImplementedError(f"Stats rollup not supported on {dialect}")
+        stmt = upsert(ComplaintStats).values(**values)
+        stmt = stmt.on_conflict_do_update(  # type: ignore[attr-defined]
+            index_elements=[
+                "bucket",
+                "category",
+                "sentiment",
+                "status",
+                "country_code",
+                "region",
+            ],
+            set_={"count": ComplaintStats.count + stmt.excluded.count},  # type: ignore
+        )
+        await self.session.execute(stmt)
+
+    async def move(
+        self,
+        timestamp: datetime,
+        old: Tuple[CategoryEnum, SentimentEnum, StatusEnum],
+        new: Tuple[CategoryEnum, SentimentEnum, StatusEnum],
+        country_code: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> None:
+        """
+        Move one complaint between buckets after its category, sentiment or
+        status changed (no-op when nothing changed). The location of a
+        complaint never changes, so it is passed once.
+        """
+        if old == new:
+            return
+        await self.record(timestamp, *old, country_code, region, delta=-1)
+        await self.record(timestamp, *new, country_code, region, delta=1)
+
+    async def get_stats(
+        self,
+        granularity: GranularityEnum = GranularityEnum.HOUR,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        status: Optional[StatusEnum] = None,
+        category: Optional[CategoryEnum] = None,
+        sentiment: Optional[SentimentEnum] = None,
+        country_code: Optional[str] = None,
+        region: Optional[str] = None,
+        group_by: Optional[Sequence[StatsDimensionEnum]] = None,
+    ) -> List[ComplaintStatsBucket]:
+        """
+        Retrieve complaint counts per time bucket and the requested dimensions.
+
+        Args:
+            granularity (GranularityEnum): Hourly or daily buckets.
+            since (Optional[datetime]): Include buckets from this time on.
+            until (Optional[datetime]): Include buckets before this time.
+            status, category, sentiment, country_code, region: Optional
+                dimension filters.
+            group_by (Optional[Sequence[StatsDimensionEnum]]): Dimensions to
+                break counts down by (default: category, sentiment, status);
+                the others are summed up.
+
+        Returns:
+            List[ComplaintStatsBucket]: Non-empty buckets ordered by time.
+        """
+        dimensions = tuple(dict.fromkeys(group_by or DEFAULT_DIMENSIONS))
+        columns = [getattr(ComplaintStats, dim.value) for dim in dimensions]
+        query = select(ComplaintStats.bucket, *columns, ComplaintStats.count).where(
+            ComplaintStats.count > 0
+        )
+        if since:
+            query = query.where(ComplaintStats.bucket >= hour_bucket(since))
+        if until:
+            query = query.where(ComplaintStats.bucket < until)
+        if status:
+            query = query.where(ComplaintStats.status == status)
+        if category:
+            query = query.where(ComplaintStats.category == category)
+        if sentiment:
+            query = query.where(ComplaintStats.sentiment == sentiment)
+        if country_code is not None:
+            query = query.where(ComplaintStats.country_code == country_code.upper())
+        if region is not None:
+            query = query.where(ComplaintStats.region == region)
+        rows = (await self.session.execute(query)).all()
+
+        totals: Dict[tuple, int] = Counter()
+        for bucket, *key, count in rows:
+            if granularity == GranularityEnum.DAY:
+                bucket = bucket.replace(hour=0)
+            totals[(bucket, *key)] += count
+        logger.debug(
+            "Stats queried: %d rollup rows, %d buckets", len(rows), len(totals)
+        )
+        names = [dim.value for dim in dimensions]
+        return [
+            ComplaintStatsBucket(
+                bucket=key[0], count=count, **dict(zip(names, key[1:]))
+            )
+            for key, count in sorted(totals.items(), key=lambda item: item[0])
+        ]
+
+    async def backfill(self) -> int:
+        """
+        Rebuild the rollup table from the complaints table and the cold
+        storage archive, and commit.
+
+        The rollup rows are deleted first, so on SQLite the write lock is held
+        for the whole rebuild and concurrent inserts wait instead of being
+        double counted.
+
+        Returns:
+            int: Number of rollup rows written.
+        """
+        await self.session.execute(delete(ComplaintStats))
+        counts: Dict[BucketKey, int] = Counter()
+        result = await self.session.stream(
+            select(
+                Complaint.timestamp,
+                Complaint.category,
+                Complaint.sentiment,
+                Complaint.status,
+                Complaint.country_code,
+                Complaint.region,
+            )
+        )
+        async for timestamp, category, sentiment, status, country, region in result:
+            key = (
+                hour_bucket(timestamp),
+                category,
+                sentiment,
+                status,
+                country or "",
+                region or "",
+            )
+            counts[key] += 1
+        counts.update(await asyncio.to_thread(_count_archived))
+        if counts:
+            await self.session.execute(
+                insert(ComplaintStats),
+                [
+                    {
+                        "bucket": bucket,
+                        "category": category,
+                        "sentiment": sentiment,
+                        "status": status,
+                        "country_code": country,
+                        "region": region,
+                        "count": count,
+                    }
+                    for (
+                        bucket,
+                        category,
+                        sentiment,
+                        status,
+                        country,
+                        region,
+                    ), count in counts.items()
+                ],
+            )
+        await self.session.commit()
+        logger.info("Stats backfill complete: %d rollup rows", len(counts))
+        return len(counts)
+
+
+def _count_archived() -> Dict[BucketKey, int]:
+    """Count archived complaints per rollup key (blocking file I/O)."""
+    counts: Dict[BucketKey, int] = Counter()
+    for record in archive_store.iter_records():
+        key = (
+            hour_bucket(datetime.fromisoformat(record["timestamp"])),
+            CategoryEnum(record["category"]),
+            SentimentEnum(record["sentiment"]),
+            StatusEnum(record["status"]),
+            record.get("country_code") or "",
+            record.get("region") or "",
+        )
+        counts[key] += 1
+    return counts
@@ -0,0 +1,456 @@
+"""
+src/services/vector_index.py
+
+NumPy-backed similarity index over complaint embeddings.
+
+The index has two parts:
+
+    - A snapshot written by the clustering job (python -m src.cli cluster)
+      as .npy files in EMBEDDING_INDEX_DIR: complaint IDs and vectors
+      grouped by cluster, the cluster centroids and offsets. Workers memory-map
+      it read-only, so they share the OS page cache instead of each loading
+      a copy, and a new snapshot is picked up without a restart.
+    - An in-memory tail of vectors stored after the snapshot (by any
+      worker), synced from complaint_embeddings every
+      EMBEDDING_SYNC_SECONDS and appended to on every new complaint. It
+      holds at most EMBEDDING_TAIL_CAPACITY vectors, the most recent ones:
+      without a snapshot, older complaints are not searched until the
+      clustering job runs.
+
+Vectors are unit length, so similarity is a dot product. The snapshot is an
+inverted-file (IVF) index: its vectors are stored grouped by cluster, and a
+query scores only the EMBEDDING_NPROBE clusters with the nearest centroids,
+reading a fraction of the file at a small loss of recall. The tail is
+searched exhaustively (flat).
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.complaint_embedding import ComplaintEmbedding
+from .embeddings import embedding_provider, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+_META = "meta.json"
+# IDs below the highest synced one that are re-read on every sync, because
+# concurrent inserts may commit out of ID order
+_SYNC_OVERLAP = 1000
+_SYNC_BATCH = 1000
+_ASSIGN_CHUNK = 65536
+
+
+def to_blob(vector: np.ndarray) -> bytes:
+    """Serialize a vector for complaint_embeddings.vector."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    """Deserialize complaint_embeddings.vector."""
+    return np.frombuffer(blob, dtype="<f4")
+
+
+def assign_clusters(
+    vectors: np.ndarray, centroids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nearest centroid of every vector, computed in chunks (for mmaps).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Cluster index and similarity to its
+        centroid, per vector.
+    """
+    labels = np.empty(len(vectors), dtype=np.int32)
+    similarity = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        end = start + _ASSIGN_CHUNK
+        chunk = np.asarray(vectors[start:end]) @ centroids.T
+        rows = slice(start, start + len(chunk))
+        labels[rows] = np.argmax(chunk, axis=1)
+        similarity[rows] = chunk[np.arange(len(chunk)), labels[rows]]
+    return labels, similarity
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 1
+) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity.
+
+    Args:
+        vectors: Unit vectors, one per row.
+        k: Number of clusters (fewer when there are fewer vectors).
+        iterations: Maximum refinement rounds.
+        seed: Seed of the initial centroid choice.
+
+    Returns:
+        np.ndarray: Unit-length centroids, one per row.
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, len(vectors))
+    centroids = np.array(vectors[rng.choice(len(vectors), k, replace=False)])
+    for _ in range(iterations):
+        labels, _ = assign_clusters(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            # restart an empty cluster from a random vector
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        updated = normalize_rows(sums)
+        converged = np.allclose(updated, centroids, atol=1e-6)
+        centroids = updated
+        if converged:
+            break
+    return centroids
+
+
+class SnapshotWriter:
+    """
+    Writes a new index snapshot of a known size, published atomically.
+
+    Fill `ids` (ascending) and `vectors` (memory-mapped staging files),
+    lower `count` if fewer rows were filled, then call commit() with the
+    cluster of every row. The snapshot goes to a new subdirectory and
+    meta.json is replaced last, so readers never see a half-written one.
+    """
+
+    def __init__(self, directory: Path, model: str, dim: int, count: int):
+        self.directory = directory
+        self.model = model
+        self.dim = dim
+        self.count = count
+        self.path = directory / f"snapshot-{time.time_ns()}"
+        self.path.mkdir(parents=True)
+        self.ids = open_memmap(
+            self.path / "staging-ids.npy", mode="w+", dtype=np.int64, shape=(count,)
+        )
+        self.vectors = open_memmap(
+            self.path / "staging-vectors.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(count, dim),
+        )
+
+    def discard(self) -> None:
+        """Delete the unpublished snapshot."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def commit(self, centroids: np.ndarray, labels: np.ndarray) -> None:
+        """
+        Publish the snapshot and delete the previous ones.
+
+        Rows are stored grouped by cluster (the inverted lists), with
+        offsets.npy giving where each cluster's rows start, so probing a
+        cluster reads one contiguous slice of the file.
+
+        Args:
+            centroids: Cluster centroids, one per row.
+            labels: Cluster of every filled row.
+        """
+        count = self.count
+        order = np.argsort(labels[:count], kind="stable")
+        offsets = np.searchsorted(labels[:count][order], np.arange(len(centroids) + 1))
+        ids = open_memmap(
+            self.path / "ids.npy", mode="w+", dtype=np.int64, shape=(count,)
+        )
+        vectors = open_memmap(
+            self.path / "vectors.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(count, self.dim),
+        )
+        for start in range(0, count, _ASSIGN_CHUNK):
+            rows = order[start : start + _ASSIGN_CHUNK]  # noqa: E203
+            ids[start : start + len(rows)] = self.ids[rows]  # noqa: E203
+            vectors[start : start + len(rows)] = self.vectors[rows]  # noqa: E203
+        ids.flush()
+        vectors.flush()
+        np.save(self.path / "centroids.npy", centroids.astype(np.float32))
+        np.save(self.path / "offsets.npy", offsets.astype(np.int64))
+        max_id = int(self.ids[count - 1]) if count else 0
+        del self.ids, self.vectors
+        (self.path / "staging-ids.npy").unlink()
+        (self.path / "staging-vectors.npy").unlink()
+
+        meta = {
+            "snapshot": self.path.name,
+            "model": self.model,
+            "count": count,
+            "max_id": max_id,
+        }
+        tmp = self.directory / (_META + ".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.directory / _META)
+        # workers still mapping an old snapshot keep reading the unlinked files
+        for old in self.directory.glob("snapshot-*"):
+            if old != self.path:
+                shutil.rmtree(old, ignore_errors=True)
+
+
+class VectorIndex:
+    """
+    Memory-mapped snapshot plus in-memory tail of complaint vectors.
+
+    Attributes:
+        directory (Path): Snapshot directory.
+        model (str): Embedding provider name; other snapshots are ignored.
+        dim (int): Vector dimension.
+        nprobe (int): Clusters searched per query (0 searches all).
+        tail_capacity (int): Most vectors kept in the tail; when full, the
+            oldest quarter is dropped.
+        snapshot_max_id (int): Highest complaint ID in the snapshot.
+        synced_id (int): Highest complaint ID synced from the database.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        model: str,
+        dim: int,
+        nprobe: int = 8,
+        tail_capacity: int = 20000,
+    ):
+        self.directory = directory
+        self.model = model
+        self.dim = dim
+        self.nprobe = nprobe
+        self.tail_capacity = tail_capacity
+        self.snapshot_max_id = 0
+        self.synced_id = 0
+        self.refreshed_at = float("-inf")
+        self.centroids: Optional[np.ndarray] = None
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._tail_ids = np.zeros(0, dtype=np.int64)
+        self._tail_vectors = np.zeros((0, dim), dtype=np.float32)
+        self._tail_size = 0
+        self._tail_known: Set[int] = set()
+        self._meta_mtime: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._ids) + self._tail_size
+
+    @property
+    def tail_size(self) -> int:
+        """Number of vectors in the in-memory tail."""
+        return self._tail_size
+
+    @property
+    def snapshot_size(self) -> int:
+        """Number of vectors in the memory-mapped snapshot."""
+        return len(self._ids)
+
+    def clear(self) -> None:
+        """Forget the snapshot and the tail; the next refresh reloads both."""
+        self.snapshot_max_id = self.synced_id = 0
+        self.refreshed_at = float("-inf")
+        self.centroids = None
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._tail_size = 0
+        self._tail_known.clear()
+        self._meta_mtime = None
+
+    def add(self, complaint_id: int, vector: np.ndarray) -> None:
+        """Append a vector to the tail (no-op if already indexed)."""
+        if complaint_id <= self.snapshot_max_id or complaint_id in self._tail_known:
+            return
+        if self._tail_size >= self.tail_capacity:
+            self._drop_oldest(max(1, self.tail_capacity // 4))
+        if self._tail_size == len(self._tail_ids):
+            capacity = min(self.tail_capacity, max(64, 2 * len(self._tail_ids)))
+            ids = np.zeros(capacity, dtype=np.int64)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            ids[: self._tail_size] = self._tail_ids[: self._tail_size]
+            vectors[: self._tail_size] = self._tail_vectors[: self._tail_size]
+            self._tail_ids, self._tail_vectors = ids, vectors
+        self._tail_ids[self._tail_size] = complaint_id
+        self._tail_vectors[self._tail_size] = vector
+        self._tail_size += 1
+        self._tail_known.add(complaint_id)
+
+    def _drop_oldest(self, count: int) -> None:
+        """Drop the `count` lowest complaint IDs from the tail."""
+        size = self._tail_size
+        order = np.argsort(self._tail_ids[:size], kind="stable")
+        for complaint_id in self._tail_ids[order[:count]]:
+            self._tail_known.discard(int(complaint_id))
+        keep = np.sort(order[count:])
+        kept = len(keep)
+        self._tail_ids[:kept] = self._tail_ids[keep]
+        self._tail_vectors[:kept] = self._tail_vectors[keep]
+        self._tail_size = kept
+
+    def _candidates(self, query: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(ids, vectors) slices to score: probed clusters, then the tail."""
+        centroids = self.centroids
+        if centroids is not None and 0 < self.nprobe < len(centroids):
+            probes = np.argpartition(-(centroids @ query), self.nprobe - 1)
+            for cluster in probes[: self.nprobe]:
+                start, end = self._offsets[cluster], self._offsets[cluster + 1]
+                yield self._ids[start:end], self._vectors[start:end]
+        else:
+            yield self._ids, self._vectors
+        yield self._tail_ids[: self._tail_size], self._tail_vectors[: self._tail_size]
+
+    def search(
+        self, vector: np.ndarray, k: int, exclude: Iterable[int] = ()
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the most similar indexed complaints.
+
+        Args:
+            vector: Unit query vector.
+            k: Maximum number of results.
+            exclude: Complaint IDs to leave out (e.g. the query itself).
+
+        Returns:
+            List[Tuple[int, float]]: (complaint_id, cosine similarity), most
+            similar first.
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        found_ids, found_scores = [], []
+        for ids, vectors in self._candidates(query):
+            if len(ids):
+                found_ids.append(np.asarray(ids))
+                found_scores.append(vectors @ query)
+        if not found_ids:
+            return []
+        all_ids = np.concatenate(found_ids)
+        scores = np.concatenate(found_scores)
+        excluded = list(exclude)
+        if excluded:
+            keep = ~np.isin(all_ids, excluded)
+            all_ids, scores = all_ids[keep], scores[keep]
+        if len(all_ids) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            all_ids, scores = all_ids[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [(int(all_ids[i]), float(scores[i])) for i in order]
+
+    def load_snapshot(self) -> bool:
+        """
+        Map the current snapshot if it changed since the last call.
+
+        Returns:
+            bool: Whether a new snapshot was loaded.
+        """
+        meta_path = self.directory / _META
+        try:
+            mtime = meta_path.stat().st_mtime_ns
+            if mtime == self._meta_mtime:
+                return False
+            meta = json.loads(meta_path.read_text())
+            if meta["model"] != self.model or not meta["count"]:
+                self._meta_mtime = mtime
+                if meta["model"] != self.model:
+                    logger.warning(
+                        "Ignoring similarity index of embedding model %s (using %s)",
+                        meta["model"],
+                        self.model,
+                    )
+                return False
+            path = self.directory / meta["snapshot"]
+            ids = np.load(path / "ids.npy", mmap_mode="r")
+            vectors = np.load(path / "vectors.npy", mmap_mode="r")
+            centroids = np.load(path / "centroids.npy")
+            offsets = np.load(path / "offsets.npy")
+        except FileNotFoundError:
+            return False  # none yet, or replaced meanwhile: retry next time
+        self._meta_mtime = mtime
+        self._ids, self._vectors = ids, vectors
+        self.centroids, self._offsets = centroids, offsets
+        self.snapshot_max_id = meta["max_id"]
+
+        # keep only tail vectors newer than the snapshot
+        size = self._tail_size
+        keep = self._tail_ids[:size] > self.snapshot_max_id
+        tail_ids = self._tail_ids[:size][keep]
+        tail_vectors = self._tail_vectors[:size][keep]
+        self._tail_size = 0
+        self._tail_known.clear()
+        for complaint_id, vector in zip(tail_ids, tail_vectors):
+            self.add(int(complaint_id), vector)
+        logger.info(
+            "Similarity index snapshot loaded: %d vectors, %d clusters",
+            len(ids),
+            len(centroids),
+        )
+        return True
+
+
+# Shared per-process index; import `complaint_vectors` wherever needed
+complaint_vectors = VectorIndex(
+    Path(settings.embedding_index_dir),
+    embedding_provider.name,
+    embedding_provider.dim,
+    nprobe=settings.embedding_nprobe,
+    tail_capacity=settings.embedding_tail_capacity,
+)
+
+
+async def refresh_vector_index(session: AsyncSession, force: bool = False) -> int:
+    """
+    Pick up a new snapshot and the vectors stored since the last sync, at
+    most every EMBEDDING_SYNC_SECONDS.
+
+    The first sync reads only the vectors that fit in the tail (the most
+    recent ones), in batches.
+
+    Args:
+        session (AsyncSession): Async SQLAlchemy session.
+        force (bool): Refresh regardless of the interval.
+
+    Returns:
+        int: Number of vectors read from the database.
+    """
+    index = complaint_vectors
+    now = time.monotonic()
+    if not force and now - index.refreshed_at < settings.embedding_sync_seconds:
+        return 0
+    index.refreshed_at = now
+    index.load_snapshot()
+    since = max(index.snapshot_max_id, index.synced_id - _SYNC_OVERLAP)
+    if not index.synced_id:
+        oldest_kept = await session.scalar(
+            select(ComplaintEmbedding.complaint_id)
+            .where(
+                ComplaintEmbedding.model == index.model,
+                ComplaintEmbedding.complaint_id > since,
+            )
+            .order_by(ComplaintEmbedding.complaint_id.desc())
+            .offset(index.tail_capacity)
+            .limit(1)
+        )
+        since = max(since, oldest_kept or 0)
+    query = (
+        select(ComplaintEmbedding.complaint_id, ComplaintEmbedding.vector)
+        .where(
+            ComplaintEmbedding.model == index.model,
+            ComplaintEmbedding.complaint_id > since,
+        )
+        .order_by(ComplaintEmbedding.complaint_id)
+        .execution_options(yield_per=_SYNC_BATCH)
+    )
+    count = 0
+    result = await session.stream(query)
+    async for rows in result.partitions():
+        for complaint_id, blob in rows:
+            index.add(complaint_id, from_blob(blob))
+        index.synced_id = max(index.synced_id, rows[-1][0])
+        count += len(rows)
+    return count
@@ -0,0 +1,306 @@
+"""
+src/tests/conftest.py
+
+Shared fixtures for the async test suite:
+
+    - database_url: a fresh in-memory SQLite database per test, migrated to
+      the head revision with Alembic (the same path as production).
+    - storage_dirs: a fresh archive and similarity index directory per test.
+    - upstreams: the sentiment, spam, GeoIP and OpenAI APIs mocked with respx,
+      with a controllable latency and per-upstream call counts.
+    - client: an httpx client calling the app in-process (lifespan included).
+    - db_queries: counts the SQL statements (database round trips) the app
+      executes, for per-endpoint budgets.
+
+Settings are read from the environment when `src` is first imported, so the
+test environment is set up before any application import.
+"""
+
+import os
+
+_TEST_ENV = {
+    "DATABASE_URL": "sqlite+aiosqlite://",
+    "SENTIMENT_API_KEY": "test-sentiment-key",
+    "SPAM_API_KEY": "test-spam-key",
+    "OPENAI_API_KEY": "test-openai-key",
+    "LOG_LEVEL": "WARNING",
+    # tests pin the mode themselves; one client IP sends every request
+    "LOAD_SHEDDING_ENABLED": "false",
+    "INGEST_RATE_LIMIT": "0",
+    "SPAM_IP_MAX_SUBMISSIONS": "1000000",
+    "EMBEDDING_PROVIDER": "hashing",
+}
+for _name, _value in _TEST_ENV.items():
+    os.environ[_name] = _value
+
+import asyncio  # noqa: E402
+import sqlite3  # noqa: E402
+import uuid  # noqa: E402
+from dataclasses import dataclass, field  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+import respx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from src.clients.openai_client import get_client  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.core.dependencies import get_engine  # noqa: E402
+from src.core.load_shedding import AUTO, load_shedder  # noqa: E402
+from src.main import app  # noqa: E402
+from src.services.archive_service import archive_store  # noqa: E402
+from src.services.dedup import near_duplicates  # noqa: E402
+from src.services.vector_index import complaint_vectors  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+CLIENT_IP = "203.0.113.7"
+OPENAI_URL = "https://api.openai.com/v1"
+
+# Russian answers, as requested by the classification prompt
+CATEGORY_ANSWERS = {
+    "technical": "техническая",
+    "payment": "оплата",
+    "other": "другое",
+}
+
+
+def migrate(sync_url: str) -> None:
+    """Apply every Alembic migration to the database at `sync_url`."""
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.attributes["configure_logger"] = False
+    previous = os.environ.get("DATABASE_URL_SYNC")
+    os.environ["DATABASE_URL_SYNC"] = sync_url  # read by alembic/env.py
+    try:
+        command.upgrade(config, "head")
+    finally:
+        if previous is None:
+            os.environ.pop("DATABASE_URL_SYNC", None)
+        else:
+            os.environ["DATABASE_URL_SYNC"] = previous
+
+
+@pytest.fixture
+def database_url(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """
+    Point the app at a new migrated in-memory database.
+
+    The database is a named shared-cache one, so Alembic's synchronous
+    connection and the app's aiosqlite connection see the same data; it
+    lives as long as the keeper connection stays open. SQLAlchemy serves an
+    in-memory database through a single connection, so it suits sequential
+    requests; tests running concurrent transactions override this fixture
+    with a file database.
+    """
+    name = f"file:test-{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(name, uri=True)
+    try:
+        migrate(f"sqlite:///{name}&uri=true")
+        url = f"sqlite+aiosqlite:///{name}&uri=true"
+        monkeypatch.setattr(settings, "database_url", url)
+        yield url
+    finally:
+        keeper.close()
+
+
+@pytest.fixture(autouse=True)
+def storage_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test its own archive and similarity index directories."""
+    archive_dir = tmp_path / "archive"
+    index_dir = tmp_path / "embeddings"
+    monkeypatch.setattr(settings, "archive_dir", str(archive_dir))
+    monkeypatch.setattr(settings, "embedding_index_dir", str(index_dir))
+    monkeypatch.setattr(archive_store, "root", archive_dir)
+    monkeypatch.setattr(complaint_vectors, "directory", index_dir)
+
+
+@pytest.fixture
+def file_database_url(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Point the app at a new migrated SQLite file in a temporary directory."""
+    path = tmp_path / "complaints.sqlite3"
+    migrate(f"sqlite:///{path}")
+    url = f"sqlite+aiosqlite:///{path}"
+    monkeypatch.setattr(settings, "database_url", url)
+    yield url
+
+
+@dataclass
+class MockUpstream:
+    """
+    One mocked upstream API.
+
+    Attributes:
+        route: The respx route; `route.calls` records every request.
+        payload: Builds the JSON answer from the request.
+        latency: Seconds each call takes.
+        status_code: HTTP status of the answers.
+    """
+
+    route: respx.Route
+    payload: Callable[[httpx.Request], Dict[str, Any]]
+    latency: float = 0.0
+    status_code: int = 200
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    @property
+    def calls(self) -> int:
+        """Number of requests received."""
+        return self.route.call_count
+
+    async def respond(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return httpx.Response(self.status_code, json=self.payload(request))
+
+
+@dataclass
+class MockUpstreams:
+    """The mocked sentiment, spam, GeoIP and OpenAI APIs."""
+
+    sentiment: MockUpstream
+    spam: MockUpstream
+    geoip: MockUpstream
+    openai: MockUpstream
+    answers: Dict[str, Any] = field(default_factory=dict)
+
+    def all(self) -> List[MockUpstream]:
+        return [self.sentiment, self.spam, self.geoip, self.openai]
+
+    @property
+    def calls(self) -> int:
+        """Requests received by all upstreams together."""
+        return sum(upstream.calls for upstream in self.all())
+
+    def set_latency(self, seconds: float) -> None:
+        for upstream in self.all():
+            upstream.latency = seconds
+
+
+def _chat_completion(answer: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": answer},
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def upstreams() -> Iterator[MockUpstreams]:
+    """
+    Mock every upstream API; unmatched outgoing requests fail the test.
+
+    Answers are set through `upstreams.answers`: "sentiment" (positive,
+    negative or neutral), "spam" (bool), "category" (technical, payment or
+    other) and "country_code".
+    """
+    answers: Dict[str, Any] = {
+        "sentiment": "negative",
+        "spam": False,
+        "category": "technical",
+        "country_code": "US",
+    }
+    with respx.mock(assert_all_called=False) as router:
+        mocks = MockUpstreams(
+            sentiment=MockUpstream(
+                router.post(settings.sentiment_api_url),
+                lambda request: {"sentiment": answers["sentiment"]},
+            ),
+            spam=MockUpstream(
+                router.post(url__startswith=settings.spam_api_url),
+                lambda request: {
+                    "is_spam": answers["spam"],
+                    "score": 9.0 if answers["spam"] else 1.0,
+                },
+            ),
+            geoip=MockUpstream(
+                router.get(url__startswith=settings.ip_api_url),
+                lambda request: {
+                    "status": "success",
+                    "countryCode": answers["country_code"],
+                    "regionName": "California",
+                    "city": "San Francisco",
+                    "lat": 37.77,
+                    "lon": -122.42,
+                },
+            ),
+            openai=MockUpstream(
+                router.post(f"{OPENAI_URL}/chat/completions"),
+                lambda request: _chat_completion(CATEGORY_ANSWERS[answers["category"]]),
+            ),
+            answers=answers,
+        )
+        for upstream in mocks.all():
+            upstream.route.mock(side_effect=upstream.respond)
+        yield mocks
+
+
+@pytest_asyncio.fixture
+async def client(
+    database_url: str, upstreams: MockUpstreams
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Client calling the app in-process, with the lifespan (index warm-ups,
+    engine disposal) run around the test.
+    """
+    complaint_vectors.clear()
+    near_duplicates.clear()
+    load_shedder.force(AUTO)
+    # import the OpenAI SDK now rather than inside a timed request
+    get_client()
+    async with app.router.lifespan_context(app):
+        # the in-memory database has one connection: let the background
+        # index warm-ups finish before the test uses it
+        await asyncio.gather(*app.state.warmups)
+        transport = httpx.ASGITransport(app=app, client=(CLIENT_IP, 40000))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as http:
+            yield http
+    load_shedder.force(AUTO)
+
+
+class QueryCounter:
+    """SQL statements executed on the app's engine since the last reset."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+    def record(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def db_queries(client: httpx.AsyncClient) -> Iterator[QueryCounter]:
+    """Count the database round trips of the app (after its warm-up)."""
+    counter = QueryCounter()
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", counter.record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter.record)
@@ -0,0 +1,400 @@
+"""
+src/tests/test_complaint.py
+
+Behavior of the complaint endpoints, with budgets for the database round
+trips and upstream API calls each request may make. A budget failing after
+a change means the change added queries or calls to a hot path; raise it
+only deliberately.
+"""
+
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from src.core.dependencies import open_session
+from src.core.load_shedding import DEGRADED, load_shedder
+from src.models.complaint import Complaint
+from src.schemas.enums import StatusEnum
+from src.services.archive_service import ArchiveService, archive_store
+from src.services.reenrich_service import ReenrichService
+from src.services.search_service import fts5_query, tsquery_text
+from src.services.spam_filter import spam_filter
+from src.services.vector_index import complaint_vectors, refresh_vector_index
+
+from .conftest import MockUpstreams, QueryCounter
+
+# SQL statements per request: insert, stats rollup, category update, stats
+# move (two buckets), embedding and two refreshes of the returned row
+CREATE_QUERY_BUDGET = 8
+READ_QUERY_BUDGET = 1
+STATUS_UPDATE_QUERY_BUDGET = 4
+
+TECHNICAL_TEXT = "The app crashes every time I open the settings page"
+PAYMENT_TEXT = "My card was charged twice for the same monthly subscription"
+
+
+async def create(
+    client: httpx.AsyncClient, text: str, **headers: str
+) -> httpx.Response:
+    response = await client.post("/complaints/", json={"text": text}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response
+
+
+def calls(upstreams: MockUpstreams) -> Dict[str, int]:
+    return {
+        "sentiment": upstreams.sentiment.calls,
+        "spam": upstreams.spam.calls,
+        "geoip": upstreams.geoip.calls,
+        "openai": upstreams.openai.calls,
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_complaint_enriches_and_stores(
+    client: httpx.AsyncClient, upstreams: MockUpstreams, db_queries: QueryCounter
+) -> None:
+    response = await create(client, TECHNICAL_TEXT)
+
+    body = response.json()
+    assert body["status"] == "open"
+    assert body["sentiment"] == "negative"
+    assert body["category"] == "technical"
+    assert response.headers["ETag"] == f'"{body["version"]}"'
+    # no local spam signal is no evidence of a clean text: the API decides
+    assert calls(upstreams) == {"sentiment": 1, "spam": 1, "geoip": 1, "openai": 1}
+    assert len(db_queries) <= CREATE_QUERY_BUDGET, db_queries.statements
+
+    stored = (await client.get(f"/complaints/{body['id']}")).json()
+    assert stored == body
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_spam_is_checked_remotely_and_not_classified(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    upstreams.answers["spam"] = True
+
+    response = await create(client, "Great offer, call me now at +1 555 123 4567")
+
+    assert response.json()["category"] == "other"
+    assert upstreams.spam.calls == 1
+    assert upstreams.openai.calls == 0
+    listed = (await client.get("/complaints/")).json()
+    assert listed == []  # spam is hidden from the list by default
+
+
+@pytest.mark.asyncio
+async def test_local_clean_verdict_skips_the_spam_api(
+    client: httpx.AsyncClient, upstreams: MockUpstreams, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(spam_filter, "clean", True)
+
+    body = (await create(client, TECHNICAL_TEXT)).json()
+
+    assert body["category"] == "technical"
+    assert upstreams.spam.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_reuses_enrichment(
+    client: httpx.AsyncClient, upstreams: MockUpstreams, db_queries: QueryCounter
+) -> None:
+    original = (await create(client, PAYMENT_TEXT)).json()
+    before = calls(upstreams)
+    db_queries.reset()
+
+    duplicate = (await create(client, PAYMENT_TEXT + "!")).json()
+
+    after = calls(upstreams)
+    assert after["sentiment"] == before["sentiment"]
+    assert after["openai"] == before["openai"]
+    assert duplicate["category"] == original["category"]
+    assert duplicate["sentiment"] == original["sentiment"]
+    assert len(db_queries) <= CREATE_QUERY_BUDGET, db_queries.statements
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_of_failed_sentiment_asks_again(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    upstreams.sentiment.status_code = 503
+    original = (await create(client, PAYMENT_TEXT)).json()
+    assert original["sentiment"] == "unknown"
+    upstreams.sentiment.status_code = 200
+    before = calls(upstreams)
+
+    duplicate = (await create(client, PAYMENT_TEXT + "!")).json()
+
+    after = calls(upstreams)
+    # the fallback is not reused, the category still is
+    assert duplicate["sentiment"] == "negative"
+    assert after["sentiment"] == before["sentiment"] + 1
+    assert after["openai"] == before["openai"]
+    assert duplicate["category"] == original["category"]
+
+
+@pytest.mark.asyncio
+async def test_idempotent_retry_is_replayed_without_upstream_calls(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    first = await create(client, TECHNICAL_TEXT, **{"Idempotency-Key": "retry-1"})
+    before = upstreams.calls
+
+    retry = await create(client, TECHNICAL_TEXT, **{"Idempotency-Key": "retry-1"})
+
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert upstreams.calls == before
+
+
+@pytest.mark.asyncio
+async def test_degraded_mode_skips_geolocation_and_openai(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    load_shedder.force(DEGRADED)
+
+    response = await create(client, PAYMENT_TEXT)
+
+    assert response.json()["category"] == "payment"  # local keywords
+    assert upstreams.geoip.calls == 0
+    assert upstreams.openai.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_rechecks_spam_flagged_in_degraded_mode(
+    client: httpx.AsyncClient, upstreams: MockUpstreams, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    load_shedder.force(DEGRADED)
+    # links plus a busy client IP: spam for the local pre-filter alone
+    monkeypatch.setattr(spam_filter, "max_per_ip", 0)
+    text = "Order page broken, see https://a.example and https://b.example"
+    created = (await create(client, text)).json()
+    assert created["category"] == "other"
+    assert upstreams.spam.calls == 0
+
+    # the job runs in its own process: no client IP, no learned signatures
+    spam_filter.signatures.clear()
+    async with open_session() as session:
+        progress = await ReenrichService(session).run()
+        complaint = await session.get(Complaint, created["id"])
+
+    assert progress.updated == 1
+    assert upstreams.spam.calls == 1
+    assert complaint is not None
+    assert complaint.is_spam is False
+    assert complaint.enrichment_deferred is False
+    assert complaint.category == "technical"
+
+
+@pytest.mark.asyncio
+async def test_backfill_rescans_after_a_completed_run(
+    client: httpx.AsyncClient, upstreams: MockUpstreams, tmp_path: Path
+) -> None:
+    checkpoint = tmp_path / "reenrich.json"
+    upstreams.sentiment.status_code = 503
+    first = (await create(client, TECHNICAL_TEXT)).json()
+    upstreams.sentiment.status_code = 200
+    async with open_session() as session:
+        progress = await ReenrichService(session).run(checkpoint_path=checkpoint)
+    assert (progress.until_id, progress.updated) == (first["id"], 1)
+    assert not checkpoint.exists()
+
+    # fails after the first run completed: the next run must see it
+    upstreams.sentiment.status_code = 503
+    second = (await create(client, PAYMENT_TEXT)).json()
+    upstreams.sentiment.status_code = 200
+    async with open_session() as session:
+        progress = await ReenrichService(session).run(checkpoint_path=checkpoint)
+
+    assert (progress.until_id, progress.updated) == (second["id"], 1)
+    assert (await client.get(f"/complaints/{second['id']}")).json()[
+        "sentiment"
+    ] == "negative"
+
+
+@pytest.mark.asyncio
+async def test_failing_upstreams_fall_back(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    upstreams.sentiment.status_code = 503
+    upstreams.geoip.status_code = 503
+
+    body = (await create(client, TECHNICAL_TEXT)).json()
+
+    assert body["sentiment"] == "unknown"
+    assert body["category"] == "technical"
+
+
+@pytest.mark.asyncio
+async def test_reads_take_one_query(
+    client: httpx.AsyncClient, upstreams: MockUpstreams, db_queries: QueryCounter
+) -> None:
+    for text in (TECHNICAL_TEXT, PAYMENT_TEXT, "Support never answered my email"):
+        await create(client, text)
+
+    db_queries.reset()
+    listed = await client.get("/complaints/", params={"status": "open"})
+    assert listed.status_code == 200
+    assert len(listed.json()) == 3
+    assert len(db_queries) == READ_QUERY_BUDGET, db_queries.statements
+
+    db_queries.reset()
+    single = await client.get(f"/complaints/{listed.json()[0]['id']}")
+    assert single.status_code == 200
+    assert len(db_queries) == READ_QUERY_BUDGET, db_queries.statements
+
+    assert (await client.get("/complaints/999")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_status_update_checks_version(
+    client: httpx.AsyncClient, db_queries: QueryCounter
+) -> None:
+    created = await create(client, TECHNICAL_TEXT)
+    complaint_id = created.json()["id"]
+
+    db_queries.reset()
+    closed = await client.patch(
+        f"/complaints/{complaint_id}/status",
+        json={"status": "closed"},
+        headers={"If-Match": created.headers["ETag"]},
+    )
+    assert closed.status_code == 200
+    assert closed.json()["status"] == "closed"
+    assert len(db_queries) <= STATUS_UPDATE_QUERY_BUDGET, db_queries.statements
+
+    stale = await client.patch(
+        f"/complaints/{complaint_id}/status",
+        json={"status": "open"},
+        headers={"If-Match": created.headers["ETag"]},
+    )
+    assert stale.status_code == 409
+    assert stale.headers["ETag"] == closed.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_similar_complaints_are_ranked(client: httpx.AsyncClient) -> None:
+    reference = (await create(client, TECHNICAL_TEXT)).json()
+    close = (await create(client, "The app keeps crashing on the settings page")).json()
+    await create(client, PAYMENT_TEXT)
+
+    response = await client.get(f"/complaints/{reference['id']}/similar")
+
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["id"] == close["id"]
+    assert [row["similarity"] for row in results] == sorted(
+        (row["similarity"] for row in results), reverse=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_similarity_tail_keeps_the_most_recent_vectors(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ids = [
+        (await create(client, text)).json()["id"]
+        for text in (
+            TECHNICAL_TEXT,
+            PAYMENT_TEXT,
+            "Support never answered my email",
+            "The courier left my parcel in the rain",
+            "Refund for the cancelled order is still missing",
+            "Login codes arrive only after they expire",
+        )
+    ]
+    monkeypatch.setattr(complaint_vectors, "tail_capacity", 4)
+    complaint_vectors.clear()
+
+    # a worker starting without a snapshot reads only what the tail holds
+    async with open_session() as session:
+        assert await refresh_vector_index(session, force=True) == 4
+    assert complaint_vectors.tail_size == 4
+
+    # new vectors push out the oldest
+    vector = np.zeros(complaint_vectors.dim, dtype=np.float32)
+    vector[0] = 1.0
+    complaint_vectors.add(ids[-1] + 1, vector)
+    assert complaint_vectors.tail_size == 4
+    found = {complaint_id for complaint_id, _ in complaint_vectors.search(vector, 10)}
+    assert found == set(ids[3:]) | {ids[-1] + 1}
+
+
+def test_search_queries_agree_across_dialects() -> None:
+    assert fts5_query("refund* charged twice!") == '"refund"* "charged" "twice"'
+    assert tsquery_text("refund* charged twice!") == "refund:* & charged & twice"
+    # operators of either syntax are dropped
+    assert tsquery_text("a | !b & (c)") == "a & b & c"
+    assert tsquery_text("*** !") == ""
+
+
+@pytest.mark.asyncio
+async def test_search_matches_prefixes(client: httpx.AsyncClient) -> None:
+    charged = (await create(client, PAYMENT_TEXT)).json()
+    await create(client, TECHNICAL_TEXT)
+
+    response = await client.get("/complaints/search", params={"q": "charg* twice"})
+
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json()] == [charged["id"]]
+
+
+async def close(client: httpx.AsyncClient, complaint_id: int) -> None:
+    response = await client.patch(
+        f"/complaints/{complaint_id}/status", json={"status": "closed"}
+    )
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.asyncio
+async def test_archived_ids_are_not_reused(client: httpx.AsyncClient) -> None:
+    await create(client, PAYMENT_TEXT)
+    newest = (await create(client, TECHNICAL_TEXT)).json()
+    await close(client, newest["id"])
+    async with open_session() as session:
+        assert await ArchiveService(session).archive(older_than_days=-1) == 1
+
+    created = (await create(client, "Support never answered my email")).json()
+
+    assert created["id"] > newest["id"]
+    archived = await client.get(f"/complaints/{newest['id']}")
+    assert archived.json()["status"] == "closed"
+    await close(client, created["id"])
+    async with open_session() as session:
+        assert await ArchiveService(session).archive(older_than_days=-1) == 1
+
+
+@pytest.mark.asyncio
+async def test_complaint_reopened_during_archival_stays_live(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    created = (await create(client, TECHNICAL_TEXT)).json()
+    await close(client, created["id"])
+
+    async with open_session() as session:
+        service = ArchiveService(session)
+        execute = session.execute
+
+        async def reopen_after_select(statement: Any, *args: Any, **kwargs: Any):
+            result = await execute(statement, *args, **kwargs)
+            if statement.is_select:
+                # a PATCH landing between the archiver's read and its delete
+                await execute(
+                    update(Complaint)
+                    .where(Complaint.id == created["id"])
+                    .values(status=StatusEnum.OPEN, version=Complaint.version + 1)
+                )
+                await session.commit()
+            return result
+
+        monkeypatch.setattr(session, "execute", reopen_after_select)
+        assert await service.archive(older_than_days=-1) == 0
+
+    live = await client.get(f"/complaints/{created['id']}")
+    assert live.json()["status"] == "open"
+    assert list(archive_store.iter_records()) == []
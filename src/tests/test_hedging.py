@@ -0,0 +1,38 @@
+"""
+src/tests/test_hedging.py
+
+Hedged upstream calls: the latency a hedged call records is what the caller
+waited, so winning hedges do not pull the hedge delay down, and the extra
+requests are counted for the callers that account for them.
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from src.clients.hedging import Hedger, count_hedges
+
+PRIMARY_LATENCY = 0.3
+HEDGE_LATENCY = 0.01
+
+
+@pytest.mark.asyncio
+async def test_winning_hedge_records_the_callers_wait() -> None:
+    hedger = Hedger("test", enabled=True, min_samples=1, min_delay=0.05)
+    hedger.latencies.add(0.05)
+    hedger._tokens = 1.0
+    latencies: List[float] = [PRIMARY_LATENCY, HEDGE_LATENCY]
+
+    async def attempt() -> str:
+        await asyncio.sleep(latencies.pop(0))
+        return "ok"
+
+    with count_hedges() as hedges:
+        assert await hedger.call(attempt) == "ok"
+
+    assert hedger.hedge_wins == 1
+    assert hedges.started == 1
+    # hedge delay plus the hedge's own latency, not the latter alone
+    assert hedger.latencies.quantile(1.0) >= 0.05 + HEDGE_LATENCY  # type: ignore
+    assert hedger.hedge_delay() >= 0.05 + HEDGE_LATENCY  # type: ignore
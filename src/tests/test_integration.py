@@ -0,0 +1,134 @@
+"""
+src/tests/test_integration.py
+
+End-to-end behavior under concurrent load, with wall-clock budgets.
+
+The mocked upstreams answer after a fixed latency. Each test first times the
+same work with instant upstreams (the fixed cost of routing, enrichment and
+the database), then with the latency; the difference shows whether the
+upstream waits overlap, within a request and across requests, or have
+become serialized somewhere. Budgets are generous multiples of the ideal
+time, so slow CI runners stay green, but well below the serialized time.
+"""
+
+import asyncio
+import random
+import time
+from typing import List
+
+import httpx
+import pytest
+
+from src.config import settings
+
+from .conftest import MockUpstreams
+
+UPSTREAM_LATENCY = 0.1
+CONCURRENT_REQUESTS = 40
+
+
+@pytest.fixture
+def database_url(file_database_url: str) -> str:
+    """
+    Concurrent transactions need their own connections, which an in-memory
+    SQLite database cannot provide; use a temporary file instead.
+    """
+    return file_database_url
+
+
+async def submit(client: httpx.AsyncClient, texts: List[str]) -> float:
+    """Submit the texts concurrently; return the wall-clock time taken."""
+    started = time.perf_counter()
+    responses = await asyncio.gather(
+        *(client.post("/complaints/", json={"text": text}) for text in texts)
+    )
+    elapsed = time.perf_counter() - started
+    assert [response.status_code for response in responses] == [201] * len(texts)
+    return elapsed
+
+
+_WORDS = (
+    "app checkout page froze cart lost payment card charged twice refund "
+    "delivery late courier parcel damaged support rude email ignored login "
+    "password reset broken invoice wrong address account locked update slow "
+    "screen blank order cancelled price changed coupon rejected"
+).split()
+
+
+def distinct_texts(seed: str, count: int) -> List[str]:
+    """Random word salads, too different to be near-duplicates of each other."""
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(_WORDS, 8)) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_enrichment_stages_run_concurrently(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    # single requests: the best of a few runs, so one slow run (a GC pause,
+    # a busy CI runner) does not eat the margin between two and three latencies
+    baseline = min(
+        [await submit(client, [text]) for text in distinct_texts("Baseline", 3)]
+    )
+
+    upstreams.set_latency(UPSTREAM_LATENCY)
+    elapsed = min(
+        [await submit(client, [text]) for text in distinct_texts("Stages", 3)]
+    )
+
+    # sentiment and geolocation overlap, then the category: two latencies,
+    # against three when run one after another
+    assert elapsed - baseline < 2.5 * UPSTREAM_LATENCY, (elapsed, baseline)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    baseline = await submit(client, distinct_texts("Warm-up", CONCURRENT_REQUESTS))
+    before = upstreams.calls
+
+    upstreams.set_latency(UPSTREAM_LATENCY)
+    texts = distinct_texts("Order", CONCURRENT_REQUESTS)
+    elapsed = await submit(client, texts)
+
+    # every text is distinct, so none skips its calls as a near-duplicate;
+    # without local spam signals each one is checked by the spam API
+    assert upstreams.sentiment.calls == 2 * len(texts)
+    assert upstreams.geoip.calls == 2 * len(texts)
+    assert upstreams.openai.calls == 2 * len(texts)
+    assert upstreams.spam.calls == 2 * len(texts)
+    assert upstreams.calls - before == 4 * len(texts)
+
+    # the scheduler lets calls overlap, but no more than its limit
+    assert 1 < upstreams.sentiment.max_in_flight <= settings.enrichment_concurrency
+    serialized = 2 * UPSTREAM_LATENCY * len(texts)
+    ideal = serialized / settings.enrichment_normal_limit
+    assert elapsed - baseline < 3 * ideal, (elapsed, baseline, ideal, serialized)
+
+    listed = (await client.get("/complaints/")).json()
+    assert len(listed) == 2 * len(texts)
+
+
+@pytest.mark.asyncio
+async def test_reads_are_not_blocked_by_slow_enrichment(
+    client: httpx.AsyncClient, upstreams: MockUpstreams
+) -> None:
+    upstreams.set_latency(1.0)
+    writes = asyncio.gather(
+        *(
+            client.post("/complaints/", json={"text": text})
+            for text in distinct_texts("Refund", 5)
+        )
+    )
+    await asyncio.sleep(0.1)
+
+    started = time.perf_counter()
+    reads = await asyncio.gather(*(client.get("/complaints/") for _ in range(20)))
+    elapsed = time.perf_counter() - started
+
+    assert all(response.status_code == 200 for response in reads)
+    # enrichment waits on the upstreams without holding the database or
+    # the event loop
+    assert elapsed < 0.5, elapsed
+    assert all(response.status_code == 201 for response in await writes)
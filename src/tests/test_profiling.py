@@ -0,0 +1,166 @@
+"""
+src/tests/test_profiling.py
+
+On-demand CPU and memory profiles from /admin/profile: they capture what the
+worker does during the window, run one at a time, and leave nothing running
+afterwards.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from types import FrameType
+from typing import Any, List, Optional
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.core.profiling import Profiler, loop_codes
+
+ADMIN_TOKEN = "test-admin-token"
+ADMIN = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "admin_token", ADMIN_TOKEN)
+
+
+def spin(seconds: float) -> None:
+    busy_until = time.monotonic() + seconds
+    while time.monotonic() < busy_until:
+        pass
+
+
+async def burn(done: asyncio.Event) -> None:
+    """Keep the event loop busy until `done`, yielding to it regularly."""
+    while not done.is_set():
+        # longer than the GIL switch interval, so the sampler gets a turn
+        spin(0.02)
+        await asyncio.sleep(0)
+
+
+async def hoard(retained: List[Any], seconds: float) -> None:
+    """Allocate memory that stays alive during the window."""
+    for _ in range(20):
+        retained.append(bytearray(100_000))
+        await asyncio.sleep(seconds / 20)
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_shows_busy_code(client: httpx.AsyncClient) -> None:
+    done = asyncio.Event()
+    burning = asyncio.create_task(burn(done))
+    try:
+        response = await client.get(
+            "/admin/profile/cpu", params={"seconds": 0.5}, headers=ADMIN
+        )
+    finally:
+        done.set()
+        await burning
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert lines, response.headers
+    # folded format: "outer;...;leaf count"
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+    assert any(f"{__name__}:burn;{__name__}:spin" in line for line in lines)
+    assert int(response.headers["X-Profile-Samples"]) == sum(
+        int(line.rsplit(" ", 1)[1]) for line in lines
+    )
+
+
+@pytest.mark.asyncio
+async def test_loop_frames_are_the_frames_below_the_coroutines() -> None:
+    codes = loop_codes(sys._getframe())
+
+    names = {code.co_name for code in codes}
+    assert {"run_forever", "_run_once"} <= names
+    assert test_loop_frames_are_the_frames_below_the_coroutines.__code__ not in codes
+
+
+def test_idle_loop_without_python_selector_frames() -> None:
+    """
+    Under uvloop the loop waits for I/O in C: an idle sample's innermost
+    frame is the one running the loop, with no selector frame above it.
+    """
+    stop = threading.Event()
+
+    def handle() -> None:
+        # longer than the GIL switch interval, so the sampler gets a turn
+        spin(0.02)
+
+    def c_driven_loop() -> None:
+        while not stop.is_set():
+            time.sleep(0.02)  # waits in C, like uvloop
+            handle()
+
+    thread = threading.Thread(target=c_driven_loop)
+    thread.start()
+    try:
+        time.sleep(0.01)
+        frames = sys._current_frames()
+        frame: Optional[FrameType] = frames[thread.ident]  # type: ignore[index]
+        while frame is not None and frame.f_code is not c_driven_loop.__code__:
+            frame = frame.f_back
+        codes = set()
+        while frame is not None:
+            codes.add(frame.f_code)
+            frame = frame.f_back
+
+        profile = Profiler._sample(thread.ident, 0.3, 0.001, frozenset(codes))
+    finally:
+        stop.set()
+        thread.join()
+
+    assert profile.idle_samples > 0
+    # the loop's own frame is never innermost in a busy stack
+    assert not any(stack.endswith("c_driven_loop") for stack in profile.stacks)
+    assert any(
+        stack.endswith("handle;src.tests.test_profiling:spin")
+        for stack in profile.stacks
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_profile_shows_growth(client: httpx.AsyncClient) -> None:
+    retained: List[Any] = []
+    response, _ = await asyncio.gather(
+        client.get(
+            "/admin/profile/memory",
+            params={"seconds": 0.5, "limit": 5},
+            headers=ADMIN,
+        ),
+        hoard(retained, 0.3),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    top = body["allocations"][0]
+    assert top["location"].startswith(__file__)
+    assert top["size_diff_bytes"] >= 20 * 100_000
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_one_capture_at_a_time(client: httpx.AsyncClient) -> None:
+    first = asyncio.create_task(
+        client.get("/admin/profile/memory", params={"seconds": 0.3}, headers=ADMIN)
+    )
+    await asyncio.sleep(0.1)
+
+    second = await client.get(
+        "/admin/profile/cpu", params={"seconds": 0.1}, headers=ADMIN
+    )
+
+    assert second.status_code == 409
+    assert (await first).status_code == 200
+    assert (
+        await client.get("/admin/profile/cpu", params={"seconds": 0.1})
+    ).status_code == 401